@@ -1,14 +1,78 @@
 import streamlit as st
-import pandas as pd
-import json
-import io
-import cloudinary
-import cloudinary.uploader
+import atexit
+import tempfile
+import threading
+import time
+from collections import Counter
+from itertools import islice
 
-from scrapers.justwatch import scrape_justwatch
-from scrapers.poster_selenium import scrape_posters_with_selenium
-from scrapers.excel_to_json import row_to_json
-from scrapers.cast_scraper import scrape_cast_from_excel   # ✅ NEW import
+# Only stdlib-backed modules here: pandas, openpyxl, selenium, cloudinary and bs4
+# are imported by the page that needs them, so Home and most reruns never load them.
+from scrapers.jobs import get_job_store
+from scrapers import metrics
+from scrapers.worker import ensure_worker, worker_running
+
+
+# ---------------- JOB HELPERS ---------------- #
+PREVIEW_ROWS = 200
+OUTPUT_NAMES = {"justwatch": "justwatch_output", "posters": "poster_output", "cast": "cast_output"}
+rerun = getattr(st, "rerun", None) or st.experimental_rerun
+
+
+def submit_job(kind, items, params):
+    """Queue a scrape job for the background worker and point the user to the Jobs page."""
+    job_id = get_job_store().create_job(kind, items, params=params)
+    ensure_worker()
+    st.success(f"📨 Job `{job_id}` submitted — follow it on the 📋 Jobs page.")
+    return job_id
+
+
+def incremental_params():
+    """Incremental-mode options shared by the scraper pages, as job params."""
+    incremental = st.checkbox("♻️ Incremental: only re-scrape new or changed titles", value=False)
+    max_age_days = st.number_input("⏳ Re-check titles older than (days)", 1, 365, 7, disabled=not incremental)
+    return {"incremental": True, "max_age": max_age_days * 24 * 3600} if incremental else {}
+
+
+def download_table(label, data, stem, fmt, columns=None):
+    """Download button for a DataFrame (or row dicts) as xlsx, Parquet, CSV or JSONL."""
+    from scrapers.table_io import TABLE_FORMATS, table_bytes
+
+    st.download_button(label, table_bytes(data, fmt, columns), file_name=f"{stem}.{fmt}", mime=TABLE_FORMATS[fmt])
+
+
+# ---------------- SHARED RESOURCES ---------------- #
+# Created once per server process and reused by every session and rerun
+@st.cache_resource
+def cloudinary_configured():
+    """Configure the Cloudinary client from .env / environment once."""
+    from scrapers.cloudinary_pipeline import configure_from_env
+
+    return configure_from_env()
+
+
+@st.cache_resource
+def _browser_pool_slot():
+    """The one shared Chrome pool (None until first used), closed when the server exits."""
+    slot = {"pool": None, "lock": threading.Lock()}
+    atexit.register(lambda: slot["pool"] and slot["pool"].close())
+    return slot
+
+
+def browser_pool(workers):
+    """
+    Chrome pool kept warm across pipeline runs; browsers start on first use.
+    Only one pool is kept: asking for another size closes the old one.
+    """
+    from scrapers.browser_pool import BrowserPool
+
+    slot = _browser_pool_slot()
+    with slot["lock"]:
+        if slot["pool"] is None or slot["pool"].size != max(workers, 1):
+            if slot["pool"] is not None:
+                slot["pool"].close()
+            slot["pool"] = BrowserPool(size=workers, headless=True)
+        return slot["pool"]
 
 
 # ---------------- STREAMLIT APP ---------------- #
@@ -22,6 +86,10 @@ page = st.sidebar.radio(
         "🎬 JustWatch Scraper",
         "🖼 Poster Scraper (Selenium)",
         "🧑‍🎤 Cast Scraper",
+        "📋 Jobs",
+        "🗂 Catalog",
+        "🚚 Pipeline",
+        "📈 Run Metrics",
         "📑 Excel → JSON Converter",
         "🪄 Excel Flattener",
         "🔗 Poster Grouper",        # ✅ NEW
@@ -38,241 +106,454 @@ if page == "🏠 Home":
 
 # ---------------- JUSTWATCH SCRAPER ---------------- #
 elif page == "🎬 JustWatch Scraper":
+    import os
+    from scrapers.parse_pool import PARSE_WORKERS
+    from scrapers.table_io import TABLE_TYPES, excel_columns, iter_column
+
     st.title("🎬 JustWatch Scraper")
-    uploaded_file = st.file_uploader("📂 Upload Excel with URLs", type=["xlsx"])
+    uploaded_file = st.file_uploader("📂 Upload Excel with URLs", type=TABLE_TYPES)
+    concurrency = st.slider("⚡ Parallel requests", 1, 32, 8)
+    parse_workers = st.slider(
+        "🧮 Parser processes (0 = parse on the request threads)", 0, max(os.cpu_count() or 1, PARSE_WORKERS),
+        PARSE_WORKERS,
+    )
+    use_cache = st.checkbox("💾 Use response cache", value=True)
+    incremental = incremental_params()
 
     if uploaded_file and st.button("🚀 Start Scraping"):
-        df_urls = pd.read_excel(uploaded_file)
-        url_column = [col for col in df_urls.columns if "url" in col.lower()][0]
-
-        scraped_data = []
-        progress = st.progress(0)
-
-        urls = df_urls[url_column].dropna().tolist()
-        for i, url in enumerate(urls):
-            scraped_data.append(scrape_justwatch(url))
-            progress.progress((i + 1) / len(urls))
-
-        df_output = pd.DataFrame(scraped_data)
-        st.success("✅ Scraping completed!")
-        st.dataframe(df_output)
-
-        buffer = io.BytesIO()
-        df_output.to_excel(buffer, index=False, engine="openpyxl")
-        buffer.seek(0)
-
-        st.download_button(
-            "⬇ Download Excel",
-            buffer,
-            file_name="justwatch_output.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        url_column = [col for col in excel_columns(uploaded_file) if "url" in col.lower()][0]
+        submit_job(
+            "justwatch",
+            ((url, {}) for url in iter_column(uploaded_file, url_column)),
+            {"concurrency": concurrency, "use_cache": use_cache, "parse_workers": parse_workers, **incremental},
         )
 
 
 # ---------------- POSTER SCRAPER ---------------- #
 elif page == "🖼 Poster Scraper (Selenium)":
+    from scrapers.table_io import TABLE_TYPES, excel_columns, iter_table_rows
+
     st.title("🖼 Poster Scraper (Selenium)")
-    uploaded_file = st.file_uploader("📂 Upload Excel with 'Source URL'", type=["xlsx"])
+    uploaded_file = st.file_uploader("📂 Upload Excel with 'Source URL'", type=TABLE_TYPES)
+    workers = st.slider("🧭 Parallel browsers", 1, 8, 3)
+    incremental = incremental_params()
 
     if uploaded_file and st.button("🚀 Start Poster Scraping"):
-        df_result = scrape_posters_with_selenium(uploaded_file)
-        if df_result is not None:
-            st.success("✅ Poster scraping complete!")
-            st.dataframe(df_result)
-
-            buffer = io.BytesIO()
-            df_result.to_excel(buffer, index=False, engine="openpyxl")
-            buffer.seek(0)
-
-            st.download_button(
-                "⬇ Download Excel",
-                buffer,
-                file_name="poster_output.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        if "Source URL" not in excel_columns(uploaded_file):
+            st.error("❌ Excel must contain a 'Source URL' column.")
+        else:
+            submit_job(
+                "posters",
+                ((row["Source URL"], row) for row in iter_table_rows(uploaded_file) if row["Source URL"] is not None),
+                {"workers": workers, "run_headless": True, **incremental},
             )
 
 
 # ---------------- CAST SCRAPER ---------------- #
 elif page == "🧑‍🎤 Cast Scraper":
+    from scrapers.table_io import TABLE_TYPES, excel_columns, iter_column
+
     st.title("🧑‍🎤 Cast Scraper")
-    uploaded_file = st.file_uploader("📂 Upload Excel with 'Source URL'", type=["xlsx"])
+    uploaded_file = st.file_uploader("📂 Upload Excel with 'Source URL'", type=TABLE_TYPES)
+    workers = st.slider("🧭 Parallel browsers", 1, 8, 3)
+    incremental = incremental_params()
 
     if uploaded_file and st.button("🚀 Start Cast Scraping"):
-        input_path = "temp_cast_input.xlsx"
-        output_path = "temp_cast_output.xlsx"
-
-        with open(input_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-
-        df_result = None
-        try:
-            scrape_cast_from_excel(input_path, output_path)
-            df_result = pd.read_excel(output_path)
-        except Exception as e:
-            st.error(f"⚠️ Error: {e}")
+        columns = excel_columns(uploaded_file)
+        if "Source URL" not in columns:
+            st.error(f"❌ Column 'Source URL' not found in Excel. Found columns: {columns}")
+        else:
+            submit_job(
+                "cast",
+                ((url, {"Source URL": url}) for url in dict.fromkeys(iter_column(uploaded_file, "Source URL"))),
+                {"workers": workers, **incremental},
+            )
 
-        if df_result is not None:
-            st.success("✅ Cast scraping complete!")
-            st.dataframe(df_result)
 
-            buffer = io.BytesIO()
-            df_result.to_excel(buffer, index=False, engine="openpyxl")
-            buffer.seek(0)
+# ---------------- JOBS ---------------- #
+elif page == "📋 Jobs":
+    import pandas as pd
+    from scrapers.table_io import TABLE_TYPES, collect_columns
+
+    st.title("📋 Jobs")
+    store = get_job_store()
+
+    c1, c2 = st.columns(2)
+    c1.metric("Worker", "🟢 running" if worker_running() else "🔴 stopped")
+    if c2.button("▶ Start worker"):
+        ensure_worker()
+        rerun()
+
+    jobs = store.list_jobs()
+    if not jobs:
+        st.info("No jobs yet — submit one from a scraper page.")
+    else:
+        st.dataframe(pd.DataFrame([
+            {
+                "Job ID": j["job_id"],
+                "Kind": j["kind"],
+                "Status": j["status"],
+                "Progress": f"{j['done']}/{j['total']}",
+                "Created": pd.to_datetime(j["created_at"], unit="s"),
+            }
+            for j in jobs
+        ]))
+
+        job_id = st.text_input("Job ID") or st.selectbox("Select job", [j["job_id"] for j in jobs])
+        job = store.get_job(job_id.strip())
+
+        if job is None:
+            st.error(f"❌ Unknown job ID: {job_id}")
+        else:
+            st.subheader(f"{job['kind']} · {job['status']}")
+            st.progress(job["done"] / job["total"] if job["total"] else 1.0)
+            if job["error"]:
+                st.error(f"⚠️ {job['error']}")
+
+            if job["status"] in ("failed", "interrupted") and st.button("♻️ Resume job"):
+                store.requeue(job["job_id"])
+                ensure_worker()
+                rerun()
+
+            cache_stats = job["stats"].get("cache")
+            if cache_stats:
+                m1, m2, m3 = st.columns(3)
+                m1.metric("Cache hits", cache_stats.get("hits", 0))
+                m2.metric("Revalidated (304)", cache_stats.get("revalidated", 0))
+                m3.metric("Cache misses", cache_stats.get("misses", 0))
+
+            timings = job["stats"].get("timings")
+            if timings:
+                with st.expander("⏱ Per-URL browser timings (seconds)"):
+                    st.dataframe(pd.DataFrame(timings))
+
+            if job["done"]:
+                st.dataframe(pd.DataFrame(islice(store.iter_results(job["job_id"]), PREVIEW_ROWS)))
+
+                only_diff = False
+                if job["params"].get("incremental"):
+                    changes = Counter(row.get("Change") for row in store.iter_results(job["job_id"]))
+                    d1, d2, d3 = st.columns(3)
+                    d1.metric("🆕 Added", changes["added"])
+                    d2.metric("✏️ Changed", changes["changed"])
+                    d3.metric("✔️ Unchanged", changes["unchanged"])
+                    only_diff = st.checkbox("Only download added / changed rows (diff)")
+
+                def results():
+                    rows = store.iter_results(job["job_id"])
+                    return (r for r in rows if r.get("Change") != "unchanged") if only_diff else rows
+
+                # Results stream from the job store straight into the output file
+                fmt = st.selectbox("💾 Output format", TABLE_TYPES)
+                columns = collect_columns(results())
+                download_table(
+                    "⬇ Download results" if job["status"] == "done" else "⬇ Download partial results",
+                    results(),
+                    OUTPUT_NAMES.get(job["kind"], "output"),
+                    fmt,
+                    columns,
+                )
 
+        if st.checkbox("🔄 Auto-refresh while jobs run", value=True) and any(
+            j["status"] in ("queued", "running") for j in jobs
+        ):
+            time.sleep(2)
+            rerun()
+
+
+# ---------------- CATALOG ---------------- #
+elif page == "🗂 Catalog":
+    import pandas as pd
+    from scrapers.catalog import SHEET_COLUMNS, get_catalog, import_table, iter_json_chunks
+    from scrapers.excel_to_json import write_json
+    from scrapers.table_io import TABLE_FORMATS, TABLE_TYPES, table_bytes
+
+    st.title("🗂 Title Catalog")
+    st.markdown("Every title scraped by jobs, the pipeline and the uploader, stored locally — no network needed.")
+    catalog = get_catalog()
+
+    with st.expander("📥 Import existing scraper sheets"):
+        files = st.file_uploader("📂 JustWatch, poster or cast output", type=TABLE_TYPES, accept_multiple_files=True)
+        if files and st.button("📥 Import"):
+            for f in files:
+                st.success(f"✅ {f.name}: {import_table(f)} rows imported")
+
+    facets = catalog.facets()
+    c1, c2, c3, c4 = st.columns(4)
+    title = c1.text_input("🔎 Title starts with")
+    platform = c2.selectbox("📺 Platform", ["All", *facets["platforms"]])
+    genre = c3.selectbox("🎭 Genre", ["All", *facets["genres"]])
+    low, high = facets["years"]
+    years = c4.slider("📅 Year", low, high, (low, high)) if low is not None and low < high else (low, high)
+    filters = {
+        "title": title,
+        "platform": None if platform == "All" else platform,
+        "genre": None if genre == "All" else genre,
+        # The full range also keeps titles without a year
+        "year_from": years[0] if years[0] != low else None,
+        "year_to": years[1] if years[1] != high else None,
+    }
+
+    total = catalog.count(**filters)
+    st.metric("Titles", total)
+    if total:
+        st.dataframe(pd.DataFrame(catalog.iter_rows(limit=PREVIEW_ROWS, **filters), columns=SHEET_COLUMNS))
+
+        fmt = st.selectbox("💾 Sheet format", TABLE_TYPES)
+        export_key = (tuple(filters.items()), fmt)
+        if st.button("📦 Export"):
+            # JSON records (row_to_json) go to a temp file chunk by chunk
+            with tempfile.TemporaryFile("w+", encoding="utf-8") as out:
+                write_json(iter_json_chunks(catalog.iter_rows(**filters)), out)
+                out.flush()
+                out.seek(0)
+                json_bytes = out.buffer.read()
+            # Kept across reruns: clicking one download button reruns the script without the Export click
+            st.session_state["catalog_export"] = {
+                "key": export_key,
+                "sheet": table_bytes(catalog.iter_rows(**filters), fmt, SHEET_COLUMNS),
+                "json": json_bytes,
+            }
+
+        export = st.session_state.get("catalog_export")
+        if export and export["key"] == export_key:
             st.download_button(
-                "⬇ Download Excel",
-                buffer,
-                file_name="cast_output.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                "⬇ Download sheet", export["sheet"], file_name=f"catalog.{fmt}", mime=TABLE_FORMATS[fmt]
             )
+            st.download_button("⬇ Download JSON", export["json"], file_name="catalog.json", mime="application/json")
+
+
+# ---------------- PIPELINE ---------------- #
+elif page == "🚚 Pipeline":
+    from scrapers.excel_to_json import records_to_json
+    from scrapers.pipeline import run_pipeline
+    from scrapers.table_io import TABLE_TYPES, excel_columns, iter_column
+
+    st.title("🚚 End-to-End Pipeline")
+    st.markdown("URLs in, final JSON out: scrape → posters → cast → Cloudinary → JSON, all stages running at once.")
+    uploaded_file = st.file_uploader("📂 Upload Excel with URLs", type=TABLE_TYPES)
+    c1, c2, c3 = st.columns(3)
+    concurrency = c1.slider("⚡ Parallel requests", 1, 32, 8)
+    workers = c2.slider("🧭 Parallel browsers", 1, 8, 3)
+    upload_concurrency = c3.slider("☁️ Parallel uploads", 1, 32, 8)
+    upload = st.checkbox("☁️ Upload posters to Cloudinary", value=True)
+
+    if uploaded_file and st.button("🚀 Run Pipeline"):
+        if upload and not cloudinary_configured():
+            st.warning("⚠️ No Cloudinary credentials in .env / environment — posters will keep their source URLs.")
+        url_column = [col for col in excel_columns(uploaded_file) if "url" in col.lower()][0]
+        progress = st.progress(0)
+        status = st.empty()
+        started = time.perf_counter()
+        data = [
+            record for _, record in run_pipeline(
+                iter_column(uploaded_file, url_column),
+                concurrency=concurrency,
+                workers=workers,
+                upload_concurrency=upload_concurrency,
+                upload=upload,
+                pool=browser_pool(workers),
+                progress_callback=lambda done, total: (
+                    progress.progress(done / total if total else 1.0),
+                    status.text(f"🎬 {done}/{total} titles"),
+                ),
+                on_error=lambda url, stage, e: st.warning(f"⚠️ {stage} failed for {url}: {e}"),
+            )
+        ]
+
+        st.success(f"✅ {len(data)} titles in {time.perf_counter() - started:.1f}s")
+        failed = sum("error" in record for record in data)
+        if failed:
+            st.warning(f"⚠️ {failed} titles failed; their records carry an \"error\" field")
+        st.json(data[:2])  # preview
+        st.download_button(
+            "⬇ Download JSON",
+            records_to_json(data).encode("utf-8"),
+            file_name="output.json",
+            mime="application/json",
+        )
+
+
+# ---------------- RUN METRICS ---------------- #
+elif page == "📈 Run Metrics":
+    import pandas as pd
+
+    st.title("📈 Run Metrics")
+    st.markdown("Per-stage timings from the scrapers, browsers, uploads and file I/O (all processes).")
+    windows = {"Last 15 minutes": 15 * 60, "Last hour": 3600, "Last 24 hours": 24 * 3600, "Everything": None}
+    window = windows[st.selectbox("🕒 Window", list(windows), index=1)]
+
+    metrics.flush()
+    events = metrics.load_trace(since=time.time() - window if window else None)
+    stages = [e for e in events if "stage" in e]
+    if not stages:
+        st.info("No metrics yet — run a scrape, upload or conversion first.")
+    else:
+        st.subheader("⏱ Latency per stage")
+        st.dataframe(pd.DataFrame(metrics.summarize(events)).set_index("stage"))
+
+        st.subheader("🚀 Throughput per minute")
+        per_minute = pd.DataFrame(stages)
+        per_minute["minute"] = pd.to_datetime(per_minute["t"], unit="s").dt.floor("min")
+        st.line_chart(per_minute.pivot_table(index="minute", columns="stage", values="ms", aggfunc="count"))
+
+        counters = metrics.counter_totals(events)
+        if counters:
+            st.subheader("🔢 Counters")
+            st.dataframe(pd.DataFrame([{"counter": k, "total": v} for k, v in sorted(counters.items())]))
+
+        st.download_button(
+            "⬇ Prometheus text",
+            metrics.prometheus_text(events).encode("utf-8"),
+            file_name="metrics.prom",
+            mime="text/plain",
+        )
 
 
 # ---------------- EXCEL TO JSON ---------------- #
 elif page == "📑 Excel → JSON Converter":
+    from scrapers.excel_to_json import iter_json_chunks, write_json
+    from scrapers.table_io import TABLE_TYPES
+
     st.title("📑 Excel to JSON Converter")
-    uploaded_file = st.file_uploader("📂 Upload Excel File", type=["xlsx"])
+    uploaded_file = st.file_uploader("📂 Upload Excel File", type=TABLE_TYPES)
+    c1, c2 = st.columns(2)
+    ndjson = c1.radio("🧾 Output", ["JSON array", "NDJSON (one record per line)"]) != "JSON array"
+    compact = c2.checkbox("🗜 Compact (no indentation)", value=False, disabled=ndjson)
 
     if uploaded_file and st.button("🚀 Convert to JSON"):
-        df = pd.read_excel(uploaded_file)
-        df = df.fillna("")
-        df.columns = df.columns.str.strip().str.lower()
+        preview = []
 
-        data = [row_to_json(row) for _, row in df.iterrows()]
+        def chunks():
+            for records in iter_json_chunks(uploaded_file):
+                if not preview:
+                    preview.extend(records[:2])
+                yield records
 
-        json_str = json.dumps(data, ensure_ascii=False, indent=4)
+        # Records go to a temp file chunk by chunk instead of one big string
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as out:
+            count = write_json(chunks(), out, ndjson=ndjson, compact=compact)
+            out.flush()
+            out.seek(0)
 
-        st.success("✅ Conversion complete!")
-        st.json(data[:2])  # preview
+            st.success(f"✅ Conversion complete! {count} records")
+            st.json(preview)  # preview
 
-        st.download_button(
-            "⬇ Download JSON",
-            json_str.encode("utf-8"),
-            file_name="output.json",
-            mime="application/json",
-        )
+            st.download_button(
+                "⬇ Download JSON",
+                out.buffer,
+                file_name="output.jsonl" if ndjson else "output.json",
+                mime="application/x-ndjson" if ndjson else "application/json",
+            )
 
 
 # ---------------- EXCEL FLATTENER ---------------- #
 elif page == "🪄 Excel Flattener":
+    from scrapers.poster_rows import flatten_posters
+    from scrapers.table_io import TABLE_TYPES, read_table
+
     st.title("🪄 Excel Season Posters Flattener")
-    uploaded_file = st.file_uploader("📂 Upload Excel with 'Title' and 'Season Posters'", type=["xlsx"])
+    uploaded_file = st.file_uploader("📂 Upload Excel with 'Title' and 'Season Posters'", type=TABLE_TYPES)
+    fmt = st.selectbox("💾 Output format", TABLE_TYPES)
 
     if uploaded_file and st.button("🚀 Flatten Excel"):
         try:
-            df = pd.read_excel(uploaded_file)
+            df = read_table(uploaded_file)
 
             if not {"Title", "Season Posters"}.issubset(df.columns):
                 st.error("❌ Excel must have 'Title' and 'Season Posters' columns.")
             else:
-                expanded_rows = []
-                for _, row in df.iterrows():
-                    posters = str(row["Season Posters"]).split(",")
-                    posters = [p.strip() for p in posters if p.strip()]
-                    for poster in posters:
-                        expanded_rows.append({"Title": row["Title"], "SeasonPoster": poster})
-
-                flat_df = pd.DataFrame(expanded_rows)
+                flat_df = flatten_posters(df)
 
                 st.success("✅ Flattening complete!")
                 st.dataframe(flat_df.head(20))
 
-                buffer = io.BytesIO()
-                flat_df.to_excel(buffer, index=False, engine="openpyxl")
-                buffer.seek(0)
-
-                st.download_button(
-                    "⬇ Download Flattened Excel",
-                    buffer,
-                    file_name="flattened_output.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                )
+                download_table("⬇ Download Flattened Excel", flat_df, "flattened_output", fmt)
         except Exception as e:
             st.error(f"⚠️ Error: {e}")
 
 
 # ---------------- POSTER GROUPER ---------------- #
 elif page == "🔗 Poster Grouper":
+    from scrapers.poster_rows import group_posters
+    from scrapers.table_io import TABLE_TYPES, read_table
+
     st.title("🔗 Poster Grouper (Flattened → Grouped)")
-    uploaded_file = st.file_uploader("📂 Upload Flattened Excel", type=["xlsx"])
+    uploaded_file = st.file_uploader("📂 Upload Flattened Excel", type=TABLE_TYPES)
+    fmt = st.selectbox("💾 Output format", TABLE_TYPES)
 
     if uploaded_file and st.button("🚀 Group Posters"):
         try:
-            df = pd.read_excel(uploaded_file)
-            df['Title_order'] = df['Title'].factorize()[0]
-
-            grouped_df = (
-                df.groupby(['Title', 'Title_order'], sort=False)['SeasonPoster']
-                  .apply(lambda x: ",".join(x.astype(str)))
-                  .reset_index()
-                  .drop(columns=['Title_order'])
-            )
+            grouped_df = group_posters(read_table(uploaded_file))
 
             st.success("✅ Grouping complete!")
             st.dataframe(grouped_df)
 
-            buffer = io.BytesIO()
-            grouped_df.to_excel(buffer, index=False, engine="openpyxl")
-            buffer.seek(0)
-
-            st.download_button(
-                "⬇ Download Grouped Excel",
-                buffer,
-                file_name="poster_grouped.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
+            download_table("⬇ Download Grouped Excel", grouped_df, "poster_grouped", fmt)
         except Exception as e:
             st.error(f"⚠️ Error: {e}")
 
 
 # ---------------- CLOUDINARY UPLOADER ---------------- #
 elif page == "☁️ Cloudinary Uploader":
+    import pandas as pd
+    from scrapers.catalog import get_catalog
+    from scrapers.cloudinary_pipeline import upload_many
+    from scrapers.poster_index import upload_posters_deduped
+    from scrapers.table_io import TABLE_TYPES, read_table
+
     st.title("☁️ Excel Poster → Cloudinary Uploader")
-    uploaded_file = st.file_uploader("📂 Upload Excel with 'Title' and 'SeasonPoster'", type=["xlsx"])
+    uploaded_file = st.file_uploader("📂 Upload Excel with 'Title' and 'SeasonPoster'", type=TABLE_TYPES)
+    concurrency = st.slider("⚡ Parallel uploads", 1, 32, 8)
+    dedupe_images = st.checkbox("🧬 Upload identical images once (same URL or same bytes)", value=True)
+    fmt = st.selectbox("💾 Output format", TABLE_TYPES)
 
     if uploaded_file and st.button("🚀 Upload to Cloudinary"):
+        if not cloudinary_configured():
+            st.warning("⚠️ No Cloudinary credentials in .env / environment — uploads will fail.")
         try:
-            df = pd.read_excel(uploaded_file)
+            df = read_table(uploaded_file)
 
             if not {"Title", "SeasonPoster"}.issubset(df.columns):
                 st.error("❌ Excel must have 'Title' and 'SeasonPoster' columns.")
             else:
-                expanded_rows = []
-                progress = st.progress(0)
-                total = len(df)
-
-                for i, (_, row) in enumerate(df.iterrows()):
-                    title = row["Title"]
-                    posters = str(row["SeasonPoster"]).split(",")
-                    posters = [p.strip() for p in posters if p.strip()]
-
-                    for poster_url in posters:
-                        try:
-                            upload_result = cloudinary.uploader.upload(
-                                poster_url,
-                                folder="jio_images/"
-                            )
-                            cloud_url = upload_result.get("secure_url", poster_url)
-                            expanded_rows.append({"Title": title, "SeasonPoster": cloud_url})
-                        except Exception as e:
-                            expanded_rows.append({"Title": title, "SeasonPoster": poster_url})
-                            st.warning(f"⚠️ Failed for {poster_url}: {e}")
-
-                    progress.progress((i + 1) / total)
+                rows = [
+                    (row["Title"], [p.strip() for p in str(row["SeasonPoster"]).split(",") if p.strip()])
+                    for _, row in df.iterrows()
+                ]
 
+                progress = st.progress(0)
+                status = st.empty()
+                failures = []
+
+                def show_progress(step, done, total):
+                    progress.progress(done / total if total else 1.0)
+                    status.text(f"{step} {done}/{total} images")
+
+                params = dict(
+                    folder="jio_images/",
+                    concurrency=concurrency,
+                    progress_callback=lambda done, total: show_progress("☁️ Uploading", done, total),
+                    on_error=lambda url, e: failures.append(f"⚠️ Failed for {url}: {e}"),
+                )
+                if dedupe_images:
+                    params["fingerprint_callback"] = lambda done, total: show_progress("🧬 Fingerprinting", done, total)
+                upload = upload_posters_deduped if dedupe_images else upload_many
+                cloud_urls = upload((poster for _, posters in rows for poster in posters), **params)
+                get_catalog().record_uploads(cloud_urls)
+                for message in failures:
+                    st.warning(message)
+
+                expanded_rows = [
+                    {"Title": title, "SeasonPoster": cloud_urls[poster]}
+                    for title, posters in rows
+                    for poster in posters
+                ]
                 result_df = pd.DataFrame(expanded_rows)
 
                 st.success("✅ Upload complete!")
                 st.dataframe(result_df.head(20))
 
-                buffer = io.BytesIO()
-                result_df.to_excel(buffer, index=False, engine="openpyxl")
-                buffer.seek(0)
-
-                st.download_button(
-                    "⬇ Download Updated Excel",
-                    buffer,
-                    file_name="cloudinary_output.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                )
+                download_table("⬇ Download Updated Excel", result_df, "cloudinary_output", fmt)
         except Exception as e:
             st.error(f"❌ Error: {e}")
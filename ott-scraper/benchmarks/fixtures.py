@@ -0,0 +1,183 @@
+"""
+Benchmark inputs: JustWatch title pages and synthetic catalog sheets.
+
+Saved pages live in benchmarks/pages/*.html (one title per file, the first
+line of the file may be `<!-- url: ... -->`). Grab a fresh corpus with
+
+    python -m benchmarks.fixtures urls.txt
+
+When no pages are saved, synthetic pages with the same markup and embedded
+state as JustWatch title pages are generated so the suite always runs offline.
+"""
+import argparse
+import glob
+import os
+import random
+import re
+
+import pandas as pd
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+URL_COMMENT_RE = re.compile(r"^<!-- url: (\S+) -->")
+SYNTHETIC_PAGES = 40
+
+GENRES = ["Drama", "Comedy", "Crime", "Action & Adventure", "Thriller", "Romance", "Documentary", "Kids & Family"]
+COUNTRIES = ["India", "United States", "United Kingdom", "South Korea"]
+
+
+# --- Title pages ---
+def _title(i):
+    return f"Benchmark Show {i}", 2000 + i % 25
+
+def dom_page(i):
+    """A title page without embedded state (parsed from the DOM by lxml / bs4)."""
+    title, year = _title(i)
+    seasons = "".join(
+        f'<div class="season-card"><span class="season-number">Season {s}</span>'
+        f'<span class="episodes-number">{8 + s} Episodes</span></div>'
+        for s in range(1, 2 + i % 5)
+    )
+    genres = "".join(f"<span>{g}</span>" for g in random.Random(i).sample(GENRES, 3))
+    trailers = "".join(
+        f'<img src="https://i.ytimg.com/vi/bench{i}x{k}/hqdefault.jpg">' for k in range(2)
+    )
+    filler = "".join(f'<div class="row"><a href="/in/tv-show/other-{k}">Other {k}</a></div>' for k in range(200))
+    return f"""<!DOCTYPE html><html><head><title>{title}</title></head><body>
+<div class="title-detail-hero"><h1 class="title-detail-hero__details__title">{title} ({year})</h1>
+<h3 class="original-title">Original title: {title}</h3></div>
+<div class="title-poster__image"><picture><img src="https://images.justwatch.com/poster/{1000 + i}/s166/bench-{i}.webp"></picture></div>
+<div id="season-list">{seasons}</div>
+<div class="jw-scoring-listing__rating"><img alt="JustWatch Rating">{70 + i % 30}%</div>
+<div class="jw-scoring-listing__rating"><img alt="IMDB">{5 + i % 5}.{i % 10} (12k)</div>
+<div class="poster-detail-infos"><h3>Genres</h3><div class="poster-detail-infos__value">{genres}</div></div>
+<div class="poster-detail-infos"><h3>Runtime</h3><div class="poster-detail-infos__value">{30 + i % 60}min</div></div>
+<div class="poster-detail-infos"><h3>Age rating</h3><div class="poster-detail-infos__value">U/A 16+</div></div>
+<div class="poster-detail-infos"><h3>Production country</h3><div class="poster-detail-infos__value">{COUNTRIES[i % 4]}</div></div>
+<div id="synopsis"><p>Synopsis of {title}. {"Lorem ipsum dolor sit amet. " * 20}</p></div>
+<div id="clips_trailers">{trailers}</div>
+{filler}
+</body></html>"""
+
+def state_page(i):
+    """A title page carrying the embedded Apollo state (parsed without touching the DOM)."""
+    import json
+
+    title, year = _title(i)
+    path = f"/in/tv-show/benchmark-show-{i}"
+    cache = {"ROOT_QUERY": {}}
+    season_refs = []
+    for s in range(1, 2 + i % 5):
+        key = f"Season:ts{i}-{s}"
+        cache[key] = {
+            "totalEpisodeCount": 8 + s,
+            'content({"country":"IN","language":"en"})': {
+                "seasonNumber": s, "posterUrl": f"/poster/{2000 + i * 10 + s}/{{profile}}/season-{s}.{{format}}",
+            },
+        }
+        season_refs.append({"__ref": key})
+    cache[f"Show:ts{i}"] = {
+        "seasons": season_refs,
+        'content({"country":"IN","language":"en"})': {
+            "title": title,
+            "fullPath": path,
+            "originalReleaseYear": year,
+            "originalTitle": title,
+            "posterUrl": f"/poster/{1000 + i}/{{profile}}/bench-{i}.{{format}}",
+            "scoring": {"jwRating": 0.7 + (i % 30) / 100, "imdbScore": 5 + (i % 50) / 10, "tomatoMeter": 60 + i % 40},
+            "genres": [{"translation": g} for g in random.Random(i).sample(GENRES, 3)],
+            "clips": [{"externalId": f"bench{i}x{k}", "provider": "YOUTUBE"} for k in range(2)],
+            "credits": [{"role": "ACTOR", "name": f"Actor {i}-{k}", "characterName": f"Role {k}"} for k in range(12)],
+            "productionCountries": [COUNTRIES[i % 4]],
+            "runtime": 30 + i % 60,
+            "ageCertification": "U/A 16+",
+            "shortDescription": f"Synopsis of {title}.",
+        },
+    }
+    body = dom_page(i).replace("</body>", f"<script>window.__APOLLO_STATE__={json.dumps(cache)};</script></body>")
+    return path, body
+
+def load_pages():
+    """[(url, html)]: saved pages when there are any, otherwise synthetic state + DOM pages."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(PAGES_DIR, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        match = URL_COMMENT_RE.match(html)
+        url = match.group(1) if match else f"https://www.justwatch.com/in/tv-show/{os.path.basename(path)[:-5]}"
+        pages.append((url, html))
+    if pages:
+        return pages
+    for i in range(SYNTHETIC_PAGES):
+        if i % 2:
+            path, html = state_page(i)
+        else:
+            path, html = f"/in/tv-show/benchmark-dom-{i}", dom_page(i)
+        pages.append((f"https://www.justwatch.com{path}", html))
+    return pages
+
+def save_pages(urls):
+    """Fetch title pages and store them under benchmarks/pages/ for offline runs."""
+    from scrapers.justwatch import fetch_html
+
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    saved = 0
+    for url in urls:
+        html = fetch_html(url, use_cache=False)
+        if html is None:
+            print(f"⚠️ Failed to fetch {url}")
+            continue
+        name = re.sub(r"[^a-z0-9]+", "-", url.split("justwatch.com", 1)[-1].lower()).strip("-") or "page"
+        with open(os.path.join(PAGES_DIR, f"{name}.html"), "w", encoding="utf-8") as f:
+            f.write(f"<!-- url: {url} -->\n{html}")
+        saved += 1
+    return saved
+
+
+# --- Synthetic sheets ---
+def catalog_frame(rows, seed=0):
+    """A JustWatch + posters + cast sheet as fed to the Excel → JSON converter."""
+    rnd = random.Random(seed)
+    data = []
+    for i in range(rows):
+        seasons = 1 + i % 6
+        data.append({
+            "Title": f"Show {i}",
+            "Year": 1990 + i % 35,
+            "Original Title": "" if i % 3 else f"Original {i}",
+            "Main Poster": f"https://res.cloudinary.com/demo/image/upload/jio_images/{i}.jpg",
+            "Seasons Count": seasons,
+            "Season Details": ", ".join(f"Season {s} : {6 + s} Episodes" for s in range(1, seasons + 1)),
+            "Season Poster": ", ".join(
+                f"https://res.cloudinary.com/demo/image/upload/jio_images/{i}-{s}.jpg" for s in range(1, seasons + 1)
+            ),
+            "JustWatch Rating": f"{rnd.randint(50, 99)}%",
+            "IMDB Rating": f"{rnd.randint(10, 99) / 10}",
+            # Numbers with the odd blank cell: typed per column, never per streamed chunk
+            "Rotten Tomatoes": "" if i % 997 == 5 else rnd.randint(10, 99),
+            "Genres": ", ".join(rnd.sample(GENRES, 3)),
+            "Runtime": f"{rnd.randint(20, 70)}min",
+            "Production Country": rnd.choice(COUNTRIES),
+            "Description": f"Description of show {i}. " * 3,
+            "YouTube Links": f"https://www.youtube.com/watch?v=a{i}, https://www.youtube.com/watch?v=b{i}",
+            "Caster": " | ".join(f"Actor {i}-{k} - Role {k}" for k in range(8)),
+        })
+    return pd.DataFrame(data)
+
+def posters_frame(rows):
+    """Title + comma-separated Season Posters, as produced by the poster scraper."""
+    return pd.DataFrame({
+        "Title": [f"Show {i}" for i in range(rows)],
+        "Season Posters": [
+            ", ".join(f"https://images.justwatch.com/poster/{i}{s}/s592/show.jpg" for s in range(1, 2 + i % 9))
+            for i in range(rows)
+        ],
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Save JustWatch title pages as benchmark fixtures.")
+    parser.add_argument("urls", help="text file with one title URL per line")
+    args = parser.parse_args()
+    with open(args.urls, encoding="utf-8") as f:
+        count = save_pages(line.strip() for line in f if line.strip())
+    print(f"✅ Saved {count} pages to {PAGES_DIR}")
@@ -0,0 +1,300 @@
+"""
+Benchmark suite for the scraping and conversion hot paths.
+
+    python -m benchmarks.run                          # all benchmarks, 1k / 10k / 100k row sheets
+    python -m benchmarks.run --only parse,json --sizes 1000
+    python -m benchmarks.run --only memory --sizes 10000     # peak RSS: pandas vs streaming xlsx I/O
+    python -m benchmarks.run --only posters_1m               # flatten/group at 1M poster rows (opt-in)
+    python -m benchmarks.run --compare benchmarks/results/a.json benchmarks/results/b.json
+
+Each run writes benchmarks/results/<timestamp>-<commit>.json; --compare lists
+the benchmarks that got slower by more than --threshold between two runs and
+exits non-zero if there are any.
+"""
+import argparse
+import filecmp
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+# Benchmarks measure our code, not politeness delays or trace writes
+os.environ.setdefault("RATE_LIMIT_RPS", "10000")
+os.environ.setdefault("METRICS_TRACE", "")
+
+from benchmarks.fixtures import catalog_frame, load_pages, posters_frame
+from benchmarks.server import PageServer
+from scrapers import http_cache
+from scrapers.excel_to_json import excel_to_json, frame_to_json, prepare_frame, records_to_json, row_to_json
+from scrapers.justwatch import parse_justwatch, parse_justwatch_bs4, scrape_justwatch_many
+from scrapers.justwatch_state import parse_title_state
+from scrapers.parse_pool import PARSE_WORKERS, get_parse_pool
+from scrapers.poster_rows import flatten_file, flatten_posters, group_file, group_posters
+from scrapers.table_io import read_table, table_bytes, write_table
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+GROUPS = ("parse", "fetch", "json", "tables", "memory")
+EXTRA_GROUPS = ("posters_1m",)      # slow; only run when named in --only
+LARGE_POSTER_ROWS = 1_000_000
+NOISE_FLOOR = 0.01      # seconds; smaller slowdowns are never reported as regressions
+
+
+# --- Timing ---
+def timed(fn, repeat):
+    """Best wall time of `repeat` calls (seconds)."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def record(results, name, size, seconds, repeat, peak_rss_mb=None):
+    results.append({
+        "name": name,
+        "size": size,
+        "seconds": round(seconds, 6),
+        "runs": repeat,
+        "per_second": round(size / seconds, 1) if seconds else None,
+        **({"peak_rss_mb": round(peak_rss_mb, 1)} if peak_rss_mb is not None else {}),
+    })
+    memory = f"  {peak_rss_mb:9.1f} MB" if peak_rss_mb is not None else ""
+    print(f"  {name:<40} {size:>8,}  {seconds:9.3f}s  {size / seconds if seconds else 0:12,.0f}/s{memory}")
+
+
+# --- Benchmarks ---
+def bench_parse(results, pages, sizes, repeat, workdir):
+    state_pages = [(u, h) for u, h in pages if parse_title_state(h, u)]
+    dom_pages = [(u, h) for u, h in pages if (u, h) not in state_pages]
+    if state_pages:
+        seconds = timed(lambda: [parse_justwatch(h, u) for u, h in state_pages], repeat)
+        record(results, "parse.state", len(state_pages), seconds, repeat)
+    if dom_pages:
+        seconds = timed(lambda: [parse_justwatch(h, u, backend="lxml") for u, h in dom_pages], repeat)
+        record(results, "parse.lxml", len(dom_pages), seconds, repeat)
+        seconds = timed(lambda: [parse_justwatch_bs4(h, u) for u, h in dom_pages], repeat)
+        record(results, "parse.bs4", len(dom_pages), seconds, repeat)
+
+def bench_fetch(results, pages, sizes, repeat, workdir):
+    by_path = {urlsplit(u).path: h for u, h in pages}
+    with PageServer(by_path) as server:
+        urls = [server.url(path) for path in by_path]
+        seconds = timed(lambda: scrape_justwatch_many(urls, use_cache=False, parse_workers=0), repeat)
+        record(results, "fetch.scrape_many", len(urls), seconds, repeat)
+        workers = max(PARSE_WORKERS, 1)
+        get_parse_pool(workers)
+        seconds = timed(lambda: scrape_justwatch_many(urls, use_cache=False, parse_workers=workers), repeat)
+        record(results, f"fetch.scrape_many_parse_pool_{workers}", len(urls), seconds, repeat)
+
+        # Cold cache, then fresh hits, then revalidation (ttl=0 → conditional GET, 304)
+        saved = http_cache._cache
+        try:
+            http_cache._cache = http_cache.ResponseCache(os.path.join(workdir, "cold.sqlite3"))
+            record(results, "fetch.cache_cold", len(urls), timed(lambda: scrape_justwatch_many(urls), 1), 1)
+            record(results, "fetch.cache_hit", len(urls), timed(lambda: scrape_justwatch_many(urls), repeat), repeat)
+            http_cache._cache.ttl = 0
+            seconds = timed(lambda: scrape_justwatch_many(urls), repeat)
+            record(results, "fetch.cache_revalidate", len(urls), seconds, repeat)
+        finally:
+            http_cache._cache = saved
+
+def bench_json(results, pages, sizes, repeat, workdir):
+    for size in sizes:
+        df = prepare_frame(catalog_frame(size))
+        path = os.path.join(workdir, f"catalog-{size}.xlsx")
+        write_table(df, path)
+        out = os.path.join(workdir, f"catalog-{size}.json")
+        if size <= 10_000:      # the per-row baseline is too slow to be worth timing beyond this
+            seconds = timed(lambda: [row_to_json(row) for _, row in df.iterrows()], repeat)
+            record(results, "json.row_to_json", size, seconds, repeat)
+        record(results, "json.frame_to_json", size, timed(lambda: frame_to_json(df), repeat), repeat)
+        records = frame_to_json(df)
+        if size <= 10_000 and records != [row_to_json(row) for _, row in df.iterrows()]:
+            raise AssertionError(f"❌ frame_to_json output differs from row_to_json ({size} rows)")
+        record(results, "json.records_to_json", size, timed(lambda: records_to_json(records), repeat), repeat)
+        seconds = timed(lambda: excel_to_json(path, out), repeat)
+        record(results, "json.excel_to_json", size, seconds, repeat)
+        stream_out = os.path.join(workdir, f"catalog-{size}-stream.json")
+        seconds = timed(lambda: excel_to_json(path, stream_out, stream=True), repeat)
+        record(results, "json.excel_to_json_stream", size, seconds, repeat)
+        if not filecmp.cmp(out, stream_out, shallow=False):
+            raise AssertionError(f"❌ Streaming Excel → JSON output differs from the in-memory output ({size} rows)")
+
+def bench_tables(results, pages, sizes, repeat, workdir):
+    for size in sizes:
+        posters = posters_frame(size)
+        record(results, "tables.flatten", size, timed(lambda: flatten_posters(posters), repeat), repeat)
+        flat = flatten_posters(posters)
+        record(results, "tables.group", len(flat), timed(lambda: group_posters(flat), repeat), repeat)
+
+        df = catalog_frame(size)
+        for fmt in ("xlsx", "parquet", "csv"):
+            data = table_bytes(df, fmt)
+            record(results, f"tables.write_{fmt}", size, timed(lambda: table_bytes(df, fmt), repeat), repeat)
+            path = os.path.join(workdir, f"catalog-{size}.{fmt}")
+            with open(path, "wb") as f:
+                f.write(data)
+            record(results, f"tables.read_{fmt}", size, timed(lambda: read_table(path), repeat), repeat)
+
+def bench_posters_1m(results, pages, sizes, repeat, workdir):
+    # posters_frame gives titles 1-9 posters each: 5 on average
+    titles = LARGE_POSTER_ROWS // 5
+    posters = posters_frame(titles)
+    flat = flatten_posters(posters)
+    record(results, "posters_1m.flatten", len(flat), timed(lambda: flatten_posters(posters), repeat), repeat)
+    record(results, "posters_1m.group", len(flat), timed(lambda: group_posters(flat), repeat), repeat)
+
+    # Chunked file variants, as used for sheets too large to hold in memory
+    src, flat_path, grouped_path = (os.path.join(workdir, f"posters-1m{name}.csv") for name in ("", "-flat", "-grouped"))
+    write_table(posters, src)
+    seconds = timed(lambda: flatten_file(src, flat_path), repeat)
+    record(results, "posters_1m.flatten_file_csv", len(flat), seconds, repeat)
+    seconds = timed(lambda: group_file(flat_path, grouped_path), repeat)
+    record(results, "posters_1m.group_file_csv", len(flat), seconds, repeat)
+
+# Each case runs in a fresh interpreter: (imports, timed work on `src` → `dst`)
+EXCEL_IO_CASES = {
+    # Before the table_io module: the whole sheet in a DataFrame, output built in a BytesIO
+    "read_pandas": ("import pandas as pd", "pd.read_excel(src, engine='openpyxl')"),
+    "read_stream": ("from scrapers.table_io import iter_table_rows", "for _ in iter_table_rows(src): pass"),
+    "roundtrip_pandas": (
+        "import io\nimport pandas as pd",
+        "pd.read_excel(src, engine='openpyxl').to_excel(io.BytesIO(), engine='openpyxl', index=False)",
+    ),
+    "roundtrip_stream": (
+        "from scrapers.table_io import excel_columns, iter_table_rows, write_table",
+        "write_table(iter_table_rows(src), dst, columns=excel_columns(src))",
+    ),
+}
+MEASURED = """
+import resource, sys, time
+
+def peak_kb():
+    # VmHWM is this process's own high-water mark; ru_maxrss also carries the parent's across fork + exec
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+{setup}
+src, dst = sys.argv[1], sys.argv[2]
+peak = peak_kb()
+started = time.perf_counter()
+{body}
+print(time.perf_counter() - started, peak, peak_kb())
+"""
+
+def measure(setup, body, src, dst):
+    """(seconds, peak RSS growth in MB) of `body` in a fresh interpreter, after its imports."""
+    out = subprocess.run(
+        [sys.executable, "-c", MEASURED.format(setup=setup, body=body), src, dst],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output=True, text=True, check=True,
+    ).stdout.split()
+    seconds, before, after = float(out[0]), int(out[1]), int(out[2])
+    return seconds, (after - before) / 1024      # KB on Linux
+
+def bench_memory(results, pages, sizes, repeat, workdir):
+    for size in sizes:
+        src = os.path.join(workdir, f"memory-{size}.xlsx")
+        write_table(catalog_frame(size), src)
+        for case, (setup, body) in EXCEL_IO_CASES.items():
+            runs = [measure(setup, body, src, os.path.join(workdir, f"memory-{size}-out.xlsx")) for _ in range(repeat)]
+            record(results, f"memory.excel_{case}", size, min(r[0] for r in runs), repeat,
+                   peak_rss_mb=min(r[1] for r in runs))
+
+BENCHMARKS = {
+    "parse": bench_parse, "fetch": bench_fetch, "json": bench_json, "tables": bench_tables, "memory": bench_memory,
+    "posters_1m": bench_posters_1m,
+}
+
+
+# --- Results ---
+def git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_results(results, path=None):
+    commit = git_commit()
+    now = datetime.now(timezone.utc)
+    data = {
+        "commit": commit,
+        "timestamp": now.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{now:%Y%m%d-%H%M%S}-{commit or 'nogit'}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+def compare(old_path, new_path, threshold=0.10):
+    """Print per-benchmark change between two result files; returns the regressions."""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    before = {(r["name"], r["size"]): r["seconds"] for r in old["results"]}
+    regressions = []
+    print(f"{old.get('commit')} → {new.get('commit')}")
+    for r in new["results"]:
+        key = (r["name"], r["size"])
+        if key not in before or not before[key]:
+            continue
+        change = r["seconds"] / before[key] - 1
+        flag = ""
+        if change > threshold and r["seconds"] - before[key] > NOISE_FLOOR:
+            flag = "  ⚠️ slower"
+            regressions.append({"name": r["name"], "size": r["size"], "change": round(change, 3)})
+        print(f"  {r['name']:<40} {r['size']:>8,}  {before[key]:9.3f}s → {r['seconds']:9.3f}s  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scraping and conversion hot paths.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated sheet row counts")
+    parser.add_argument("--only", default=",".join(GROUPS),
+                        help=f"comma-separated groups ({', '.join(GROUPS + EXTRA_GROUPS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the best time is kept")
+    parser.add_argument("-o", "--output", help="results file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two results files and exit")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        regressions = compare(*args.compare, threshold=args.threshold)
+        return 1 if regressions else 0
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS + EXTRA_GROUPS)
+    if unknown:
+        parser.error(f"unknown benchmark group(s): {', '.join(sorted(unknown))}")
+
+    pages = load_pages()
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for group in groups:
+            print(f"▶ {group}")
+            BENCHMARKS[group](results, pages, sizes, max(args.repeat, 1), workdir)
+    print(f"✅ Results saved to {save_results(results, args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
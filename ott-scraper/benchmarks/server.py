@@ -0,0 +1,87 @@
+"""Local HTTP server serving the fixture pages, so fetch benchmarks never touch the network."""
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class PageServer:
+    """
+    Serves {path: html} on 127.0.0.1 with ETags (304 on If-None-Match),
+    in a background thread:
+
+        with PageServer(pages) as server:
+            urls = [server.url(path) for path in pages]
+
+    `faults` queues error responses served before a page, e.g.
+    {"/a": [(429, {"Retry-After": "1"}), (503, {})]}, and `delays`
+    holds a page's response for that many seconds: {"/slow": 2.0}.
+    """
+
+    def __init__(self, pages, faults=None, delays=None):
+        self.pages = {path: html.encode("utf-8") for path, html in pages.items()}
+        self.etags = {path: '"%s"' % hashlib.md5(body).hexdigest() for path, body in self.pages.items()}
+        self.faults = {path: list(queue) for path, queue in (faults or {}).items()}
+        self.delays = dict(delays or {})
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"     # keep-alive, like the real site
+            disable_nagle_algorithm = True      # headers and body go out in separate writes
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                with server._lock:
+                    server.requests += 1
+                    fault = server.faults[path].pop(0) if server.faults.get(path) else None
+                if path in server.delays:
+                    time.sleep(server.delays[path])
+                if fault:
+                    status, headers = fault
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = server.pages.get(path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = server.etags[path]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def url(self, path):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,136 @@
+"""
+App startup and rerun latency.
+
+    python -m benchmarks.startup
+
+Cold start: each page's imports (read from app.py, top-level + the page's own
+branch) are timed in a fresh interpreter, next to "all pages", which is what
+every rerun paid for when app.py imported everything up front. With streamlit
+installed, the app itself is also run headless (streamlit.testing AppTest):
+first run in a fresh process, then a rerun per page. Results use the same
+JSON format as benchmarks.run, so --compare works on them too.
+"""
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+import time
+
+from benchmarks.run import compare, record, save_results
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(PROJECT_DIR, "app.py")
+
+
+# --- Imports per page, from app.py ---
+def _imports(nodes):
+    modules = []
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            if node.module == "scrapers":
+                modules += [f"scrapers.{alias.name}" for alias in node.names]
+            else:
+                modules.append(node.module)
+    return modules
+
+def page_imports(path=APP_PATH):
+    """({page: [modules]}, [top-level modules]) as app.py imports them."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    top = [m for m in _imports(tree.body) if m != "streamlit"]
+    pages = {}
+    for node in tree.body:
+        while isinstance(node, ast.If):
+            test = node.test
+            if isinstance(test, ast.Compare) and isinstance(test.comparators[0], ast.Constant):
+                pages[test.comparators[0].value] = _imports(node.body)
+            node = node.orelse[0] if len(node.orelse) == 1 else None
+    return pages, top
+
+def slug(page):
+    return re.sub(r"[^a-z0-9]+", "_", page.lower()).strip("_")
+
+
+# --- Measurements ---
+def time_subprocess(code, repeat):
+    """Best wall time of running `code` in a fresh interpreter, or None if it fails (missing dependency)."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True)
+        elapsed = time.perf_counter() - started
+        if proc.returncode:
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_imports(results, repeat):
+    pages, top = page_imports()
+    bare = time_subprocess("pass", repeat)
+    sets = {slug(page): top + modules for page, modules in pages.items()}
+    sets["all_pages"] = list(dict.fromkeys(top + [m for modules in pages.values() for m in modules]))
+    for name, modules in sets.items():
+        seconds = time_subprocess("; ".join(f"import {m}" for m in dict.fromkeys(modules)) or "pass", repeat)
+        if seconds is None:
+            print(f"  startup.import.{name:<25} skipped (missing dependency)")
+            continue
+        record(results, f"startup.import.{name}", 1, max(seconds - bare, 0.0), repeat)
+
+APP_TEST = """
+import time
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+AppTest.from_file({path!r}, default_timeout=120).run()
+print(time.perf_counter() - started)
+"""
+
+def bench_app(results, repeat):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("  streamlit not installed: skipping app cold start / rerun timings")
+        return
+    cold = time_subprocess(APP_TEST.format(path=APP_PATH), repeat)
+    if cold is not None:
+        record(results, "startup.app_cold", 1, cold, repeat)
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120).run()
+    for page in page_imports()[0]:
+        at.sidebar.radio[0].set_value(page)
+        started = time.perf_counter()
+        at.run()
+        record(results, f"startup.first_visit.{slug(page)}", 1, time.perf_counter() - started, 1)
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            at.run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        record(results, f"startup.rerun.{slug(page)}", 1, best, repeat)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app cold start and per-page rerun latency.")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the best time is kept")
+    parser.add_argument("-o", "--output", help="results file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two results files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return 1 if compare(*args.compare) else 0
+
+    results = []
+    print("▶ imports")
+    bench_imports(results, max(args.repeat, 1))
+    print("▶ app")
+    bench_app(results, max(args.repeat, 1))
+    print(f"✅ Results saved to {save_results(results, args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import functools
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from selenium import webdriver
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from scrapers.rate_limit import throttle
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/115.0.0.0 Safari/537.36"
+)
+DEFAULT_WORKERS = 3
+DEFAULT_MAX_PAGES = 50      # recycle a browser after this many pages
+# WebDriverException messages that mean the browser itself is gone, not just this page
+SESSION_LOST_MARKERS = (
+    "invalid session id", "session deleted", "no such session", "chrome not reachable",
+    "disconnected", "target window already closed", "tab crashed",
+)
+
+# The scrapers only read DOM attributes, so images, fonts, media and
+# trackers are never needed. Override with a comma-separated BLOCKED_URLS.
+DEFAULT_BLOCKLIST = [
+    "*.jpg", "*.jpeg", "*.png", "*.webp", "*.gif", "*.svg", "*.ico", "*.avif",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m3u8",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*hotjar.com*", "*scorecardresearch.com*",
+    "*youtube.com/embed*", "*ytimg.com*",
+]
+BLOCKLIST = [u.strip() for u in os.getenv("BLOCKED_URLS", "").split(",") if u.strip()] or DEFAULT_BLOCKLIST
+
+
+# --- Driver setup ---
+@functools.lru_cache(maxsize=None)
+def chromedriver_path():
+    """Resolve the chromedriver binary once per process instead of on every run."""
+    return ChromeDriverManager().install()
+
+def build_chrome_options(headless=True, eager=True):
+    """Chrome options shared by every Selenium scraper."""
+    options = webdriver.ChromeOptions()
+    if eager:
+        options.page_load_strategy = "eager"    # return from get() at DOMContentLoaded
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    else:
+        options.add_argument("--start-maximized")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    return options
+
+def new_driver(headless=True, blocklist=BLOCKLIST):
+    """Start Chrome; requests matching `blocklist` patterns are dropped via CDP (pass None to allow all)."""
+    driver = webdriver.Chrome(
+        service=Service(chromedriver_path()),
+        options=build_chrome_options(headless),
+    )
+    if blocklist:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocklist)})
+    return driver
+
+def session_lost(exc):
+    """True when `exc` means the driver's browser crashed or went away, so the driver must be replaced."""
+    if isinstance(exc, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    if not isinstance(exc, WebDriverException):
+        return False
+    message = (exc.msg or str(exc)).lower()
+    return any(marker in message for marker in SESSION_LOST_MARKERS)
+
+
+# --- Pool ---
+class BrowserPool:
+    """
+    N long-lived Chrome instances shared by the Selenium scrapers.
+
+    Use as a context manager so drivers are always quit, including when a
+    Streamlit rerun interrupts the script thread mid-run:
+
+        with BrowserPool(size=4) as pool:
+            results = pool.map(scrape_page, urls)
+    """
+
+    def __init__(self, size=DEFAULT_WORKERS, headless=True, max_pages=DEFAULT_MAX_PAGES, blocklist=BLOCKLIST):
+        self.size = max(size, 1)
+        self.headless = headless
+        self.blocklist = blocklist
+        self.max_pages = max_pages
+        self._idle = queue.Queue()
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            driver = new_driver(self.headless, self.blocklist)
+            with self._lock:
+                self._pages[id(driver)] = 0
+            return driver
+
+    def _release(self, driver, broken=False):
+        with self._lock:
+            self._pages[id(driver)] += 1
+            worn_out = self._pages[id(driver)] >= self.max_pages
+        if broken or worn_out or self._closed.is_set():
+            self._quit(driver)
+        else:
+            self._idle.put(driver)
+
+    def _quit(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def run(self, fn, url, retries=1):
+        """
+        Run `fn(driver, url)` on a pooled browser; a crashed browser (see `session_lost`) is replaced
+        and the URL retried. Any other error leaves the browser in the pool and propagates.
+        """
+        for attempt in range(retries + 1):
+            if self._closed.is_set():
+                raise RuntimeError("Browser pool is closed")
+            driver = self._acquire()
+            try:
+                # Page loads are paced per host, but their multi-second latency stays out of the HTTP limiter
+                with throttle(url, channel="browser") as slot:
+                    try:
+                        result = fn(driver, url)
+                    except WebDriverException as e:
+                        if session_lost(e):
+                            slot.excuse()       # the browser broke, not the host: retry without a backoff
+                        raise
+            except WebDriverException as e:
+                if not session_lost(e):
+                    self._release(driver)
+                    raise
+                self._release(driver, broken=True)
+                if attempt == retries:
+                    raise
+            except BaseException:
+                self._release(driver)
+                raise
+            else:
+                self._release(driver)
+                return result
+
+    def map(self, fn, urls, progress_callback=None, on_error=None, on_result=None):
+        """
+        Dispatch `fn(driver, url)` across the pool; results are returned in input order.
+        `on_result(index, result)` and `progress_callback(done, total)` run in the calling thread
+        as each page finishes. Failures become `on_error(url, exc)` when given, otherwise they are raised.
+        """
+        urls = list(urls)
+        results = [None] * len(urls)
+        futures = {self._executor.submit(self.run, fn, url): i for i, url in enumerate(urls)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                results[i] = on_error(urls[i], e)
+            if on_result:
+                on_result(i, results[i])
+            if progress_callback:
+                progress_callback(done, len(urls))
+        return results
+
+    def close(self):
+        """Cancel queued pages and quit every browser; busy ones are quit as they finish."""
+        self._closed.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
@@ -1,102 +1,131 @@
 import pandas as pd
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
-
-def scrape_cast_from_excel(input_excel, output_excel, url_column="Source URL"):
+from scrapers.browser_pool import BrowserPool, DEFAULT_WORKERS
+from scrapers.justwatch_state import fetch_title_states, format_cast, parse_title_state
+from scrapers.page_ready import PageTimer, record_page_metrics, wait_for_element
+from scrapers.table_io import read_table, write_table
+
+
+# Reads every credit card in one round trip. Each role is looked up inside its
+# own card, so actors and roles stay paired; textContent also covers cards the
+# carousel hasn't scrolled into view, so no "Next" clicking is needed.
+CAST_JS = """
+return Array.from(document.querySelectorAll('.title-credit-name')).map(nameEl => {
+    const card = nameEl.closest('.title-credits__actor') || nameEl.parentElement;
+    const roleEl = card ? card.querySelector('.title-credits__actor--role--name strong') : null;
+    return {actor: nameEl.textContent.trim(), role: roleEl ? roleEl.textContent.trim() : ''};
+});
+"""
+
+
+def scrape_cast_page(driver, url, timings=None):
+    """Return 'Actor - Role | ...' for one title page."""
+    timer = PageTimer(url)
+    try:
+        with timer.step("load"):
+            driver.get(url)
+        return read_cast(driver, url, timer)
+    finally:
+        if timings is not None:
+            timings.append(timer.as_row())
+
+def read_cast(driver, url, timer=None):
+    """'Actor - Role | ...' from the page already loaded in `driver` (see scrape_cast_page)."""
+    timer = timer or PageTimer(url)
+
+    # Wait until cast section loads (10s timeout)
+    with timer.step("wait_cast"):
+        found = wait_for_element(driver, ".title-credit-name", timeout=10)
+
+    record_page_metrics(driver, timer)
+
+    with timer.step("extract"):
+        cast = []
+        if found:
+            cast = [
+                (c["actor"], c["role"] or "Unknown Role")
+                for c in driver.execute_script(CAST_JS)
+                if c["actor"]
+            ]
+        if not cast:
+            # Client-rendered pages may still carry the embedded state
+            state = parse_title_state(driver.page_source, url)
+            cast = state["cast"] if state else []
+        return format_cast(cast)
+
+
+def scrape_cast_from_excel(input_excel, output_excel, url_column="Source URL", workers=DEFAULT_WORKERS,
+                           timings=None):
     """
-    Reads an Excel file, scrapes cast details from each URL, and saves results to a new Excel file.
+    Reads a table (xlsx, Parquet, CSV or JSONL — by extension), scrapes cast details
+    from each URL, and saves results to a new file in the output path's format.
+    Pass a list as `timings` to collect per-URL step timings of browser-scraped pages.
     """
 
     # ===== 1. Read Excel file =====
-    df = pd.read_excel(input_excel)
+    df = read_table(input_excel)
 
     if url_column not in df.columns:
         raise ValueError(f"❌ Column '{url_column}' not found in Excel. Found columns: {list(df.columns)}")
 
     urls_to_scrape = df[url_column].dropna().unique()  # remove duplicates
-    final_data = []
-
-    # ===== 2. Setup Selenium =====
-    options = Options()
-    options.add_argument("--headless")  # comment out if you want browser visible
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/115.0.0.0 Safari/537.36"
+    results = scrape_cast_many(
+        urls_to_scrape,
+        workers=workers,
+        timings=timings,
+        progress_callback=lambda done, total: print(f"🎬 Scraped {done}/{total}"),
     )
 
-    driver = webdriver.Chrome(options=options)
+    # ===== 2. Save results =====
+    final_data = [{"Source URL": url, **result} for url, result in zip(urls_to_scrape, results)]
+    write_table(pd.DataFrame(final_data), output_excel)
+    print(f"✅ Done! Results saved to: {output_excel}")
+    return output_excel
 
-    # ===== 3. Loop through all URLs =====
-    for url in urls_to_scrape:
-        print(f"🎬 Scraping: {url}")
-        try:
-            driver.get(url)
 
-            # Wait until cast section loads (10s timeout)
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "title-credit-name"))
+def scrape_cast_many(urls, workers=DEFAULT_WORKERS, timings=None, progress_callback=None, on_result=None):
+    """
+    Cast for each URL, in input order, as {"Cast": "Actor - Role | ..."} dicts.
+    Pages with embedded state are read over HTTP; only the rest open a browser.
+    `on_result(index, row)` fires as each URL finishes.
+    """
+    urls = list(urls)
+    results = [None] * len(urls)
+    done = 0
+
+    def finish(i, row):
+        nonlocal done
+        results[i] = row
+        done += 1
+        if on_result:
+            on_result(i, row)
+        if progress_callback:
+            progress_callback(done, len(urls))
+
+    # Read cast from the embedded page state (no browser needed)
+    states = fetch_title_states(urls)
+    browser_idx = []
+    for i, url in enumerate(urls):
+        if states.get(url):
+            finish(i, {"Cast": format_cast(states[url]["cast"])})
+        else:
+            browser_idx.append(i)
+
+    # Scrape remaining pages on the browser pool
+    if browser_idx:
+        with BrowserPool(size=workers, headless=True) as pool:
+            pool.map(
+                lambda driver, url: scrape_cast_page(driver, url, timings),
+                [urls[i] for i in browser_idx],
+                on_error=_cast_error,
+                on_result=lambda j, cast: finish(browser_idx[j], {"Cast": cast}),
             )
+    return results
 
-            # Scroll down to load more elements
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
-
-            # Keep clicking "Next" button until disabled
-            while True:
-                try:
-                    next_button = driver.find_element(By.CSS_SELECTOR,
-                                                      ".title-credits__actor-list__navigation--next")
-                    if next_button.is_enabled():
-                        next_button.click()
-                        time.sleep(0.8)
-                    else:
-                        break
-                except:
-                    break
-
-            # Extract actors and roles
-            actors = driver.find_elements(By.CLASS_NAME, "title-credit-name")
-            roles = driver.find_elements(By.CSS_SELECTOR, ".title-credits__actor--role--name strong")
-
-            if actors:
-                role_texts = [role.text.strip() if role.text.strip() else "Unknown Role" for role in roles]
-
-                # Ensure matching lengths
-                while len(role_texts) < len(actors):
-                    role_texts.append("Unknown Role")
-
-                cast_list = [f"{name.text.strip()} - {role}" for name, role in zip(actors, role_texts)]
-                cast_text = " | ".join(cast_list)
-            else:
-                cast_text = "Not Found"
-
-            final_data.append({
-                "Source URL": url,
-                "Cast": cast_text
-            })
-
-        except Exception as e:
-            print(f"⚠️ Error scraping {url}: {e}")
-            final_data.append({
-                "Source URL": url,
-                "Cast": "Not Found"
-            })
-
-    # ===== 4. Save results =====
-    pd.DataFrame(final_data).to_excel(output_excel, index=False)
-    driver.quit()
 
-    print(f"✅ Done! Results saved to: {output_excel}")
-    return output_excel
+def _cast_error(url, e):
+    print(f"⚠️ Error scraping {url}: {e}")
+    return "Not Found"
 
 
 # ========= Run standalone ========= #
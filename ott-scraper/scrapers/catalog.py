@@ -0,0 +1,359 @@
+"""
+Local title catalog.
+
+Everything the scrapers learn about a title is kept per `Source URL` in one
+SQLite file: the JustWatch row, poster URLs, cast and the Cloudinary URL of
+each uploaded poster. Jobs, the pipeline and the Cloudinary page write to it
+as they go (bulk upserts, one transaction per batch); the "🗂 Catalog" page
+queries it by title, year, platform and genre (all indexed) and exports xlsx
+or JSON (via `row_to_json`) without touching the network. Existing sheets can
+be loaded with
+
+    python -m scrapers.catalog import justwatch_output.xlsx poster_output.xlsx
+    python -m scrapers.catalog export titles.json --genre Drama --year-from 2020
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from itertools import islice
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".catalog", "catalog.sqlite3")
+DEFAULT_PLATFORM = os.getenv("CATALOG_PLATFORM", "hotstar")    # same default as row_to_json
+KINDS = ("justwatch", "posters", "cast")
+MISSING = {"", "Not Found", "Error"}
+HYDRATE_BATCH = 500     # titles loaded per query while reading results
+
+# Column layout of the exported sheet: the scrapers' merged output, as the Excel → JSON converter reads it
+SHEET_COLUMNS = [
+    "Title", "Year", "Original Title", "Main Poster", "Seasons Count", "Season Details", "Season Poster",
+    "JustWatch Rating", "IMDB Rating", "Rotten Tomatoes", "Genres", "Runtime", "Production Country",
+    "Description", "YouTube Links", "Caster", "Platform", "Source URL",
+]
+
+
+# --- Helper functions ---
+def _value(v):
+    """None for empty cells and the scrapers' "Not Found" / "Error" markers."""
+    if v is None or (isinstance(v, float) and v != v):     # NaN from pandas-read sheets
+        return None
+    return None if str(v).strip() in MISSING else v
+
+def _year(v):
+    try:
+        return int(float(v))
+    except (TypeError, ValueError):
+        return None
+
+def _split(value):
+    return [p.strip() for p in str(value or "").split(",") if p.strip() and p.strip() not in MISSING]
+
+def _escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# --- Store ---
+class Catalog:
+    """Titles, genres, posters and uploaded poster URLs per Source URL in SQLite."""
+
+    def __init__(self, path=CATALOG_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")     # WAL keeps this crash-safe; commits stay cheap
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS titles (
+                source_url TEXT PRIMARY KEY,
+                title TEXT COLLATE NOCASE,
+                year INTEGER,
+                platform TEXT COLLATE NOCASE,
+                data TEXT,
+                caster TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_titles_title ON titles(title);
+            CREATE INDEX IF NOT EXISTS idx_titles_year ON titles(year);
+            CREATE INDEX IF NOT EXISTS idx_titles_platform ON titles(platform);
+            CREATE TABLE IF NOT EXISTS genres (
+                genre TEXT NOT NULL COLLATE NOCASE,
+                source_url TEXT NOT NULL,
+                PRIMARY KEY (genre, source_url)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_genres_url ON genres(source_url);
+            CREATE TABLE IF NOT EXISTS posters (
+                source_url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (source_url, position)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS uploads (
+                url TEXT PRIMARY KEY,
+                cloud_url TEXT NOT NULL,
+                uploaded_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    # --- Writes ---
+    def upsert(self, kind, items, platform=DEFAULT_PLATFORM):
+        """
+        Store scraper output for many titles in one transaction; `items` are (source_url, row) pairs.
+        `kind` is "justwatch" (a scrape_justwatch row), "posters" ({"Main Poster", "Season Posters"})
+        or "cast" ({"Cast"}). Error rows and "Not Found" values are skipped. Returns the titles written.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"❌ Unknown catalog kind: {kind}")
+        now = time.time()
+        written = 0
+        with self._lock, self._conn:
+            for url, row in items:
+                url = str(url or "").strip()
+                if not url or not row or "Error" in row:
+                    continue
+                written += getattr(self, f"_put_{kind}")(url, row, now, platform)
+        return written
+
+    def _put_justwatch(self, url, row, now, platform):
+        # Only known values are written; a partial row keeps what an earlier scrape found
+        data = {k: v for k, v in row.items() if k != "Change" and _value(v) is not None}
+        self._conn.execute(
+            """INSERT INTO titles (source_url, title, year, platform, data, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(source_url) DO UPDATE SET
+                   title = COALESCE(excluded.title, titles.title), year = COALESCE(excluded.year, titles.year),
+                   data = json_patch(COALESCE(titles.data, '{}'), excluded.data),
+                   platform = COALESCE(titles.platform, excluded.platform), updated_at = excluded.updated_at""",
+            (url, _value(row.get("Title")), _year(row.get("Year")), _value(row.get("Platform")) or platform,
+             json.dumps(data, ensure_ascii=False, default=str), now),
+        )
+        genres = _split(row.get("Genres"))
+        if genres:
+            self._conn.execute("DELETE FROM genres WHERE source_url = ?", (url,))
+            self._conn.executemany("INSERT OR IGNORE INTO genres VALUES (?, ?)", [(g, url) for g in genres])
+        return True
+
+    def _touch(self, url, now, platform):
+        self._conn.execute(
+            """INSERT INTO titles (source_url, platform, updated_at) VALUES (?, ?, ?)
+               ON CONFLICT(source_url) DO UPDATE SET updated_at = excluded.updated_at""",
+            (url, platform, now),
+        )
+
+    def _put_posters(self, url, row, now, platform):
+        main = _value(row.get("Main Poster"))
+        seasons = _split(row.get("Season Posters", row.get("Season Poster")))
+        if main is None and not seasons:
+            return False
+        self._touch(url, now, _value(row.get("Platform")) or platform)
+        # Position 0 is the main poster, season posters start at 1; each is only replaced by a real URL
+        if main is not None:
+            self._conn.execute("INSERT OR REPLACE INTO posters VALUES (?, 0, ?)", (url, str(main).strip()))
+        if seasons:
+            self._conn.execute("DELETE FROM posters WHERE source_url = ? AND position > 0", (url,))
+            self._conn.executemany(
+                "INSERT INTO posters VALUES (?, ?, ?)", [(url, i, p) for i, p in enumerate(seasons, 1)]
+            )
+        return True
+
+    def _put_cast(self, url, row, now, platform):
+        cast = _value(row.get("Cast", row.get("Caster")))
+        if cast is None:
+            return False
+        self._touch(url, now, _value(row.get("Platform")) or platform)
+        self._conn.execute("UPDATE titles SET caster = ? WHERE source_url = ?", (str(cast), url))
+        return True
+
+    def record_uploads(self, mapping):
+        """Remember {poster source URL: Cloudinary URL}; failed uploads (mapped to themselves) are skipped."""
+        now = time.time()
+        rows = [(src, dst, now) for src, dst in mapping.items() if dst and dst != src]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO uploads VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    # --- Reads ---
+    def _where(self, title=None, year_from=None, year_to=None, platform=None, genre=None):
+        clauses, args = [], []
+        if title:
+            # Prefix match on the NOCASE index
+            clauses.append("t.title LIKE ? ESCAPE '\\'")
+            args.append(_escape_like(title.strip()) + "%")
+        if year_from is not None:
+            clauses.append("t.year >= ?")
+            args.append(int(year_from))
+        if year_to is not None:
+            clauses.append("t.year <= ?")
+            args.append(int(year_to))
+        if platform:
+            clauses.append("t.platform = ?")
+            args.append(platform)
+        if genre:
+            clauses.append("t.source_url IN (SELECT source_url FROM genres WHERE genre = ?)")
+            args.append(genre)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def count(self, **filters):
+        where, args = self._where(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM titles t{where}", args).fetchone()[0]
+
+    def iter_rows(self, limit=None, **filters):
+        """Sheet rows (SHEET_COLUMNS) of matching titles ordered by title, loaded a batch at a time."""
+        where, args = self._where(**filters)
+        sql = f"SELECT t.source_url FROM titles t{where} ORDER BY t.title, t.source_url LIMIT ?"
+        with self._lock:
+            urls = [u for (u,) in self._conn.execute(sql, [*args, -1 if limit is None else int(limit)])]
+        for i in range(0, len(urls), HYDRATE_BATCH):
+            yield from self._hydrate(urls[i:i + HYDRATE_BATCH])
+
+    def _hydrate(self, urls):
+        marks = ",".join("?" * len(urls))
+        with self._lock:
+            titles = {
+                r[0]: r for r in self._conn.execute(
+                    f"SELECT source_url, title, year, platform, data, caster FROM titles WHERE source_url IN ({marks})",
+                    urls,
+                )
+            }
+            posters = {}
+            for url, position, poster, cloud in self._conn.execute(
+                f"""SELECT p.source_url, p.position, p.url, u.cloud_url FROM posters p
+                    LEFT JOIN uploads u ON u.url = p.url
+                    WHERE p.source_url IN ({marks}) ORDER BY p.source_url, p.position""",
+                urls,
+            ):
+                posters.setdefault(url, {})[position] = cloud or poster
+        for url in urls:
+            _, title, year, platform, data, cast = titles[url]
+            yield self._sheet_row(url, title, year, platform, json.loads(data) if data else {}, cast,
+                                  posters.get(url, {}))
+
+    @staticmethod
+    def _sheet_row(url, title, year, platform, data, cast, posters):
+        """`posters` is {position: url}; position 0 is the main poster."""
+        main = posters.get(0) or data.get("Main Poster")
+        return {
+            "Title": title,
+            "Year": year,
+            "Original Title": data.get("Original Title"),
+            "Main Poster": main,
+            "Seasons Count": data.get("Seasons Count"),
+            "Season Details": data.get("Season Details"),
+            "Season Poster": ", ".join(p for position, p in sorted(posters.items()) if position > 0),
+            "JustWatch Rating": data.get("JustWatch Rating"),
+            "IMDB Rating": data.get("IMDB Rating"),
+            "Rotten Tomatoes": data.get("Rotten Tomatoes"),
+            "Genres": data.get("Genres"),
+            "Runtime": data.get("Runtime"),
+            "Production Country": data.get("Production Country"),
+            "Description": data.get("Synopsis", data.get("Description")),
+            "YouTube Links": data.get("YouTube Links"),
+            "Caster": cast,
+            "Platform": platform,
+            "Source URL": url,
+        }
+
+    def facets(self):
+        """Values for the query widgets: platforms, genres (by title count) and the year range."""
+        with self._lock:
+            platforms = [p for (p,) in self._conn.execute(
+                "SELECT DISTINCT platform FROM titles WHERE platform IS NOT NULL ORDER BY platform"
+            )]
+            genres = [g for (g,) in self._conn.execute(
+                "SELECT genre FROM genres GROUP BY genre ORDER BY COUNT(*) DESC, genre"
+            )]
+            years = self._conn.execute("SELECT MIN(year), MAX(year) FROM titles").fetchone()
+        return {"platforms": platforms, "genres": genres, "years": years}
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog()
+        return _catalog
+
+
+# --- Import & export ---
+def import_table(source, catalog=None, platform=DEFAULT_PLATFORM, batch_rows=HYDRATE_BATCH):
+    """
+    Load a scraper output sheet (any table format) into the catalog. Each row is stored as
+    JustWatch data if it has a Title, as posters if it has poster columns and as cast if it
+    has a Cast column. Returns the number of rows read.
+    """
+    from scrapers.table_io import iter_table_rows
+
+    catalog = catalog or get_catalog()
+    rows = (row for row in iter_table_rows(source) if _value(row.get("Source URL")))
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_rows))
+        if not batch:
+            return total
+        total += len(batch)
+        columns = set().union(*batch)
+        pairs = [(row["Source URL"], row) for row in batch]
+        if "Title" in columns:
+            catalog.upsert("justwatch", pairs, platform)
+        if columns & {"Season Posters", "Season Poster"}:
+            catalog.upsert("posters", pairs, platform)
+        if columns & {"Cast", "Caster"}:
+            catalog.upsert("cast", pairs, platform)
+
+def to_json(row):
+    """Catalog sheet row -> the converter's JSON record (`row_to_json`), with the stored platform."""
+    from scrapers.excel_to_json import row_to_json
+
+    record = row_to_json({k.lower(): ("" if v is None else v) for k, v in row.items()})
+    record["platform"] = row.get("Platform") or record["platform"]
+    return record
+
+def iter_json_chunks(rows, chunk_rows=HYDRATE_BATCH):
+    """Lists of JSON records for `write_json`, converted `chunk_rows` at a time."""
+    rows = iter(rows)
+    while True:
+        chunk = [to_json(row) for row in islice(rows, chunk_rows)]
+        if not chunk:
+            return
+        yield chunk
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local title catalog: import scraper sheets, export titles.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="load scraper output sheets")
+    imp.add_argument("files", nargs="+")
+    imp.add_argument("--platform", default=DEFAULT_PLATFORM, help="platform for titles not yet in the catalog")
+    exp = sub.add_parser("export", help="write matching titles as .json/.jsonl (row_to_json) or a table")
+    exp.add_argument("output")
+    exp.add_argument("--title", help="title prefix")
+    exp.add_argument("--year-from", type=int)
+    exp.add_argument("--year-to", type=int)
+    exp.add_argument("--platform")
+    exp.add_argument("--genre")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        for path in args.files:
+            print(f"✅ {path}: {import_table(path, platform=args.platform)} rows")
+    else:
+        filters = {"title": args.title, "year_from": args.year_from, "year_to": args.year_to,
+                   "platform": args.platform, "genre": args.genre}
+        rows = get_catalog().iter_rows(**filters)
+        if args.output.endswith((".json", ".jsonl")):
+            from scrapers.excel_to_json import write_json
+
+            with open(args.output, "w", encoding="utf-8") as f:
+                write_json(iter_json_chunks(rows), f, ndjson=args.output.endswith(".jsonl"))
+        else:
+            from scrapers.table_io import write_table
+
+            write_table(rows, args.output, columns=SHEET_COLUMNS)
+        print(f"✅ Exported {get_catalog().count(**filters)} titles to {args.output}")
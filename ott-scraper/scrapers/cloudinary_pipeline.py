@@ -0,0 +1,157 @@
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import cloudinary
+import cloudinary.uploader
+from cloudinary.exceptions import GeneralError, RateLimited
+
+from scrapers.metrics import count, span
+from scrapers.rate_limit import throttle
+
+UPLOADS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".uploads", "uploads.sqlite3")
+DEFAULT_FOLDER = "jio_images/"
+API_HOST = "api.cloudinary.com"     # rate-limit key shared by every upload
+DEFAULT_CONCURRENCY = 8
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0      # seconds; doubled on every retry
+
+# 420/429 -> RateLimited, 5xx and network errors -> GeneralError
+RETRYABLE = (RateLimited, GeneralError, ConnectionError, TimeoutError)
+
+
+# --- Persistent source URL -> secure_url map ---
+class UploadMap:
+    """Remembers what has already been uploaded so re-runs skip it."""
+
+    def __init__(self, path=UPLOADS_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS uploads (
+                source_url TEXT NOT NULL,
+                folder TEXT NOT NULL,
+                secure_url TEXT NOT NULL,
+                uploaded_at REAL NOT NULL,
+                PRIMARY KEY (source_url, folder)
+            )"""
+        )
+        self._conn.commit()
+
+    def get_many(self, urls, folder):
+        found = {}
+        urls = list(urls)
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                found.update(self._conn.execute(
+                    f"SELECT source_url, secure_url FROM uploads WHERE folder = ? AND source_url IN ({marks})",
+                    [folder, *chunk],
+                ).fetchall())
+        return found
+
+    def put(self, source_url, folder, secure_url):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?)", (source_url, folder, secure_url, time.time())
+            )
+            self._conn.commit()
+
+
+_upload_map = None
+_upload_map_lock = threading.Lock()
+
+def get_upload_map():
+    global _upload_map
+    with _upload_map_lock:
+        if _upload_map is None:
+            _upload_map = UploadMap()
+        return _upload_map
+
+
+# --- Upload helpers ---
+def configure_from_env():
+    """Configure the Cloudinary client from .env / environment variables; returns whether credentials were found."""
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:     # python-dotenv is optional; plain environment variables work too
+        pass
+    if os.getenv("CLOUDINARY_CLOUD_NAME"):
+        cloudinary.config(
+            cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+            api_key=os.getenv("CLOUDINARY_API_KEY"),
+            api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+        )
+        return True
+    return bool(os.getenv("CLOUDINARY_URL"))    # picked up by the client on its own
+
+def public_id_for(source_url):
+    """Deterministic public_id, so an image uploaded twice maps to the same asset."""
+    return hashlib.sha1(source_url.encode("utf-8")).hexdigest()[:24]
+
+def upload_with_retry(source_url, folder=DEFAULT_FOLDER, max_retries=MAX_RETRIES):
+    """
+    Upload one URL through the Cloudinary host limiter, retrying rate limits and
+    server/network errors with exponential backoff.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            with throttle(API_HOST) as slot, span("upload"):
+                try:
+                    res = cloudinary.uploader.upload(
+                        source_url,
+                        folder=folder,
+                        public_id=public_id_for(source_url),
+                        overwrite=False,
+                        unique_filename=False,
+                    )
+                except RateLimited:
+                    slot.record(429)    # pauses the host for every uploader thread
+                    raise
+            return res["secure_url"]
+        except RETRYABLE:
+            if attempt == max_retries:
+                raise
+            count("upload.retries")
+            time.sleep(BACKOFF_BASE * 2 ** attempt + random.uniform(0, BACKOFF_BASE))
+
+def upload_many(urls, folder=DEFAULT_FOLDER, concurrency=DEFAULT_CONCURRENCY, progress_callback=None,
+                on_error=None, upload_map=None):
+    """
+    Upload poster URLs to Cloudinary on a thread pool; returns {source_url: secure_url}.
+    Duplicates in `urls` are uploaded once and URLs already in the upload map are skipped.
+    A failed upload maps to its source URL and is reported via `on_error(url, exc)`.
+    Callbacks run in the calling thread.
+    """
+    upload_map = upload_map or get_upload_map()
+    unique = [u for u in dict.fromkeys(str(u).strip() for u in urls) if u]
+    result = upload_map.get_many(unique, folder)
+    todo = [u for u in unique if u not in result]
+    total = len(unique)
+    done = total - len(todo)
+    if progress_callback:
+        progress_callback(done, total)
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = {pool.submit(upload_with_retry, url, folder): url for url in todo}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                secure_url = future.result()
+                upload_map.put(url, folder, secure_url)
+                result[url] = secure_url
+            except Exception as e:
+                result[url] = url
+                if on_error:
+                    on_error(url, e)
+            done += 1
+            if progress_callback:
+                progress_callback(done, total)
+    return result
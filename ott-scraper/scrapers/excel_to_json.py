@@ -2,6 +2,20 @@ import pandas as pd
 import json
 import re
 
+from scrapers.table_io import iter_typed_chunks, read_table, table_format
+
+try:
+    import orjson
+except ImportError:     # orjson is optional; the stdlib encoder writes the same bytes, only slower
+    orjson = None
+
+SEASON_RE = re.compile(r"Season\s*(\d+)\s*:\s*(\d+)", re.IGNORECASE)
+NUMBER_RE = re.compile(r"(\d+)")
+CASTER_SPLIT_RE = re.compile(r"[|,]")
+CLOUDINARY_PREFIX = "https://res.cloudinary.com/"
+PLACEHOLDER_IMAGE = "data:image/gif;base64"
+DEFAULT_CHUNK_ROWS = 5_000      # rows converted and written at a time
+
 def safe_int(value, default=0):
     try:
         return int(float(value))
@@ -16,18 +30,18 @@ def parse_seasons(season_str, posters_str):
         item = item.strip()
         season_number, episodes_count = 0, 0
 
-        match = re.match(r"Season\s*(\d+)\s*:\s*(\d+)", item, re.IGNORECASE)
+        match = SEASON_RE.match(item)
         if match:
             season_number = safe_int(match.group(1))
             episodes_count = safe_int(match.group(2))
         else:
-            num_match = re.search(r"(\d+)", item)
+            num_match = NUMBER_RE.search(item)
             season_number = safe_int(num_match.group(1)) if num_match else 0
             episodes_count = 0
 
         poster_url = posters[idx] if idx < len(posters) else ""
-        if not poster_url or "https://res.cloudinary.com/" not in poster_url:
-            poster_url = "data:image/gif;base64"
+        if not poster_url or CLOUDINARY_PREFIX not in poster_url:
+            poster_url = PLACEHOLDER_IMAGE
 
         seasons.append({
             "season_number": season_number,
@@ -42,7 +56,7 @@ def parse_caster(caster_str):
         return []
 
     casters = []
-    for part in re.split(r"[|,]", caster_str):
+    for part in CASTER_SPLIT_RE.split(caster_str):
         part = part.strip()
         if not part:
             continue
@@ -60,12 +74,15 @@ def parse_caster(caster_str):
         casters.append({"actor": actor.strip(), "role": role.strip()})
     return casters
 
+def parse_imdb(value):
+    return float(value) if str(value).replace(".", "", 1).isdigit() else 0
+
 def row_to_json(row):
     title = row.get("title", "")
     original_title = row.get("original title", "") or title
     main_poster = row.get("main poster", "").strip()
-    if not main_poster or "https://res.cloudinary.com/" not in main_poster:
-        main_poster = "data:image/gif;base64"
+    if not main_poster or CLOUDINARY_PREFIX not in main_poster:
+        main_poster = PLACEHOLDER_IMAGE
 
     return {
         "title": title,
@@ -75,7 +92,7 @@ def row_to_json(row):
         "seasons_count": safe_int(row.get("seasons count", 0)),
         "season_details": parse_seasons(row.get("season details", ""), row.get("season poster", "")),
         "justwatch_rating": row.get("justwatch rating", ""),
-        "imdb_rating": float(row.get("imdb rating", 0)) if str(row.get("imdb rating", "")).replace(".", "", 1).isdigit() else 0,
+        "imdb_rating": parse_imdb(row.get("imdb rating", "")),
         "rotten_tomatoes": row.get("rotten tomatoes", ""),
         "genres": [g.strip() for g in str(row.get("genres", "")).split(",") if g.strip()],
         "runtime": row.get("runtime", ""),
@@ -86,12 +103,167 @@ def row_to_json(row):
         "platform": "hotstar"
     }
 
-def excel_to_json(input_file, output_file):
-    df = pd.read_excel(input_file)
+def _map_unique(values, fn):
+    """Apply `fn` once per distinct value (keyed by type too, so 1, 1.0 and True stay apart)."""
+    seen = {}
+    out = []
+    for v in values:
+        key = (type(v), v)
+        if key not in seen:
+            seen[key] = fn(v)
+        out.append(seen[key])
+    return out
+
+def _split_list(values):
+    """Comma-separated cells -> lists of stripped, non-empty items."""
+    parts = pd.Series(values, dtype=object).astype(str).str.split(",")
+    return [[p.strip() for p in items if p.strip()] for items in parts]
+
+def frame_to_json(df):
+    """
+    `row_to_json` for a whole frame (NaN filled with "", lower-cased headers),
+    column by column instead of one pandas Series per row. Same records, same order.
+    """
+    n = len(df)
+
+    def col(name, default=""):
+        return df[name].tolist() if name in df.columns else [default] * n
+
+    titles = col("title")
+    original_titles = [o or t for o, t in zip(col("original title"), titles)]
+    posters = pd.Series(col("main poster"), dtype=object).str.strip()
+    main_posters = posters.where(posters.str.contains(CLOUDINARY_PREFIX, regex=False, na=False), PLACEHOLDER_IMAGE)
+
+    columns = {
+        "title": titles,
+        "Year": _map_unique(col("year", 0), safe_int),
+        "original_title": original_titles,
+        "main_poster": main_posters.tolist(),
+        "seasons_count": _map_unique(col("seasons count", 0), safe_int),
+        "season_details": [parse_seasons(d, p) for d, p in zip(col("season details"), col("season poster"))],
+        "justwatch_rating": col("justwatch rating"),
+        "imdb_rating": _map_unique(col("imdb rating"), parse_imdb),
+        "rotten_tomatoes": col("rotten tomatoes"),
+        "genres": _split_list(col("genres")),
+        "runtime": col("runtime"),
+        "production_country": col("production country"),
+        "description": col("description"),
+        "youtube_links": _split_list(col("youtube links")),
+        "caster": [parse_caster(c) for c in col("caster")],
+        "platform": ["hotstar"] * n,
+    }
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+def _orjson_safe(records):
+    """
+    True when orjson renders every value exactly like `json.dumps`: plain strings,
+    ints within 64 bits and floats that Python doesn't print in exponent form.
+    Nested values come from the parsers above and are always strings and ints.
+    """
+    for record in records:
+        for v in record.values():
+            if isinstance(v, float):
+                if not (v == 0 or 1e-4 <= abs(v) < 1e16):
+                    return False
+            elif isinstance(v, int):
+                if not -2**63 <= v < 2**64:
+                    return False
+            elif v is not None and not isinstance(v, (str, list, dict)):
+                return False
+    return True
+
+def _reindent(text):
+    """
+    Turn 2-space indentation into 4-space. JSON strings never hold a raw newline,
+    so every "\\n" + spaces is indentation; deepest level first, each pass adds
+    two spaces to every line at that depth or deeper.
+    """
+    depth = 0
+    while "\n" + "  " * (depth + 1) in text:
+        depth += 1
+    for level in range(depth, 0, -1):
+        text = text.replace("\n" + "  " * level, "\n" + "  " * (level + 1))
+    return text
+
+def records_to_json(records, compact=False):
+    """
+    Serialize converted records. The default output is byte-identical to
+    `json.dump(records, ensure_ascii=False, indent=4)`; orjson renders it
+    (at indent 2, re-indented to 4) when installed and safe for the data.
+    """
+    if orjson is not None and _orjson_safe(records):
+        try:
+            if compact:
+                return orjson.dumps(records).decode("utf-8")
+            return _reindent(orjson.dumps(records, option=orjson.OPT_INDENT_2).decode("utf-8"))
+        except orjson.JSONEncodeError:  # e.g. lone surrogates; the stdlib encoder copes
+            pass
+    if compact:
+        return json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(records, ensure_ascii=False, indent=4)
+
+def records_to_ndjson(records):
+    """One compact JSON object per line (NDJSON), newline-terminated."""
+    if orjson is not None and _orjson_safe(records):
+        try:
+            return "".join(orjson.dumps(r).decode("utf-8") + "\n" for r in records)
+        except orjson.JSONEncodeError:
+            pass
+    return "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records)
+
+def prepare_frame(df):
+    """The converter's view of a sheet: NaN -> "", stripped lower-case headers."""
     df = df.fillna("")
-    df.columns = df.columns.str.strip().str.lower()
+    df.columns = df.columns.astype(str).str.strip().str.lower()
+    return df
+
+def iter_json_chunks(input_file, chunk_rows=DEFAULT_CHUNK_ROWS, stream=True):
+    """
+    Converted records, `chunk_rows` at a time. With `stream` the input is read
+    incrementally too (see `iter_typed_chunks`; columns are typed over the whole
+    table, so the records match the in-memory path); otherwise it's read in one
+    go and only conversion and output are chunked.
+    """
+    if stream:
+        for chunk in iter_typed_chunks(input_file, chunk_rows):
+            yield frame_to_json(prepare_frame(chunk))
+        return
+    df = prepare_frame(read_table(input_file))
+    for start in range(0, len(df), chunk_rows):
+        yield frame_to_json(df.iloc[start:start + chunk_rows])
 
-    data = [row_to_json(row) for _, row in df.iterrows()]
+def write_json(chunks, f, ndjson=False, compact=False):
+    """
+    Write chunks of records to a text file as they arrive, so only one chunk is
+    ever held in memory. The JSON array is byte-identical to `records_to_json`
+    over all records at once; NDJSON is always compact. Returns the record count.
+    """
+    count = 0
+    for records in chunks:
+        if not records:
+            continue
+        if ndjson:
+            f.write(records_to_ndjson(records))
+        else:
+            text = records_to_json(records, compact)
+            if compact:
+                f.write(("," if count else "[") + text[1:-1])
+            else:
+                f.write((",\n" if count else "[\n") + text[2:-2])
+        count += len(records)
+    if not ndjson:
+        f.write("[]" if not count else ("]" if compact else "\n]"))
+    return count
 
+def excel_to_json(input_file, output_file, ndjson=None, compact=False, stream=False, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Convert a title table (xlsx, Parquet, CSV or JSONL) to JSON, writing records as they are converted.
+    `ndjson` defaults to True for .jsonl/.ndjson output paths; `compact` drops the indentation;
+    `stream` also reads the input chunk by chunk, keeping peak memory bounded by `chunk_rows`.
+    Returns the number of records written.
+    """
+    if ndjson is None:
+        ndjson = table_format(output_file, default="json") == "jsonl"
     with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+        return write_json(iter_json_chunks(input_file, chunk_rows, stream), f, ndjson=ndjson, compact=compact)
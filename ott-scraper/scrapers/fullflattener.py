@@ -1,6 +1,7 @@
 import streamlit as st
-import pandas as pd
-import io
+
+from scrapers.poster_rows import group_posters
+from scrapers.table_io import TABLE_FORMATS, TABLE_TYPES, read_table, table_bytes
 
 # ---------------- STREAMLIT APP ---------------- #
 st.set_page_config(page_title="Poster Grouper", layout="wide")
@@ -8,38 +9,27 @@ st.set_page_config(page_title="Poster Grouper", layout="wide")
 st.title("🎯 Poster Grouper (Flattened → Grouped)")
 st.markdown("Upload a flattened Excel (Title + SeasonPoster rows) to group poster links back per Title.")
 
-uploaded_file = st.file_uploader("📂 Upload Flattened Excel", type=["xlsx"])
+uploaded_file = st.file_uploader("📂 Upload Flattened Excel", type=TABLE_TYPES)
+fmt = st.selectbox("💾 Output format", TABLE_TYPES)
 
 if uploaded_file and st.button("🚀 Group Posters"):
     try:
-        # Load Excel
-        df = pd.read_excel(uploaded_file)
-
-        # Ensure order is preserved
-        df['Title_order'] = df['Title'].factorize()[0]
-
-        # Group SeasonPoster links per Title without sorting
-        grouped_df = (
-            df.groupby(['Title', 'Title_order'], sort=False)['SeasonPoster']
-              .apply(lambda x: ",".join(x.astype(str)))
-              .reset_index()
-              .drop(columns=['Title_order'])
-        )
+        # Load input (xlsx, Parquet, CSV or JSONL)
+        df = read_table(uploaded_file)
+
+        # Group SeasonPoster links per Title, keeping first-appearance order
+        grouped_df = group_posters(df)
 
         # Show result preview
         st.success("✅ Grouping complete!")
         st.dataframe(grouped_df)
 
-        # Prepare Excel for download
-        buffer = io.BytesIO()
-        grouped_df.to_excel(buffer, index=False, engine="openpyxl")
-        buffer.seek(0)
-
+        # Prepare file for download
         st.download_button(
             "⬇ Download Grouped Excel",
-            buffer,
-            file_name="poster_grouped.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            table_bytes(grouped_df, fmt),
+            file_name=f"poster_grouped.{fmt}",
+            mime=TABLE_FORMATS[fmt],
         )
 
     except Exception as e:
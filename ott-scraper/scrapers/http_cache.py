@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+
+from scrapers.metrics import count
+from scrapers.rate_limit import limited_get
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache", "responses.sqlite3")
+DEFAULT_TTL = 24 * 3600                 # seconds before an entry must be revalidated
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024   # compressed bytes kept on disk
+
+
+# --- Helper functions ---
+def normalize_url(url):
+    """Cache key for a URL: lowercase scheme/host, sorted query, no fragment or trailing slash."""
+    parts = urlsplit(str(url).strip())
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+# --- Response cache ---
+class ResponseCache:
+    """
+    On-disk cache of page bodies keyed by normalized URL.
+    Bodies are zlib-compressed; fresh entries are served without a request,
+    stale ones are revalidated with ETag / Last-Modified, and the least
+    recently used entries are evicted once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        self._conn.commit()
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+        count(f"http.cache.{name}")
+
+    def get(self, url):
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        body, etag, last_modified, stored_at = row
+        return {
+            "body": zlib.decompress(body).decode("utf-8"),
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": stored_at,
+        }
+
+    def put(self, url, text, etag=None, last_modified=None):
+        body = zlib.compress(text.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), body, etag, last_modified, now, now, len(body)),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def validators(self, url):
+        """(ETag, Last-Modified) stored with a cached page, without loading its body."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM responses WHERE key = ?", (normalize_url(url),)
+            ).fetchone()
+        return tuple(row) if row else (None, None)
+
+    def touch(self, url):
+        """Mark an entry fresh again after a 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?",
+                (now, now, normalize_url(url)),
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.stats["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def fetch(self, url, session=None, timeout=15):
+        """
+        Read-through GET: returns the page text, or None if it can't be fetched.
+        A stale cached copy is still returned when the network request fails.
+        """
+        entry = self.get(url)
+        if entry and time.time() - entry["stored_at"] < self.ttl:
+            self._count("hits")
+            return entry["body"]
+
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            res = limited_get(session or requests, url, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            return entry["body"] if entry else None
+
+        if res.status_code == 304 and entry:
+            self._count("revalidated")
+            self.touch(url)
+            return entry["body"]
+        if res.status_code != 200:
+            return None
+
+        self._count("misses")
+        self.put(url, res.text, res.headers.get("ETag"), res.headers.get("Last-Modified"))
+        return res.text
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Process-wide response cache shared by all scrapers."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
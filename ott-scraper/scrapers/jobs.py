@@ -0,0 +1,309 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from functools import partial
+
+JOBS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".jobs", "jobs.sqlite3")
+DEFAULT_BATCH_SIZE = 200    # URLs held in memory at a time while a job runs
+
+JOB_SELECT = """SELECT j.job_id, j.kind, j.status, j.total, j.params, j.created_at, j.updated_at, j.error, j.stats,
+                       (SELECT COUNT(*) FROM job_results r WHERE r.job_id = j.job_id)
+                FROM jobs j"""
+
+
+# --- Job store ---
+class JobStore:
+    """
+    Append-only record of scrape jobs in SQLite.
+    Each input row is stored once when the job is created and each result is
+    written the moment its URL finishes, so an interrupted job can be resumed
+    by ID and only the URLs without a result are scraped again.
+    """
+
+    def __init__(self, path=JOBS_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                error TEXT,
+                stats TEXT
+            );
+            CREATE TABLE IF NOT EXISTS job_rows (
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                row TEXT NOT NULL,
+                PRIMARY KEY (job_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                finished_at REAL NOT NULL,
+                PRIMARY KEY (job_id, seq)
+            );
+            """
+        )
+        for column in ("error", "stats"):   # stores created before these columns existed
+            try:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+            except sqlite3.OperationalError:
+                pass
+        self._conn.commit()
+
+    def create_job(self, kind, items, params=None, status="queued"):
+        """
+        Register a job over `items`, an iterable of (url, input row dict) pairs;
+        the input row is merged into the result when the job is read back. Returns the job ID.
+        Queued jobs are picked up by the background worker (see scrapers/worker.py).
+        """
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._lock:
+            total = 0
+            for seq, (url, row) in enumerate(items):
+                self._conn.execute(
+                    "INSERT INTO job_rows VALUES (?, ?, ?, ?)",
+                    (job_id, seq, str(url), json.dumps(row, ensure_ascii=False, default=str)),
+                )
+                total += 1
+            self._conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, NULL, NULL)",
+                (job_id, kind, status, total, json.dumps(params or {}), now, now),
+            )
+            self._conn.commit()
+        return job_id
+
+    def get_job(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                JOB_SELECT + " WHERE j.job_id = ?",
+                (job_id,),
+            ).fetchone()
+        return self._job_dict(row) if row else None
+
+    def list_jobs(self, kind=None, limit=50):
+        query = JOB_SELECT
+        args = ()
+        if kind:
+            query += " WHERE j.kind = ?"
+            args = (kind,)
+        query += " ORDER BY j.created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, args + (limit,)).fetchall()
+        return [self._job_dict(r) for r in rows]
+
+    @staticmethod
+    def _job_dict(row):
+        job_id, kind, status, total, params, created_at, updated_at, error, stats, done = row
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "status": status,
+            "total": total,
+            "done": done,
+            "params": json.loads(params),
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "error": error,
+            "stats": json.loads(stats) if stats else {},
+        }
+
+    def set_status(self, job_id, status, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status, error, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def set_stats(self, job_id, stats):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET stats = ? WHERE job_id = ?", (json.dumps(stats, default=str), job_id)
+            )
+            self._conn.commit()
+
+    def claim_next(self):
+        """Atomically move the oldest queued job to 'running'; returns its ID or None."""
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                cur = self._conn.execute(
+                    "UPDATE jobs SET status = 'running', updated_at = ? WHERE job_id = ? AND status = 'queued'",
+                    (time.time(), row[0]),
+                )
+                self._conn.commit()
+                if cur.rowcount == 1:   # another worker may have claimed it first
+                    return row[0]
+
+    def requeue(self, job_id=None, status="running"):
+        """Queue a job again (resume), or with no ID every job left in `status` by a dead worker."""
+        with self._lock:
+            if job_id:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = NULL, updated_at = ? WHERE job_id = ?",
+                    (time.time(), job_id),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', updated_at = ? WHERE status = ?", (time.time(), status)
+                )
+            self._conn.commit()
+
+    def pending(self, job_id, limit=DEFAULT_BATCH_SIZE):
+        """Next (seq, url) pairs without a result, in input order."""
+        with self._lock:
+            return self._conn.execute(
+                """SELECT seq, url FROM job_rows r
+                   WHERE r.job_id = ? AND NOT EXISTS (
+                       SELECT 1 FROM job_results x WHERE x.job_id = r.job_id AND x.seq = r.seq)
+                   ORDER BY seq LIMIT ?""",
+                (job_id, limit),
+            ).fetchall()
+
+    def record(self, job_id, seq, result):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO job_results VALUES (?, ?, ?, ?)",
+                (job_id, seq, json.dumps(result, ensure_ascii=False, default=str), time.time()),
+            )
+            self._conn.commit()
+
+    def iter_results(self, job_id):
+        """Yield input row merged with its result, in input order, without loading the whole job."""
+        last_seq = -1
+        while True:
+            with self._lock:
+                batch = self._conn.execute(
+                    """SELECT r.seq, r.row, x.result FROM job_rows r
+                       JOIN job_results x ON x.job_id = r.job_id AND x.seq = r.seq
+                       WHERE r.job_id = ? AND r.seq > ? ORDER BY r.seq LIMIT ?""",
+                    (job_id, last_seq, DEFAULT_BATCH_SIZE),
+                ).fetchall()
+            if not batch:
+                return
+            for seq, row, result in batch:
+                yield {**json.loads(row), **json.loads(result)}
+            last_seq = batch[-1][0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_job_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore()
+        return _store
+
+
+# --- Runners ---
+def _scrape_justwatch(urls, on_result, **params):
+    from scrapers.justwatch import scrape_justwatch_many
+    scrape_justwatch_many(urls, on_result=on_result, **params)
+
+def _scrape_posters(urls, on_result, **params):
+    from scrapers.poster_selenium import scrape_posters_many
+    scrape_posters_many(urls, on_result=on_result, **params)
+
+def _scrape_cast(urls, on_result, **params):
+    from scrapers.cast_scraper import scrape_cast_many
+    scrape_cast_many(urls, on_result=on_result, **params)
+
+RUNNERS = {
+    "justwatch": _scrape_justwatch,
+    "posters": _scrape_posters,
+    "cast": _scrape_cast,
+}
+
+def run_job(job_id, store=None, batch_size=DEFAULT_BATCH_SIZE, progress_callback=None, **runtime_params):
+    """
+    Run (or resume) a job: pending URLs are scraped `batch_size` at a time and
+    every result is checkpointed as soon as it arrives.
+    `progress_callback(done, total)` covers the whole job, including earlier runs;
+    `runtime_params` (e.g. a `timings` list) are passed to the scraper but not stored.
+    Jobs created with `incremental: True` go through `scrape_incremental` (see scrapers/title_store.py).
+    Each batch's results are also upserted into the title catalog (see scrapers/catalog.py).
+    """
+    from scrapers.catalog import get_catalog
+
+    store = store or get_job_store()
+    job = store.get_job(job_id)
+    if job is None:
+        raise ValueError(f"❌ Unknown job ID: {job_id}")
+
+    runner = RUNNERS[job["kind"]]
+    params = dict(job["params"])
+    if params.pop("incremental", False):
+        from scrapers.title_store import scrape_incremental
+        runner = partial(scrape_incremental, job["kind"])
+    done = job["done"]
+    store.set_status(job_id, "running")
+    try:
+        while True:
+            batch = store.pending(job_id, batch_size)
+            if not batch:
+                break
+            seqs = [seq for seq, _ in batch]
+            finished = []
+
+            def on_result(i, result):
+                nonlocal done
+                store.record(job_id, seqs[i], result)
+                finished.append((batch[i][1], result))
+                done += 1
+                if progress_callback:
+                    progress_callback(done, job["total"])
+
+            try:
+                runner([url for _, url in batch], on_result, **params, **runtime_params)
+            finally:
+                get_catalog().upsert(job["kind"], finished)     # one transaction per batch
+    except BaseException:
+        store.set_status(job_id, "interrupted")
+        raise
+    store.set_status(job_id, "done")
+    return job_id
+
+
+def execute_job(job_id):
+    """
+    Worker-process entry point: run a claimed job and record its outcome,
+    cache counters and per-URL browser timings on the job.
+    """
+    from scrapers.http_cache import get_cache
+    from scrapers.metrics import flush as flush_metrics
+
+    store = get_job_store()
+    job = store.get_job(job_id)
+    timings = []
+    runtime = {"timings": timings} if job["kind"] in ("posters", "cast") else {}
+    cache_before = dict(get_cache().stats)
+    try:
+        run_job(job_id, store=store, **runtime)
+    except Exception as e:
+        store.set_status(job_id, "failed", error=str(e))
+    finally:
+        cache = {k: v - cache_before.get(k, 0) for k, v in get_cache().stats.items()}
+        store.set_stats(job_id, {"cache": cache, "timings": timings})
+        flush_metrics()
+    return job_id
@@ -1,6 +1,67 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import os
+import queue
 import re
+import threading
+
+from scrapers.http_cache import get_cache
+from scrapers.metrics import span
+from scrapers.parse_pool import MIN_POOL_PAGES, PARSE_WORKERS, get_parse_pool, parse_chunk
+from scrapers.rate_limit import limited_get
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/115.0 Safari/537.36"
+    )
+}
+DEFAULT_TIMEOUT = 15        # seconds, per request (connect + read)
+DEFAULT_CONCURRENCY = 8
+PARSER_BACKEND = os.getenv("JW_PARSER", "auto")    # "auto", "lxml" or "bs4"
+
+# --- Precompiled patterns ---
+TITLE_YEAR_RE = re.compile(r"(.*?)\s+\((\d{4})\)")
+IMAGE_SIZE_RE = re.compile(r"/s\d+/")
+RATING_NUMBER_RE = re.compile(r"[\d.]+")
+RATING_PERCENT_RE = re.compile(r"\d+%")
+GENRE_NOISE_RE = re.compile(r"^\(?\d+[kK%]?\)?$")   # matches (1k), 94, 94%
+YOUTUBE_THUMB_RE = re.compile(r"vi/([^/]+)/")
+
+_session = None
+_session_lock = threading.Lock()
+
+
+# --- HTTP session ---
+def get_session(pool_size=DEFAULT_CONCURRENCY):
+    """Shared keep-alive session, created once and reused by every fetch."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(pool_size, 1))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def fetch_html(url, timeout=DEFAULT_TIMEOUT, session=None, use_cache=True):
+    """Fetch a page (through the response cache by default); returns the HTML text or None on any failure."""
+    session = session or get_session()
+    if use_cache:
+        return get_cache().fetch(url, session=session, timeout=timeout)
+    try:
+        res = limited_get(session, url, timeout=timeout)
+    except requests.RequestException:
+        return None
+    if res.status_code != 200:
+        return None
+    return res.text
 
 # --- Helper functions ---
 def get_text(soup, selector):
@@ -13,44 +74,247 @@ def upgrade_image_url(url, size="s592", ext=".jpg"):
     if not url:
         return None
     base_url = url.split("?")[0]
-    upgraded_url = re.sub(r"/s\d+/", f"/{size}/", base_url)
+    upgraded_url = IMAGE_SIZE_RE.sub(f"/{size}/", base_url)
     if not upgraded_url.endswith(ext):
         upgraded_url = upgraded_url + ext
     return upgraded_url
 
-# --- Main scraping function ---
-def scrape_justwatch(url: str) -> dict:
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/115.0 Safari/537.36"
-        )
+def split_title_year(title_text):
+    """'Title (2020)' -> ('Title', '2020')."""
+    match = TITLE_YEAR_RE.match(title_text)
+    return (match.group(1), match.group(2)) if match else (title_text, None)
+
+def classify_ratings(ratings):
+    """Map (text, img alt) pairs from the scoring block to JustWatch / IMDb / RT ratings."""
+    jw_rating, imdb_rating, rt_rating = None, None, None
+    for text, alt in ratings:
+        alt = alt.lower()
+        lower = text.lower()
+
+        # JustWatch rating
+        if "justwatch" in alt or "jw" in lower:
+            match = RATING_NUMBER_RE.search(text)
+            jw_rating = match.group(0) if match else text
+
+        # IMDb rating
+        elif "imdb" in alt or "imdb" in lower:
+            match = RATING_NUMBER_RE.search(text)
+            imdb_rating = match.group(0) if match else text
+
+        # Rotten Tomatoes
+        elif (
+            "rotten" in alt
+            or "tomato" in alt
+            or "rotten" in lower
+            or "tomato" in lower
+            or "tomatometer" in lower
+            or "🍅" in text
+        ):
+            match = RATING_PERCENT_RE.search(text)
+            rt_rating = match.group(0) if match else text
+    return jw_rating, imdb_rating, rt_rating
+
+def join_genres(raw_genres):
+    # filter out counts, percentages, numeric stuff like (1k), 94%
+    return ",".join(g for g in raw_genres if not GENRE_NOISE_RE.match(g))
+
+def youtube_links_from_thumbs(srcs):
+    links = []
+    for src in srcs:
+        match = YOUTUBE_THUMB_RE.search(src)
+        if match:
+            links.append(f"https://www.youtube.com/watch?v={match.group(1)}")
+    return links
+
+def build_result(url, title=None, year=None, original_title=None, main_poster_src=None, seasons_data=(),
+                 ratings=(), raw_genres=(), runtime=None, age_rating=None, prod_country=None, synopsis=None,
+                 trailer_srcs=()):
+    """Assemble the output row shared by every parser backend."""
+    jw_rating, imdb_rating, rt_rating = classify_ratings(ratings)
+    return {
+        "Title": title,
+        "Year": year,
+        "Original Title": original_title,
+        "Main Poster": upgrade_image_url(main_poster_src),
+        "Seasons Count": len(seasons_data),
+        "Season Details": ", ".join(seasons_data) if seasons_data else None,
+        "JustWatch Rating": jw_rating,
+        "IMDB Rating": imdb_rating,
+        "Rotten Tomatoes": rt_rating,
+        "Genres": join_genres(raw_genres),
+        "Runtime": runtime,
+        "Age Rating": age_rating,
+        "Production Country": prod_country,
+        "Synopsis": synopsis,
+        "YouTube Links": ", ".join(youtube_links_from_thumbs(trailer_srcs)),
+        "Source URL": url,
     }
-    res = requests.get(url, headers=headers)
-    if res.status_code != 200:
+
+# --- Main scraping functions ---
+def scrape_justwatch(url: str, timeout=DEFAULT_TIMEOUT, use_cache=True) -> dict:
+    with span("fetch"):
+        html = fetch_html(url, timeout=timeout, use_cache=use_cache)
+    if html is None:
         return {"Error": f"Failed to fetch {url}"}
+    with span("parse"):
+        return parse_justwatch(html, url)
+
+def scrape_justwatch_many(urls, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, progress_callback=None,
+                          use_cache=True, on_result=None, parse_workers=PARSE_WORKERS):
+    """
+    Scrape many JustWatch URLs concurrently over one pooled session.
+    Results come back in the same order as `urls`; `on_result(index, row)` and
+    `progress_callback(done, total)` are called from the calling thread as each
+    page finishes, so it is safe to update Streamlit widgets or write checkpoints.
+    Pages are parsed in `parse_workers` processes (see scrapers/parse_pool.py);
+    0, or a batch too small to be worth it, parses on the fetch threads.
+    """
+    urls = list(urls)
+    total = len(urls)
+    results = [None] * total
+    if not total:
+        return results
+
+    get_session(pool_size=concurrency)
+    if parse_workers > 0 and total >= MIN_POOL_PAGES:
+        return _scrape_many_pooled(urls, results, concurrency, timeout, use_cache, progress_callback, on_result,
+                                   get_parse_pool(parse_workers))
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = {pool.submit(scrape_justwatch, url, timeout, use_cache): i for i, url in enumerate(urls)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                results[i] = {"Error": f"Failed to scrape {urls[i]}: {e}"}
+            if on_result:
+                on_result(i, results[i])
+            if progress_callback:
+                progress_callback(done, total)
+    return results
 
-    soup = BeautifulSoup(res.text, "html.parser")
+def _scrape_many_pooled(urls, results, concurrency, timeout, use_cache, progress_callback, on_result, parse_pool):
+    """
+    Fetch on threads, parse in `parse_pool`. Fetched pages are batched while every
+    parser is busy (up to the pool's chunk size) and sent straight away when one is idle.
+    """
+    total = len(urls)
+    events = queue.Queue()      # ("page", i, body) / ("row", i, row) / ("parsed", (indexes, pages), future)
+
+    def fetch(i):
+        try:
+            with span("fetch"):
+                html = fetch_html(urls[i], timeout=timeout, use_cache=use_cache)
+        except Exception as e:
+            events.put(("row", i, {"Error": f"Failed to scrape {urls[i]}: {e}"}))
+            return
+        if html is None:
+            events.put(("row", i, {"Error": f"Failed to fetch {urls[i]}"}))
+        else:
+            events.put(("page", i, html.encode("utf-8")))
+
+    done = in_flight = 0
+    fetching = total
+    batch = []
+
+    def finish(i, row):
+        nonlocal done
+        results[i] = row
+        done += 1
+        if on_result:
+            on_result(i, row)
+        if progress_callback:
+            progress_callback(done, total)
+
+    def parse_here(indexes, pages):
+        # A parser process died: finish the batch on this thread instead of failing it
+        parse_pool.broken = True    # get_parse_pool() starts a fresh pool next time
+        for i, row in zip(indexes, parse_chunk(pages)):
+            finish(i, row)
+
+    def dispatch():
+        nonlocal in_flight
+        indexes = [i for i, _ in batch]
+        pages = [(urls[i], body) for i, body in batch]
+        batch.clear()
+        if parse_pool.broken:
+            return parse_here(indexes, pages)
+        try:
+            future = parse_pool.submit(parse_chunk, pages)
+        except RuntimeError:    # BrokenProcessPool, or the pool was shut down
+            return parse_here(indexes, pages)
+        future.add_done_callback(lambda f: events.put(("parsed", (indexes, pages), f)))
+        in_flight += 1
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as fetchers:
+        for i in range(total):
+            fetchers.submit(fetch, i)
+        while done < total:
+            kind, key, payload = events.get()
+            if kind == "page":
+                fetching -= 1
+                batch.append((key, payload))
+            elif kind == "row":
+                fetching -= 1
+                finish(key, payload)
+            else:
+                in_flight -= 1
+                indexes, pages = key
+                try:
+                    rows = payload.result()
+                except BrokenProcessPool:
+                    parse_here(indexes, pages)
+                except Exception as e:
+                    for i in indexes:
+                        finish(i, {"Error": f"Failed to scrape {urls[i]}: {e}"})
+                else:
+                    for i, row in zip(indexes, rows):
+                        finish(i, row)
+            if batch and (len(batch) >= parse_pool.chunk_size or in_flight < parse_pool.workers or not fetching):
+                dispatch()
+    return results
+
+def parse_justwatch(html: str, url: str, backend=None) -> dict:
+    """
+    Extract all title fields from a JustWatch title page.
+    The embedded JSON state is used when present; otherwise the DOM is
+    parsed with the configured parser backend.
+    """
+    from scrapers.justwatch_state import parse_title_state
+    state = parse_title_state(html, url)
+    if state:
+        return state["fields"]
+    return parse_justwatch_dom(html, url, backend)
+
+def parse_justwatch_dom(html: str, url: str, backend=None) -> dict:
+    """Title fields from the page markup alone, with the configured parser backend."""
+    backend = backend or PARSER_BACKEND
+    if backend in ("auto", "lxml"):
+        try:
+            from scrapers.justwatch_lxml import parse_justwatch_lxml
+        except ImportError:
+            if backend == "lxml":
+                raise
+        else:
+            return parse_justwatch_lxml(html, url)
+    return parse_justwatch_bs4(html, url)
+
+def parse_justwatch_bs4(html: str, url: str) -> dict:
+    """BeautifulSoup + html.parser backend (reference implementation)."""
+    soup = BeautifulSoup(html, "html.parser")
 
     # --- Title & Year ---
     title, year = None, None
     title_year = soup.select_one("h1.title-detail-hero__details__title")
     if title_year:
-        title_text = title_year.get_text(" ", strip=True)
-        match = re.match(r"(.*?)\s+\((\d{4})\)", title_text)
-        title = match.group(1) if match else title_text
-        year = match.group(2) if match else None
-
-    # --- Original title ---
-    original_title = get_text(soup, "h3.original-title")
+        title, year = split_title_year(title_year.get_text(" ", strip=True))
 
     # --- Main Poster ---
-    main_poster_url = None
+    main_poster_src = None
     main_poster_tag = soup.select_one(".title-poster__image img")
     if main_poster_tag:
-        src = main_poster_tag.get("src") or main_poster_tag.get("data-src")
-        main_poster_url = upgrade_image_url(src)
+        main_poster_src = main_poster_tag.get("src") or main_poster_tag.get("data-src")
 
     # --- Seasons ---
     seasons_data = []
@@ -59,39 +323,12 @@ def scrape_justwatch(url: str) -> dict:
         episodes = get_text(season, ".episodes-number")
         if season_name and episodes:
             seasons_data.append(f"{season_name} : {episodes}")
-    season_details_str = ", ".join(seasons_data) if seasons_data else None
 
     # --- Ratings ---
-    jw_rating, imdb_rating, rt_rating = None, None, None
+    ratings = []
     for rating in soup.select(".jw-scoring-listing__rating"):
-        text = rating.get_text(strip=True)
         img = rating.select_one("img")
-        alt = img.get("alt", "").lower() if img else ""
-
-        # JustWatch rating
-        if "justwatch" in alt or "jw" in text.lower():
-            jw_rating = re.search(r"[\d.]+", text)
-            jw_rating = jw_rating.group(0) if jw_rating else text
-
-        # IMDb rating
-        elif "imdb" in alt or "imdb" in text.lower():
-            imdb_rating = re.search(r"[\d.]+", text)
-            imdb_rating = imdb_rating.group(0) if imdb_rating else text
-
-        # Rotten Tomatoes
-        elif (
-            "rotten" in alt
-            or "tomato" in alt
-            or "rotten" in text.lower()
-            or "tomato" in text.lower()
-            or "tomatometer" in text.lower()
-            or "🍅" in text
-        ):
-            rt_rating_match = re.search(r"\d+%", text)
-            if rt_rating_match:
-                rt_rating = rt_rating_match.group(0)
-            else:
-                rt_rating = text
+        ratings.append((rating.get_text(strip=True), img.get("alt", "") if img else ""))
 
     # --- Genres ---
     raw_genres = [
@@ -101,48 +338,19 @@ def scrape_justwatch(url: str) -> dict:
             ".poster-detail-infos__value a"
         )
     ]
-    # filter out counts, percentages, numeric stuff like (1k), 94%
-    genres = ",".join(
-        g for g in raw_genres
-        if not re.match(r"^\(?\d+[kK%]?\)?$", g)  # matches (1k), 94, 94%
-    )
-
-    # --- Runtime ---
-    runtime = get_text(soup, "h3:-soup-contains('Runtime') + .poster-detail-infos__value")
-
-    # --- Age rating ---
-    age_rating = get_text(soup, "h3:-soup-contains('Age rating') + .poster-detail-infos__value")
-
-    # --- Production country ---
-    prod_country = get_text(soup, "h3:-soup-contains('Production country') + .poster-detail-infos__value")
-
-    # --- Synopsis ---
-    synopsis = get_text(soup, "#synopsis p")
 
-    # --- YouTube trailer links ---
-    youtube_links = []
-    for img in soup.select("#clips_trailers img"):
-        src = img.get("src", "")
-        match = re.search(r"vi/([^/]+)/", src)
-        if match:
-            youtube_links.append(f"https://www.youtube.com/watch?v={match.group(1)}")
-
-    # --- Final dictionary ---
-    return {
-        "Title": title,
-        "Year": year,
-        "Original Title": original_title,
-        "Main Poster": main_poster_url,
-        "Seasons Count": len(seasons_data),
-        "Season Details": season_details_str,
-        "JustWatch Rating": jw_rating,
-        "IMDB Rating": imdb_rating,
-        "Rotten Tomatoes": rt_rating,
-        "Genres": genres,
-        "Runtime": runtime,
-        "Age Rating": age_rating,
-        "Production Country": prod_country,
-        "Synopsis": synopsis,
-        "YouTube Links": ", ".join(youtube_links),
-        "Source URL": url,
-    }
+    return build_result(
+        url,
+        title=title,
+        year=year,
+        original_title=get_text(soup, "h3.original-title"),
+        main_poster_src=main_poster_src,
+        seasons_data=seasons_data,
+        ratings=ratings,
+        raw_genres=raw_genres,
+        runtime=get_text(soup, "h3:-soup-contains('Runtime') + .poster-detail-infos__value"),
+        age_rating=get_text(soup, "h3:-soup-contains('Age rating') + .poster-detail-infos__value"),
+        prod_country=get_text(soup, "h3:-soup-contains('Production country') + .poster-detail-infos__value"),
+        synopsis=get_text(soup, "#synopsis p"),
+        trailer_srcs=[img.get("src", "") for img in soup.select("#clips_trailers img")],
+    )
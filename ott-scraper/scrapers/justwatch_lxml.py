@@ -0,0 +1,93 @@
+import lxml.html
+from lxml import etree
+
+from scrapers.justwatch import build_result, split_title_year
+
+
+# --- Precompiled selectors ---
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def _info_value(label):
+    """XPath for `h3:-soup-contains(label) + .poster-detail-infos__value`."""
+    return etree.XPath(
+        f"//h3[contains(., '{label}')]"
+        f"/following-sibling::*[1][{_has_class('poster-detail-infos__value')}]"
+    )
+
+TITLE = etree.XPath(f"//h1[{_has_class('title-detail-hero__details__title')}]")
+ORIGINAL_TITLE = etree.XPath(f"//h3[{_has_class('original-title')}]")
+MAIN_POSTER = etree.XPath(f"//*[{_has_class('title-poster__image')}]//img")
+SEASON_CARDS = etree.XPath(f"//*[@id='season-list']//*[{_has_class('season-card')}]")
+SEASON_NUMBER = etree.XPath(f".//*[{_has_class('season-number')}]")
+EPISODES_NUMBER = etree.XPath(f".//*[{_has_class('episodes-number')}]")
+RATINGS = etree.XPath(f"//*[{_has_class('jw-scoring-listing__rating')}]")
+IMG = etree.XPath(".//img")
+GENRES = etree.XPath(f"//*[{_has_class('poster-detail-infos__value')}]//*[self::span or self::a]")
+RUNTIME = _info_value("Runtime")
+AGE_RATING = _info_value("Age rating")
+PROD_COUNTRY = _info_value("Production country")
+SYNOPSIS = etree.XPath("//*[@id='synopsis']//p")
+TRAILER_IMGS = etree.XPath("//*[@id='clips_trailers']//img")
+# bs4 leaves out script, style and template text
+TEXT_NODES = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+
+# --- Helper functions ---
+def _text(el, sep=""):
+    """Same result as BeautifulSoup's `get_text(sep, strip=True)`."""
+    return sep.join(s.strip() for s in TEXT_NODES(el) if s.strip())
+
+def _first_text(xpath, node):
+    found = xpath(node)
+    return _text(found[0]) if found else None
+
+
+# --- Main parsing function ---
+def parse_justwatch_lxml(html: str, url: str) -> dict:
+    """lxml + precompiled XPath backend; output matches `parse_justwatch_bs4`."""
+    try:
+        try:
+            doc = lxml.html.fromstring(html)
+        except ValueError:      # str starting with an XML encoding declaration: parse the UTF-8 bytes
+            doc = lxml.html.fromstring(html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+    except etree.ParserError:   # empty document
+        return build_result(url)
+
+    title, year = None, None
+    found = TITLE(doc)
+    if found:
+        title, year = split_title_year(_text(found[0], " "))
+
+    main_poster_src = None
+    found = MAIN_POSTER(doc)
+    if found:
+        main_poster_src = found[0].get("src") or found[0].get("data-src")
+
+    seasons_data = []
+    for season in SEASON_CARDS(doc):
+        season_name = _first_text(SEASON_NUMBER, season)
+        episodes = _first_text(EPISODES_NUMBER, season)
+        if season_name and episodes:
+            seasons_data.append(f"{season_name} : {episodes}")
+
+    ratings = []
+    for rating in RATINGS(doc):
+        img = IMG(rating)
+        ratings.append((_text(rating), img[0].get("alt", "") if img else ""))
+
+    return build_result(
+        url,
+        title=title,
+        year=year,
+        original_title=_first_text(ORIGINAL_TITLE, doc),
+        main_poster_src=main_poster_src,
+        seasons_data=seasons_data,
+        ratings=ratings,
+        raw_genres=[_text(g) for g in GENRES(doc)],
+        runtime=_first_text(RUNTIME, doc),
+        age_rating=_first_text(AGE_RATING, doc),
+        prod_country=_first_text(PROD_COUNTRY, doc),
+        synopsis=_first_text(SYNOPSIS, doc),
+        trailer_srcs=[img.get("src", "") for img in TRAILER_IMGS(doc)],
+    )
@@ -0,0 +1,168 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+try:
+    import orjson as _json
+except ImportError:     # orjson is optional; stdlib json has the same loads()
+    import json as _json
+
+from scrapers.justwatch import fetch_html, upgrade_image_url, DEFAULT_CONCURRENCY
+
+IMAGE_HOST = "https://images.justwatch.com"
+STATE_SCRIPT_RE = re.compile(
+    r"window\.__(?:APOLLO_STATE|DATA)__\s*=\s*(.*?);?\s*</script>",
+    re.DOTALL,
+)
+TITLE_KEY_RE = re.compile(r"^(?:Movie|Show):")
+
+
+# --- Helper functions ---
+def load_state(html):
+    """Decode the embedded JSON state blob of a page, or None if there is none."""
+    match = STATE_SCRIPT_RE.search(html or "")
+    if not match:
+        return None
+    try:
+        return _json.loads(match.group(1))
+    except ValueError:
+        return None
+
+def _find_cache(obj, depth=0):
+    """Locate the normalized Apollo cache ({"Show:ts1": {...}, ...}) inside the state blob."""
+    if not isinstance(obj, dict) or depth > 4:
+        return None
+    if any(TITLE_KEY_RE.match(k) for k in obj):
+        return obj
+    for value in obj.values():
+        found = _find_cache(value, depth + 1)
+        if found is not None:
+            return found
+    return None
+
+def _field(obj, name):
+    """Read `name` or its parameterized form, e.g. `content({"country":"IN"})`."""
+    if not isinstance(obj, dict):
+        return None
+    if name in obj:
+        return obj[name]
+    prefix = name + "("
+    for key, value in obj.items():
+        if key.startswith(prefix):
+            return value
+    return None
+
+def _image_url(path, profile="s592", fmt="jpg"):
+    if not path:
+        return None
+    path = path.replace("{profile}", profile).replace("{format}", fmt)
+    return path if path.startswith("http") else IMAGE_HOST + path
+
+def _format_runtime(minutes):
+    if not minutes:
+        return None
+    hours, mins = divmod(int(minutes), 60)
+    return f"{hours}h {mins}min" if hours else f"{mins}min"
+
+
+# --- Main extraction ---
+def parse_title_state(html, url):
+    """
+    Parse the embedded state of a JustWatch title page once and return
+    {"fields": <scrape_justwatch row>, "season_posters": [...], "cast": [(actor, role), ...]},
+    or None when the page has no usable state (callers fall back to the DOM).
+    """
+    cache = _find_cache(load_state(html))
+    if not cache:
+        return None
+
+    def resolve(value):
+        if isinstance(value, dict) and "__ref" in value:
+            return cache.get(value["__ref"], {})
+        return value
+
+    path = urlsplit(url).path.rstrip("/")
+    candidates = []
+    for key, node in cache.items():
+        content = _field(node, "content") if TITLE_KEY_RE.match(key) else None
+        if isinstance(content, dict) and content.get("title"):
+            candidates.append((node, content))
+    matches = [c for c in candidates if (c[1].get("fullPath") or "").rstrip("/") == path]
+    if matches:
+        node, content = matches[0]
+    elif len(candidates) == 1:
+        node, content = candidates[0]
+    else:
+        return None
+
+    # --- Seasons ---
+    seasons_data, season_posters = [], []
+    for season in (resolve(s) for s in node.get("seasons") or []):
+        season_content = _field(season, "content") or {}
+        number = season_content.get("seasonNumber")
+        episodes = season.get("totalEpisodeCount")
+        if number is not None and episodes is not None:
+            seasons_data.append(f"Season {number} : {episodes} Episodes")
+        poster = _image_url(season_content.get("posterUrl"))
+        if poster:
+            season_posters.append(poster)
+
+    # --- Ratings ---
+    scoring = resolve(content.get("scoring")) or {}
+    jw_score = scoring.get("jwRating")
+    imdb_score = scoring.get("imdbScore")
+    tomato = scoring.get("tomatoMeter")
+
+    # --- Genres, clips, credits ---
+    genres = []
+    for genre in (resolve(g) for g in content.get("genres") or []):
+        name = _field(genre, "translation") or genre.get("shortName")
+        if name:
+            genres.append(name)
+
+    youtube_links = [
+        f"https://www.youtube.com/watch?v={clip['externalId']}"
+        for clip in (resolve(c) for c in content.get("clips") or [])
+        if clip.get("externalId") and str(clip.get("provider", "YOUTUBE")).upper() == "YOUTUBE"
+    ]
+
+    cast = []
+    for credit in (resolve(c) for c in content.get("credits") or []):
+        if credit.get("role", "ACTOR") == "ACTOR" and credit.get("name"):
+            cast.append((credit["name"].strip(), (credit.get("characterName") or "").strip() or "Unknown Role"))
+
+    countries = content.get("productionCountries") or []
+    fields = {
+        "Title": content.get("title"),
+        "Year": str(content["originalReleaseYear"]) if content.get("originalReleaseYear") else None,
+        "Original Title": content.get("originalTitle"),
+        "Main Poster": upgrade_image_url(_image_url(content.get("posterUrl"))),
+        "Seasons Count": len(seasons_data),
+        "Season Details": ", ".join(seasons_data) if seasons_data else None,
+        "JustWatch Rating": str(round(jw_score * 100)) if jw_score is not None else None,
+        "IMDB Rating": str(imdb_score) if imdb_score is not None else None,
+        "Rotten Tomatoes": f"{tomato}%" if tomato is not None else None,
+        "Genres": ",".join(genres),
+        "Runtime": _format_runtime(content.get("runtime")),
+        "Age Rating": content.get("ageCertification"),
+        "Production Country": ", ".join(countries) if countries else None,
+        "Synopsis": content.get("shortDescription"),
+        "YouTube Links": ", ".join(youtube_links),
+        "Source URL": url,
+    }
+    return {"fields": fields, "season_posters": season_posters, "cast": cast}
+
+def format_cast(cast):
+    """[(actor, role), ...] -> 'Actor - Role | ...' as written by the cast scraper."""
+    return " | ".join(f"{actor} - {role}" for actor, role in cast) if cast else "Not Found"
+
+def fetch_title_states(urls, concurrency=DEFAULT_CONCURRENCY):
+    """Fetch pages (through the response cache) and parse their state; returns {url: state or None}."""
+    urls = list(dict.fromkeys(urls))
+
+    def work(url):
+        html = fetch_html(url)
+        return parse_title_state(html, url) if html else None
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        return dict(zip(urls, pool.map(work, urls)))
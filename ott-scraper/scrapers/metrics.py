@@ -0,0 +1,180 @@
+"""
+Run metrics: timing spans and counters around the hot paths.
+
+Every span / counter is appended to a JSONL trace (one event per line) that
+the worker processes and the app share, and kept in a small in-memory window
+for a Prometheus-style text export:
+
+    with span("fetch", host="www.justwatch.com"):
+        html = fetch_html(url)
+    count("http.cache.hits")
+
+The "📈 Run Metrics" page reads the trace and shows p50/p95 latency per stage
+and throughput per minute. Set METRICS_TRACE to another path, or to "" to
+disable the trace file.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+METRICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".metrics")
+TRACE_PATH = os.getenv("METRICS_TRACE", os.path.join(METRICS_DIR, "trace.jsonl"))
+MAX_TRACE_BYTES = 64 * 1024 * 1024      # rotated to trace.jsonl.1 past this size
+FLUSH_INTERVAL = 1.0                    # seconds between trace writes
+RECENT_EVENTS = 50_000                  # in-memory window for prometheus_text()
+
+
+# --- Recorder ---
+class Recorder:
+    """Buffers events and appends them to the trace file in batches."""
+
+    def __init__(self, path=TRACE_PATH):
+        self.path = path
+        self.recent = deque(maxlen=RECENT_EVENTS)
+        self._buffer = []
+        self._flushed = time.monotonic()
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        with self._lock:
+            self.recent.append(event)
+            if not self.path:
+                return
+            self._buffer.append(event)
+            if time.monotonic() - self._flushed < FLUSH_INTERVAL:
+                return
+            lines, self._buffer = self._buffer, []
+            self._flushed = time.monotonic()
+        self._write(lines)
+
+    def flush(self):
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            self._flushed = time.monotonic()
+        self._write(lines)
+
+    def _write(self, events):
+        if not events:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = "".join(json.dumps(e, separators=(",", ":"), default=str) + "\n" for e in events).encode("utf-8")
+        try:
+            if os.path.getsize(self.path) > MAX_TRACE_BYTES:
+                os.replace(self.path, self.path + ".1")
+        except OSError:
+            pass
+        # One O_APPEND write per batch, so processes sharing the trace don't interleave lines
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+_recorder = Recorder()
+atexit.register(_recorder.flush)
+
+def flush():
+    """Write buffered events now (end of a job, before reading the trace)."""
+    _recorder.flush()
+
+
+# --- Instrumentation ---
+@contextmanager
+def span(stage, **labels):
+    """Time the block as one `stage` event; failures are recorded with ok=false and re-raised."""
+    started = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        _recorder.emit({
+            "t": time.time(),
+            "stage": stage,
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+            "ok": ok,
+            "pid": os.getpid(),
+            **labels,
+        })
+
+def count(name, n=1, **labels):
+    """Add `n` to counter `name`."""
+    _recorder.emit({"t": time.time(), "counter": name, "n": n, "pid": os.getpid(), **labels})
+
+
+# --- Reading & summaries ---
+def load_trace(path=TRACE_PATH, since=None):
+    """Events from the trace file (and its rotated predecessor), optionally only those after `since` (epoch)."""
+    events = []
+    for p in (path + ".1", path):
+        try:
+            with open(p, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue    # partially written line
+                    if since is None or event.get("t", 0) >= since:
+                        events.append(event)
+        except OSError:
+            continue
+    return events
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def summarize(events):
+    """Per-stage latency (p50/p95/mean ms), error count and throughput per minute."""
+    by_stage = {}
+    for e in events:
+        if "stage" in e:
+            by_stage.setdefault(e["stage"], []).append(e)
+    rows = []
+    for stage, items in sorted(by_stage.items()):
+        ms = sorted(e["ms"] for e in items)
+        times = [e["t"] for e in items]
+        minutes = max((max(times) - min(times)) / 60, 1 / 60)
+        rows.append({
+            "stage": stage,
+            "count": len(items),
+            "errors": sum(1 for e in items if not e.get("ok", True)),
+            "p50_ms": round(_quantile(ms, 0.5), 1),
+            "p95_ms": round(_quantile(ms, 0.95), 1),
+            "mean_ms": round(sum(ms) / len(ms), 1),
+            "per_minute": round(len(items) / minutes, 1),
+        })
+    return rows
+
+def counter_totals(events):
+    totals = {}
+    for e in events:
+        if "counter" in e:
+            totals[e["counter"]] = totals.get(e["counter"], 0) + e.get("n", 1)
+    return totals
+
+def prometheus_text(events=None):
+    """Prometheus text exposition of stage latencies (summary) and counters; defaults to this process's window."""
+    events = list(_recorder.recent) if events is None else events
+    lines = ["# TYPE ott_stage_seconds summary"]
+    for row in summarize(events):
+        stage = row["stage"]
+        total = sum(e["ms"] for e in events if e.get("stage") == stage) / 1000
+        lines += [
+            f'ott_stage_seconds{{stage="{stage}",quantile="0.5"}} {row["p50_ms"] / 1000:.6f}',
+            f'ott_stage_seconds{{stage="{stage}",quantile="0.95"}} {row["p95_ms"] / 1000:.6f}',
+            f'ott_stage_seconds_sum{{stage="{stage}"}} {total:.6f}',
+            f'ott_stage_seconds_count{{stage="{stage}"}} {row["count"]}',
+        ]
+    lines.append("# TYPE ott_events_total counter")
+    for name, n in sorted(counter_totals(events).items()):
+        lines.append(f'ott_events_total{{name="{name}"}} {n}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,105 @@
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scrapers.metrics import span
+
+# Scrolls unresolved lazy images into view one at a time and resolves them as
+# they intersect (data-src -> src); finishes when every image has a real src.
+LAZY_IMAGES_JS = """
+const [selector, timeoutMs, done] = arguments;
+const imgs = Array.from(document.querySelectorAll(selector));
+const ready = img => { const s = img.getAttribute('src') || ''; return s && !s.startsWith('data:image'); };
+if (imgs.every(ready)) { done(true); return; }
+
+let finished = false;
+const finish = ok => {
+    if (finished) return;
+    finished = true; io.disconnect(); mo.disconnect(); clearTimeout(timer); done(ok);
+};
+const advance = () => {
+    const next = imgs.find(img => !ready(img));
+    if (!next) { finish(true); return; }
+    next.scrollIntoView({block: 'center'});
+};
+const io = new IntersectionObserver(entries => {
+    for (const e of entries) {
+        const img = e.target;
+        if (e.isIntersecting && !ready(img) && img.dataset.src) img.setAttribute('src', img.dataset.src);
+    }
+});
+const mo = new MutationObserver(advance);
+const timer = setTimeout(() => finish(imgs.every(ready)), timeoutMs);
+imgs.forEach(img => { io.observe(img); mo.observe(img, {attributes: true, attributeFilter: ['src']}); });
+advance();
+"""
+
+# Bytes pulled over the network and navigation timings for the current page.
+PAGE_METRICS_JS = """
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const res = performance.getEntriesByType('resource');
+return {
+    bytes: (nav.transferSize || 0) + res.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+    requests: res.length + 1,
+    dom_ready_ms: Math.round(nav.domContentLoadedEventEnd || 0),
+};
+"""
+
+
+# --- Timing ---
+class PageTimer:
+    """Collects per-step wall time (seconds) for one URL; each step is also a `browser.<step>` metrics span."""
+
+    def __init__(self, url):
+        self.url = url
+        self.steps = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def step(self, name):
+        t0 = time.perf_counter()
+        try:
+            with span(f"browser.{name}"):
+                yield
+        finally:
+            self.steps[name] = round(time.perf_counter() - t0, 3)
+
+    def note(self, **values):
+        """Attach extra per-URL measurements (bytes, request counts, ...)."""
+        self.steps.update(values)
+
+    def as_row(self):
+        return {"Source URL": self.url, **self.steps, "total": round(time.perf_counter() - self._start, 3)}
+
+
+def record_page_metrics(driver, timer):
+    """Add transferred KB, request count and DOMContentLoaded time of the current page to `timer`."""
+    try:
+        m = driver.execute_script(PAGE_METRICS_JS)
+    except WebDriverException:
+        return
+    timer.note(kb_transferred=round(m["bytes"] / 1024, 1), requests=m["requests"], dom_ready_ms=m["dom_ready_ms"])
+
+
+# --- Readiness waits ---
+def wait_for_element(driver, css, timeout=10):
+    """Wait until `css` is present in the DOM; returns False on timeout."""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, css))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def wait_for_lazy_images(driver, css, timeout=5):
+    """Resolve lazy-loaded images matching `css`; returns False if some are still placeholders."""
+    driver.set_script_timeout(timeout + 2)
+    try:
+        return bool(driver.execute_async_script(LAZY_IMAGES_JS, css, int(timeout * 1000)))
+    except TimeoutException:
+        return False
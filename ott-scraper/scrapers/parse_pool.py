@@ -0,0 +1,105 @@
+"""
+Parser processes for CPU-bound page extraction.
+
+Page parsing holds the GIL, so once fetches run concurrently it caps a batch
+at one core. Fetch threads hand raw HTML bytes to a pool of parser processes
+instead:
+
+    pool = get_parse_pool()
+    rows = pool.submit(parse_chunk, [(url, html_bytes), ...]).result()
+
+Workers are spawned once per process, warmed up front (parsers imported,
+XPath/regex compiled, one throwaway parse) and reused by every batch. Pages
+are sent several at a time to amortize IPC. Set JW_PARSE_WORKERS to the
+number of parser processes ("auto": one per core but one, up to 8; 0 parses
+on the fetch threads as before).
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+MAX_AUTO_WORKERS = 8
+DEFAULT_CHUNK_SIZE = int(os.getenv("JW_PARSE_CHUNK", "8"))     # most pages sent to a worker per task
+MIN_POOL_PAGES = 16     # smaller batches are parsed on the fetch threads; spawning isn't worth it
+
+
+# --- Config ---
+def resolve_workers(value=None):
+    """Parser process count from an int, "auto" or JW_PARSE_WORKERS."""
+    value = os.getenv("JW_PARSE_WORKERS", "auto") if value is None else value
+    if str(value).strip().lower() == "auto":
+        # Leave a core for the fetch threads; on a single core, parse inline
+        return min((os.cpu_count() or 1) - 1, MAX_AUTO_WORKERS)
+    return max(int(value), 0)
+
+PARSE_WORKERS = resolve_workers()
+
+
+# --- Worker side ---
+def _warm_worker():
+    """Process initializer: one throwaway parse imports the state and DOM backends and compiles their patterns."""
+    from scrapers.justwatch import parse_justwatch
+
+    parse_justwatch("<html><body><h1>warm-up (2000)</h1></body></html>", "https://www.justwatch.com/")
+
+def _ready():
+    return os.getpid()
+
+def parse_chunk(pages):
+    """[(url, html bytes)] -> [row], parsed in a worker; a page that fails becomes an Error row."""
+    from scrapers.justwatch import parse_justwatch
+    from scrapers.metrics import flush, span
+
+    rows = []
+    for url, body in pages:
+        try:
+            with span("parse"):
+                rows.append(parse_justwatch(body.decode("utf-8", "replace"), url))
+        except Exception as e:
+            rows.append({"Error": f"Failed to scrape {url}: {e}"})
+    flush()     # parse spans reach the shared trace now, not when the worker exits
+    return rows
+
+
+# --- Pool ---
+class ParsePool:
+    """A warm ProcessPoolExecutor of parser workers."""
+
+    def __init__(self, workers=PARSE_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.workers = max(workers, 1)
+        self.chunk_size = max(chunk_size, 1)
+        # spawn, not fork: the parent may be running threads (fetchers, Streamlit)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        self.broken = False
+        self.warm()
+
+    def warm(self):
+        """Start every worker now instead of on first use (doesn't wait for them)."""
+        for _ in range(self.workers):
+            self._executor.submit(_ready)
+
+    def submit(self, fn, *args):
+        return self._executor.submit(fn, *args)
+
+    def close(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_parse_pool(workers=PARSE_WORKERS):
+    """Process-wide parser pool; recreated if the worker count changes or a worker died."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and (_pool.broken or _pool.workers != max(workers, 1)):
+            _pool.close()
+            _pool = None
+        if _pool is None:
+            _pool = ParsePool(workers)
+        return _pool
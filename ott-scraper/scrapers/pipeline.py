@@ -0,0 +1,289 @@
+"""
+End-to-end pipeline: URL list -> final title JSON, in memory.
+
+Each title flows through
+
+    fetch (HTTP + parse) -> browser (posters, cast) -> upload (Cloudinary) -> serialize (row_to_json)
+
+Stages run concurrently on their own threads and are joined by bounded queues,
+so page fetches, browser work, uploads and serialization overlap while only a
+few titles per stage are held in memory. Titles that fail are still written,
+with an "error" field naming the stage. Run it from the command line with
+
+    python -m scrapers.pipeline urls.xlsx -o titles.json
+
+or from the "🚚 Pipeline" page of the app.
+"""
+import argparse
+import queue
+import threading
+import time
+from contextlib import nullcontext
+
+from scrapers.browser_pool import BrowserPool, DEFAULT_WORKERS
+from scrapers.catalog import get_catalog
+from scrapers.cloudinary_pipeline import DEFAULT_FOLDER, configure_from_env
+from scrapers.justwatch import DEFAULT_CONCURRENCY, fetch_html, parse_justwatch_dom
+from scrapers.justwatch_state import format_cast, parse_title_state
+from scrapers.metrics import span
+
+DEFAULT_QUEUE_SIZE = 32     # titles buffered between two stages
+DEFAULT_UPLOAD_CONCURRENCY = 8
+
+_DONE = object()    # end-of-stream marker passed down the queues
+
+
+# --- Stage plumbing ---
+def _run_stage(name, fn, inbox, outbox, workers, errors, stop):
+    """
+    Start `workers` threads applying `fn(item)` to everything in `inbox` and passing it on.
+    A failing item keeps flowing with its error recorded, so one bad title never stalls the rest;
+    once `stop` is set, items are passed on without work so the queues drain quickly.
+    """
+    remaining = [workers]
+    lock = threading.Lock()
+
+    def loop():
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                inbox.put(_DONE)    # let sibling threads see it too
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    outbox.put(_DONE)
+                return
+            if item.get("errors") or stop.is_set():     # failed upstream or abandoned: pass through
+                outbox.put(item)
+                continue
+            try:
+                with span(f"pipeline.{name}"):
+                    fn(item)
+            except Exception as e:
+                item.setdefault("errors", []).append(f"{name}: {e}")
+                errors.append((item["url"], name, e))
+            outbox.put(item)
+
+    threads = [threading.Thread(target=loop, name=f"pipeline-{name}-{i}", daemon=True) for i in range(workers)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+# --- Stages ---
+def _fetch(item, use_cache=True):
+    """Fetch and parse the page once; the embedded state (if any) is the row and feeds the later stages."""
+    html = fetch_html(item["url"], use_cache=use_cache)
+    if html is None:
+        raise RuntimeError("fetch failed")
+    item["state"] = parse_title_state(html, item["url"])
+    item["row"] = item["state"]["fields"] if item["state"] else parse_justwatch_dom(html, item["url"])
+    get_catalog().upsert("justwatch", [(item["url"], item["row"])])
+
+def _browser_page(driver, url):
+    """Posters, then cast, from a single load of the title page."""
+    from scrapers.cast_scraper import read_cast
+    from scrapers.poster_selenium import scrape_posters_page
+
+    main, seasons = scrape_posters_page(driver, url)
+    return main, seasons, read_cast(driver, url)
+
+def _browser(item, pool):
+    """Posters and cast from the embedded state, or from a pooled browser when the page has none."""
+    from scrapers.poster_index import canonicalize_poster_url
+
+    state = item.get("state")
+    if state:
+        # Same shape as the browser path, which canonicalizes in scrape_posters_page
+        main = state["fields"]["Main Poster"]
+        item["main_poster"] = canonicalize_poster_url(main) if main else item["row"].get("Main Poster")
+        item["season_posters"] = [canonicalize_poster_url(u) for u in state["season_posters"]]
+        item["cast"] = format_cast(state["cast"])
+    else:
+        main, seasons, item["cast"] = pool.run(_browser_page, item["url"])
+        item["main_poster"] = main if main not in ("Not Found", "Error") else item["row"].get("Main Poster")
+        item["season_posters"] = [p.strip() for p in seasons.split(",") if p.strip() and p.strip() != "Not Found"]
+    catalog = get_catalog()
+    catalog.upsert("posters", [(item["url"], {
+        "Main Poster": item["main_poster"], "Season Posters": ", ".join(item["season_posters"]),
+    })])
+    catalog.upsert("cast", [(item["url"], {"Cast": item["cast"]})])
+
+def _upload(item, folder, dedupe=True):
+    """Upload the title's posters; failed uploads keep their source URL."""
+    from scrapers.cloudinary_pipeline import upload_many
+    from scrapers.poster_index import upload_posters_deduped
+
+    posters = [p for p in [item.get("main_poster"), *item.get("season_posters", [])] if p]
+    if not posters:
+        return
+    upload = upload_posters_deduped if dedupe else upload_many
+    cloud = upload(posters, folder=folder, concurrency=min(len(posters), DEFAULT_UPLOAD_CONCURRENCY))
+    get_catalog().record_uploads(cloud)
+    if item.get("main_poster"):
+        item["main_poster"] = cloud.get(item["main_poster"].strip(), item["main_poster"])
+    item["season_posters"] = [cloud.get(p.strip(), p) for p in item.get("season_posters", [])]
+
+def _serialize(item):
+    from scrapers.excel_to_json import row_to_json
+
+    row = item.get("row") or {}
+    # Same lower-cased columns the Excel → JSON converter sees after flatten/upload/group
+    sheet = {
+        "title": row.get("Title"),
+        "year": row.get("Year"),
+        "original title": row.get("Original Title"),
+        "main poster": item.get("main_poster"),
+        "seasons count": row.get("Seasons Count"),
+        "season details": row.get("Season Details"),
+        "season poster": ",".join(item.get("season_posters", [])),
+        "justwatch rating": row.get("JustWatch Rating"),
+        "imdb rating": row.get("IMDB Rating"),
+        "rotten tomatoes": row.get("Rotten Tomatoes"),
+        "genres": row.get("Genres"),
+        "runtime": row.get("Runtime"),
+        "production country": row.get("Production Country"),
+        "description": row.get("Synopsis"),
+        "youtube links": row.get("YouTube Links"),
+        "caster": item.get("cast"),
+    }
+    item["json"] = row_to_json({k: ("" if v is None else v) for k, v in sheet.items()})
+
+
+# --- Pipeline ---
+def run_pipeline(urls, concurrency=DEFAULT_CONCURRENCY, workers=DEFAULT_WORKERS,
+                 upload_concurrency=DEFAULT_UPLOAD_CONCURRENCY, folder=DEFAULT_FOLDER, upload=True, dedupe=True,
+                 use_cache=True, queue_size=DEFAULT_QUEUE_SIZE, run_headless=True, progress_callback=None,
+                 on_error=None, pool=None):
+    """
+    Stream `urls` through every stage and yield `(index, record)` in input order,
+    where `record` is the `row_to_json` dict. A title that failed in any stage keeps
+    whatever was scraped and gets an extra "error" key ("stage: message; ...")
+    that successful records never have. `progress_callback(done, total)` and `on_error(url, stage, exc)`
+    run in the consuming thread. Pass a running BrowserPool as `pool` to reuse its
+    browsers; it is left open afterwards. Closing the generator early stops the stages.
+    """
+    urls = [u for u in dict.fromkeys(str(u).strip() for u in urls) if u]
+    total = len(urls)
+    errors = []
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(5)]
+    stop = threading.Event()
+    # Titles fed but not yet yielded; caps what waits at the sink behind one slow title
+    window = threading.Semaphore(queue_size * (len(queues) - 1))
+
+    with nullcontext(pool) if pool else BrowserPool(size=workers, headless=run_headless) as pool:
+        stages = [
+            ("fetch", lambda item: _fetch(item, use_cache), concurrency),
+            ("browser", lambda item: _browser(item, pool), workers),
+            ("upload", (lambda item: _upload(item, folder, dedupe)) if upload else (lambda item: None),
+             upload_concurrency),
+            ("serialize", _serialize, 1),
+        ]
+        for (name, fn, n), inbox, outbox in zip(stages, queues, queues[1:]):
+            _run_stage(name, fn, inbox, outbox, max(n, 1), errors, stop)
+
+        def feed():
+            for i, url in enumerate(urls):
+                while not window.acquire(timeout=0.1):
+                    if stop.is_set():
+                        break
+                if stop.is_set():
+                    break
+                queues[0].put({"index": i, "url": url})
+            queues[0].put(_DONE)
+
+        threading.Thread(target=feed, name="pipeline-feed", daemon=True).start()
+
+        # Re-order at the sink so output follows the input list
+        pending, next_index, done, reported = {}, 0, 0, 0
+        finished = False
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    finished = True
+                    break
+                done += 1
+                while reported < len(errors):
+                    if on_error:
+                        on_error(*errors[reported])
+                    reported += 1
+                if progress_callback:
+                    progress_callback(done, total)
+                if "json" not in item:      # failed somewhere: same schema, with what was scraped
+                    try:
+                        _serialize(item)
+                    except Exception:
+                        _serialize({"url": item["url"]})
+                if item.get("errors"):
+                    item["json"]["error"] = "; ".join(item["errors"])
+                pending[item["index"]] = item["json"]
+                while next_index in pending:
+                    yield next_index, pending.pop(next_index)
+                    window.release()
+                    next_index += 1
+        finally:
+            if not finished:
+                # Abandoned (or failed) consumer: stop feeding and let every stage run dry
+                stop.set()
+                while queues[-1].get() is not _DONE:
+                    pass
+
+
+def write_pipeline_output(records, output, jsonl=False):
+    """Write `(index, record)` pairs as they arrive: a JSON array (indent=4, like the converter) or JSON Lines."""
+    from scrapers.excel_to_json import write_json
+
+    with open(output, "w", encoding="utf-8") as f:
+        return write_json(([record] for _, record in records), f, ndjson=jsonl)
+
+
+# --- CLI ---
+def _read_urls(path, url_column=None):
+    from scrapers.table_io import excel_columns, iter_column
+
+    if path.endswith(".txt"):
+        with open(path, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    if url_column is None:
+        url_column = next(c for c in excel_columns(path) if "url" in c.lower())
+    return list(iter_column(path, url_column))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape, upload and convert JustWatch titles in one pass.")
+    parser.add_argument("input", help="URL list: .txt (one per line) or a table with a URL column")
+    parser.add_argument("-o", "--output", default="output.json", help="output JSON (or .jsonl) file")
+    parser.add_argument("--url-column", help="column holding the URLs (default: first containing 'url')")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="parallel page fetches")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel browsers")
+    parser.add_argument("--upload-concurrency", type=int, default=DEFAULT_UPLOAD_CONCURRENCY,
+                        help="titles uploaded at the same time")
+    parser.add_argument("--folder", default=DEFAULT_FOLDER, help="Cloudinary folder")
+    parser.add_argument("--no-upload", action="store_true", help="keep source poster URLs")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the HTTP response cache")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="titles buffered per stage")
+    args = parser.parse_args()
+
+    if not args.no_upload:
+        configure_from_env()
+    urls = _read_urls(args.input, args.url_column)
+    started = time.perf_counter()
+    count = write_pipeline_output(
+        run_pipeline(
+            urls,
+            concurrency=args.concurrency,
+            workers=args.workers,
+            upload_concurrency=args.upload_concurrency,
+            folder=args.folder,
+            upload=not args.no_upload,
+            use_cache=not args.no_cache,
+            queue_size=args.queue_size,
+            progress_callback=lambda done, total: print(f"🎬 {done}/{total}", end="\r", flush=True),
+            on_error=lambda url, stage, e: print(f"\n⚠️ {stage} failed for {url}: {e}", flush=True),
+        ),
+        args.output,
+        jsonl=args.output.endswith(".jsonl"),
+    )
+    print(f"\n✅ {count} titles written to {args.output} in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,214 @@
+import hashlib
+import io
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    from PIL import Image
+except ImportError:     # Pillow is optional; without it only byte-identical images are merged
+    Image = None
+
+from scrapers.cloudinary_pipeline import DEFAULT_CONCURRENCY, DEFAULT_FOLDER, upload_many
+from scrapers.justwatch import DEFAULT_TIMEOUT, get_session
+from scrapers.rate_limit import limited_get
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".uploads", "poster_index.sqlite3")
+CANONICAL_SIZE = "s592"
+
+JW_SIZE_RE = re.compile(r"/s\d+/")
+JW_EXT_RE = re.compile(r"\.(?:jpe?g|webp|png|avif)$", re.IGNORECASE)
+
+
+# --- URL normalization & fingerprints ---
+def canonicalize_poster_url(url):
+    """One URL per JustWatch image: no query/fragment, fixed size profile, .jpg format."""
+    url = str(url).strip()
+    parts = urlsplit(url)
+    if "justwatch.com" not in parts.netloc:
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, parts.query, ""))
+    path = JW_SIZE_RE.sub(f"/{CANONICAL_SIZE}/", parts.path)
+    path = JW_EXT_RE.sub("", path) + ".jpg"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, "", ""))
+
+def dhash(data, size=8):
+    """64-bit difference hash as hex, or None when Pillow is missing or the bytes aren't an image."""
+    if Image is None:
+        return None
+    try:
+        img = Image.open(io.BytesIO(data)).convert("L").resize((size + 1, size))
+    except Exception:
+        return None
+    pixels = list(img.getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:016x}"
+
+def near_hashes(phash, bits=64):
+    """The dHash itself and every hash one bit away: near-duplicate lookups are exact dict/index hits."""
+    value = int(phash, 16)
+    yield phash
+    for bit in range(bits):
+        yield f"{value ^ (1 << bit):016x}"
+
+
+# --- Index ---
+class PosterIndex:
+    """
+    Local fingerprint index: canonical URL -> (sha256, dHash) and
+    image fingerprint -> Cloudinary secure_url.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS images (
+                canonical_url TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                dhash TEXT,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS assets (
+                fingerprint TEXT NOT NULL,
+                folder TEXT NOT NULL,
+                dhash TEXT,
+                secure_url TEXT NOT NULL,
+                PRIMARY KEY (fingerprint, folder)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get_image(self, canonical_url):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT sha256, dhash FROM images WHERE canonical_url = ?", (canonical_url,)
+            ).fetchone()
+
+    def put_image(self, canonical_url, sha256, phash):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?)", (canonical_url, sha256, phash, time.time())
+            )
+            self._conn.commit()
+
+    def assets(self, fingerprints, folder):
+        """{fingerprint: (dhash, secure_url)} for those of `fingerprints` already uploaded to `folder`."""
+        fingerprints = list(fingerprints)
+        found = {}
+        with self._lock:
+            for i in range(0, len(fingerprints), 500):
+                chunk = fingerprints[i:i + 500]
+                rows = self._conn.execute(
+                    f"""SELECT fingerprint, dhash, secure_url FROM assets
+                        WHERE folder = ? AND fingerprint IN ({",".join("?" * len(chunk))})""",
+                    [folder, *chunk],
+                ).fetchall()
+                found.update({fp: (phash, url) for fp, phash, url in rows})
+        return found
+
+    def put_asset(self, fingerprint, folder, phash, secure_url):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?)", (fingerprint, folder, phash, secure_url)
+            )
+            self._conn.commit()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_poster_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PosterIndex()
+        return _index
+
+
+# --- Deduplicated upload ---
+def fingerprint_url(canonical_url, index=None, timeout=DEFAULT_TIMEOUT):
+    """(sha256, dHash) of the image, fetched once and then served from the index; None if unreachable."""
+    index = index or get_poster_index()
+    known = index.get_image(canonical_url)
+    if known:
+        return known
+    try:
+        res = limited_get(get_session(), canonical_url, timeout=timeout)
+    except Exception:
+        return None
+    if res.status_code != 200 or not res.content:
+        return None
+    sha256 = hashlib.sha256(res.content).hexdigest()
+    phash = dhash(res.content)
+    index.put_image(canonical_url, sha256, phash)
+    return sha256, phash
+
+def upload_posters_deduped(urls, folder=DEFAULT_FOLDER, concurrency=DEFAULT_CONCURRENCY, progress_callback=None,
+                           on_error=None, index=None, near_duplicates=False, fingerprint_callback=None):
+    """
+    Like `upload_many`, but posters that are the same image — same canonical URL
+    or same bytes — are uploaded once and share one secure_url across titles,
+    seasons and runs. With `near_duplicates`, posters in this call whose dHash
+    differs by at most one bit are merged too; pass one title's posters at a time,
+    since season posters of a show often share key art. Returns {source_url: secure_url}.
+    `fingerprint_callback(done, total)` reports the download/hash pass that comes
+    before the uploads; like `progress_callback`, it runs in the calling thread.
+    """
+    index = index or get_poster_index()
+    sources = [u for u in dict.fromkeys(str(u).strip() for u in urls) if u]
+    canonical = {u: canonicalize_poster_url(u) for u in sources}
+    unique_canonical = list(dict.fromkeys(canonical.values()))
+
+    prints = {}
+    if fingerprint_callback:
+        fingerprint_callback(0, len(unique_canonical))
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = {pool.submit(fingerprint_url, url, index): url for url in unique_canonical}
+        for done, future in enumerate(as_completed(futures), start=1):
+            prints[futures[future]] = future.result()
+            if fingerprint_callback:
+                fingerprint_callback(done, len(unique_canonical))
+
+    # Group canonical URLs by image: same bytes, or (opt-in) a dHash within one bit in this batch
+    group_of, representative, by_hash = {}, {}, {}
+    for url in unique_canonical:
+        fp = prints[url]
+        if fp is None:
+            key, phash = f"url:{url}", None
+        else:
+            key, phash = fp
+            if near_duplicates and phash:
+                key = next((by_hash[h] for h in near_hashes(phash) if h in by_hash), key)
+                by_hash.setdefault(phash, key)
+        group_of[url] = key
+        representative.setdefault(key, (url, phash))
+    known = index.assets(representative, folder)
+
+    # Upload one representative per image that isn't in Cloudinary yet
+    to_upload = {key: rep for key, rep in representative.items() if key not in known}
+    uploaded = upload_many(
+        [url for url, _ in to_upload.values()],
+        folder=folder,
+        concurrency=concurrency,
+        progress_callback=progress_callback,
+        on_error=on_error,
+    )
+    secure = {key: url for key, (_, url) in known.items()}
+    for key, (url, phash) in to_upload.items():
+        if uploaded[url] != url:    # failed uploads map back to their source URL
+            secure[key] = uploaded[url]
+            index.put_asset(key, folder, phash, uploaded[url])
+
+    return {u: secure.get(group_of[canonical[u]], u) for u in sources}
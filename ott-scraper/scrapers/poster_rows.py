@@ -0,0 +1,64 @@
+"""
+Flatten comma-separated poster lists into one row per poster, and group them back.
+
+Both operations are vectorized (str.split + explode, groupby.agg) and keep titles
+in first-appearance order. They back the Excel Flattener and Poster Grouper pages
+as well as the standalone scripts; the *_file variants work chunk by chunk for
+sheets too large to hold in memory.
+"""
+import pandas as pd
+
+from scrapers.table_io import iter_table_chunks, write_table
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+# --- DataFrames ---
+def flatten_posters(df, title_col="Title", posters_col="Season Posters", out_col="SeasonPoster"):
+    """One row per poster URL; empty and missing entries are dropped."""
+    posters = df[posters_col].astype(object).where(df[posters_col].notna(), "").astype(str).str.split(",")
+    flat = pd.DataFrame({title_col: df[title_col], out_col: posters}).explode(out_col)
+    flat[out_col] = flat[out_col].str.strip()
+    return flat[flat[out_col] != ""].reset_index(drop=True)
+
+def group_posters(df, title_col="Title", poster_col="SeasonPoster"):
+    """Join posters back into one comma-separated cell per title, titles in first-appearance order."""
+    titles = df[title_col].dropna().drop_duplicates()
+    posters = df[[title_col, poster_col]].dropna()
+    # object dtype: str.join over Python strings is much faster than over Arrow-backed strings
+    values = posters[poster_col].astype(str).astype(object)
+    joined = values.groupby(posters[title_col], sort=False).agg(",".join)
+    return joined.reindex(titles.tolist(), fill_value="").rename_axis(title_col).reset_index()
+
+
+# --- Files, chunk by chunk ---
+def flatten_file(source, target, chunk_rows=DEFAULT_CHUNK_ROWS, title_col="Title", posters_col="Season Posters",
+                 out_col="SeasonPoster"):
+    """Flatten a table file into `target` (format from its extension); returns the number of poster rows."""
+    count = 0
+
+    def rows():
+        nonlocal count
+        for chunk in iter_table_chunks(source, chunk_rows):
+            flat = flatten_posters(chunk, title_col, posters_col, out_col)
+            count += len(flat)
+            yield from flat.to_dict("records")
+
+    write_table(rows(), target, columns=[title_col, out_col])
+    return count
+
+def group_file(source, target, chunk_rows=DEFAULT_CHUNK_ROWS, title_col="Title", poster_col="SeasonPoster"):
+    """
+    Group a flattened table file into `target`. Each chunk is grouped on its own and
+    partial results are merged, so a title spread over several chunks still ends up in one row.
+    """
+    parts = {}
+    for chunk in iter_table_chunks(source, chunk_rows):
+        for title, joined in group_posters(chunk, title_col, poster_col).itertuples(index=False, name=None):
+            parts.setdefault(title, []).append(joined)
+    grouped = pd.DataFrame({
+        title_col: list(parts),
+        poster_col: [",".join(p for p in joined if p) for joined in parts.values()],
+    })
+    write_table(grouped, target)
+    return len(grouped)
@@ -1,20 +1,128 @@
-import time
-import pandas as pd
-from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 import streamlit as st
-import io
 
-def scrape_posters_with_selenium(uploaded_file, run_headless=False):
-    """Scrape Main & Season posters from JustWatch using Selenium."""
+from scrapers.browser_pool import BrowserPool, DEFAULT_WORKERS
+from scrapers.justwatch_state import fetch_title_states
+from scrapers.page_ready import PageTimer, record_page_metrics, wait_for_element, wait_for_lazy_images
+from scrapers.table_io import TABLE_FORMATS, TABLE_TYPES, read_table, table_bytes
 
-    # === Load Excel file into DataFrame ===
+MAIN_POSTER_CSS = ".title-sidebar__title-with-poster__poster img"
+SEASON_POSTER_CSS = ".season-card__link img"
+
+
+def canonical_poster(url):
+    """
+    One shape for posters from the page state and from the browser: the canonical
+    JustWatch URL (see poster_index.canonicalize_poster_url); srcset values keep their first URL.
+    """
+    from scrapers.poster_index import canonicalize_poster_url
+
+    return canonicalize_poster_url(url.split(",")[0].split()[0])
+
+def scrape_posters_page(driver, url, timings=None):
+    """Return (main poster, comma-joined season posters) for one title page."""
+    timer = PageTimer(url)
+    with timer.step("load"):
+        driver.get(url)
+
+    # ✅ Wait for the poster, then resolve lazy-loaded images
+    with timer.step("wait_poster"):
+        wait_for_element(driver, MAIN_POSTER_CSS, timeout=10)
+    with timer.step("lazy_images"):
+        wait_for_lazy_images(driver, f"{MAIN_POSTER_CSS}, {SEASON_POSTER_CSS}", timeout=5)
+
+    record_page_metrics(driver, timer)
+
+    with timer.step("extract"):
+        # --- MAIN POSTER ---
+        try:
+            main_poster_el = driver.find_element(By.CSS_SELECTOR, MAIN_POSTER_CSS)
+            main_poster = (
+                main_poster_el.get_attribute("src")
+                or main_poster_el.get_attribute("data-src")
+                or main_poster_el.get_attribute("data-srcset")
+            )
+            if not main_poster or main_poster.startswith("data:image"):
+                main_poster = "Not Found"
+            else:
+                main_poster = canonical_poster(main_poster)
+        except NoSuchElementException:
+            main_poster = "Not Found"
+
+        # --- SEASON POSTERS ---
+        season_urls = []
+        for img in driver.find_elements(By.CSS_SELECTOR, SEASON_POSTER_CSS):
+            u = (
+                img.get_attribute("src")
+                or img.get_attribute("data-src")
+                or img.get_attribute("data-srcset")
+            )
+            if u and not u.startswith("data:image"):
+                season_urls.append(canonical_poster(u))
+
+    if timings is not None:
+        timings.append(timer.as_row())
+    return main_poster, ", ".join(season_urls) if season_urls else "Not Found"
+
+
+def scrape_posters_many(urls, run_headless=True, workers=DEFAULT_WORKERS, timings=None,
+                        progress_callback=None, on_result=None):
+    """
+    Posters for each URL, in input order, as {"Main Poster", "Season Posters"} dicts.
+    Pages with embedded state are read over HTTP; only the rest open a browser.
+    `on_result(index, row)` fires as each URL finishes.
+    """
+    urls = list(urls)
+    results = [None] * len(urls)
+    done = 0
+
+    def finish(i, row):
+        nonlocal done
+        results[i] = row
+        done += 1
+        if on_result:
+            on_result(i, row)
+        if progress_callback:
+            progress_callback(done, len(urls))
+
+    # === Read posters from the embedded page state (no browser needed) ===
+    states = fetch_title_states(urls)
+    browser_idx = []
+    for i, url in enumerate(urls):
+        state = states.get(url)
+        if state:
+            main = state["fields"]["Main Poster"]
+            finish(i, {
+                "Main Poster": canonical_poster(main) if main else "Not Found",
+                "Season Posters": ", ".join(canonical_poster(u) for u in state["season_posters"]) or "Not Found",
+            })
+        else:
+            browser_idx.append(i)
+
+    # === Scrape remaining pages on the browser pool ===
+    if browser_idx:
+        with BrowserPool(size=workers, headless=run_headless) as pool:
+            pool.map(
+                lambda driver, url: scrape_posters_page(driver, url, timings),
+                [urls[i] for i in browser_idx],
+                on_error=lambda url, e: ("Error", "Error"),
+                on_result=lambda j, r: finish(browser_idx[j], {"Main Poster": r[0], "Season Posters": r[1]}),
+            )
+    return results
+
+
+def scrape_posters_with_selenium(uploaded_file, run_headless=False, workers=DEFAULT_WORKERS, timings=None):
+    """
+    Scrape Main & Season posters from JustWatch using Selenium.
+    Pass a list as `timings` to collect per-URL step timings of browser-scraped pages.
+    """
+
+    # === Load input table into DataFrame ===
     try:
-        df = pd.read_excel(uploaded_file)
+        df = read_table(uploaded_file)
     except Exception as e:
-        st.error(f"❌ Failed to read Excel file: {e}")
+        st.error(f"❌ Failed to read input file: {e}")
         return None
 
     if "Source URL" not in df.columns:
@@ -27,76 +135,23 @@ def scrape_posters_with_selenium(uploaded_file, run_headless=False):
     if "Season Posters" not in df.columns:
         df["Season Posters"] = None
 
-    # === Setup Selenium driver ===
-    options = webdriver.ChromeOptions()
-    if run_headless:
-        options.add_argument("--headless=new")
-    else:
-        options.add_argument("--start-maximized")
-
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()), 
-        options=options
-    )
-
-    urls = df["Source URL"].dropna().tolist()
     progress = st.progress(0)
     status = st.empty()
+    status.text("Scraping posters ...")
+
+    rows = df["Source URL"].dropna()
+    results = scrape_posters_many(
+        rows.tolist(),
+        run_headless=run_headless,
+        workers=workers,
+        timings=timings,
+        progress_callback=lambda done, total: progress.progress(done / total),
+    )
+    for idx, result in zip(rows.index, results):
+        df.at[idx, "Main Poster"] = result["Main Poster"]
+        df.at[idx, "Season Posters"] = result["Season Posters"]
 
-    # === Loop through URLs ===
-    for idx, url in df["Source URL"].dropna().items():
-        status.text(f"Scraping {url} ...")
-        try:
-            driver.get(url)
-            time.sleep(3)
-
-            # ✅ Scroll to force lazy loading
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-
-            # --- MAIN POSTER ---
-            try:
-                main_poster_el = driver.find_element(By.CSS_SELECTOR, ".title-sidebar__title-with-poster__poster img")
-                main_poster = (
-                    main_poster_el.get_attribute("src")
-                    or main_poster_el.get_attribute("data-src")
-                    or main_poster_el.get_attribute("data-srcset")
-                )
-                if main_poster and main_poster.startswith("data:image"):
-                    df.at[idx, "Main Poster"] = "Not Found"
-                else:
-                    df.at[idx, "Main Poster"] = main_poster
-            except:
-                df.at[idx, "Main Poster"] = "Not Found"
-
-            # --- SEASON POSTERS ---
-            try:
-                season_img_elements = driver.find_elements(By.CSS_SELECTOR, ".season-card__link img")
-                season_urls = []
-                for img in season_img_elements:
-                    u = (
-                        img.get_attribute("src")
-                        or img.get_attribute("data-src")
-                        or img.get_attribute("data-srcset")
-                    )
-                    if u and not u.startswith("data:image"):
-                        season_urls.append(u)
-
-                df.at[idx, "Season Posters"] = ", ".join(season_urls) if season_urls else "Not Found"
-            except:
-                df.at[idx, "Season Posters"] = "Not Found"
-
-        except Exception as e:
-            df.at[idx, "Main Poster"] = "Error"
-            df.at[idx, "Season Posters"] = "Error"
-
-        # ✅ update progress bar
-        progress.progress((list(df["Source URL"].dropna().index).index(idx) + 1) / len(urls))
-
-    driver.quit()
+    progress.progress(1.0)
     status.text("✅ Scraping complete!")
 
     return df
@@ -106,25 +161,24 @@ def scrape_posters_with_selenium(uploaded_file, run_headless=False):
 def main():
     st.title("🎬 JustWatch Poster Scraper")
 
-    uploaded_file = st.file_uploader("Upload Excel file with 'Source URL' column", type=["xlsx"])
+    uploaded_file = st.file_uploader("Upload Excel file with 'Source URL' column", type=TABLE_TYPES)
     headless_mode = st.checkbox("Run in headless mode", value=False)
+    workers = st.slider("Parallel browsers", 1, 8, DEFAULT_WORKERS)
+    fmt = st.selectbox("Output format", TABLE_TYPES)
 
     if uploaded_file:
         if st.button("Start Scraping"):
-            df = scrape_posters_with_selenium(uploaded_file, run_headless=headless_mode)
+            df = scrape_posters_with_selenium(uploaded_file, run_headless=headless_mode, workers=workers)
             if df is not None:
                 st.success("Scraping finished!")
                 st.dataframe(df)
 
                 # Download button
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                    df.to_excel(writer, index=False)
                 st.download_button(
                     label="📥 Download Results",
-                    data=output.getvalue(),
-                    file_name="scraped_posters.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    data=table_bytes(df, fmt),
+                    file_name=f"scraped_posters.{fmt}",
+                    mime=TABLE_FORMATS[fmt]
                 )
 
 if __name__ == "__main__":
@@ -0,0 +1,204 @@
+"""
+Per-host politeness shared by every scraper.
+
+Each host gets a token bucket (requests per second; RATE_LIMIT_RPS=0 turns
+it off) and an AIMD concurrency limit: the limit creeps up while responses
+are healthy and is halved on 429/503, errors or latency well above the
+host's baseline, at most once per round of requests in flight. `Retry-After`
+pauses the whole host. HTTP fetches, browser page loads and Cloudinary
+uploads all go through `throttle(url)`:
+
+    with throttle(url) as slot:
+        res = session.get(url)
+        slot.record(res.status_code, res.headers.get("Retry-After"))
+
+Browser pages take seconds where fetches take milliseconds, so they are
+throttled on their own limiter per host (`throttle(url, channel="browser")`)
+that backs off on 429/503 and errors but not on latency: a slow page is
+normal there, and it never reads as overload to the HTTP controller.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from scrapers.metrics import count
+
+DEFAULT_RATE = float(os.getenv("RATE_LIMIT_RPS", "5"))              # tokens per second per host
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("RATE_LIMIT_MAX_CONCURRENCY", "16"))
+DEFAULT_BACKOFF = 5.0       # seconds a host is paused after a 429/503 without Retry-After
+MAX_RETRY_AFTER = 300.0     # never sleep longer than this on a server's say-so
+LATENCY_FACTOR = 2.5        # latency this many times the baseline counts as overload
+BACKOFF_STATUSES = (429, 503)
+CHANNELS = {"browser": {"latency_backoff": False}}     # HostLimiter options per channel
+
+
+# --- Helper functions ---
+def host_of(url):
+    return urlsplit(str(url)).netloc.lower() or str(url)
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+# --- Limiter ---
+class HostLimiter:
+    """Token bucket + AIMD concurrency window for one host."""
+
+    def __init__(self, rate=DEFAULT_RATE, max_concurrency=DEFAULT_MAX_CONCURRENCY, min_concurrency=1,
+                 latency_backoff=True):
+        self.max_rate = max(rate, 0.0)     # 0: no token bucket, only the concurrency window
+        self.latency_backoff = latency_backoff
+        self.rate = self.max_rate
+        self.burst = max(rate, 1.0)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(min(4, max_concurrency))     # start cautiously, ramp up while healthy
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0, "backoffs": 0}
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._active = 0
+        self._baseline = None       # smoothed latency of healthy responses
+        self._decreased_at = float("-inf")     # requests started before this already saw the last decrease
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def acquire(self):
+        """Block until the host is not paused, a concurrency slot is free and a token is available."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._active >= int(self.limit):
+                    wait = None     # woken by release()
+                elif self.rate > 0 and self._tokens < 1:
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    self._tokens -= 1
+                    self._active += 1
+                    self.stats["requests"] += 1
+                    return
+                self._cond.wait(wait)
+
+    def release(self, latency=None, status=None, retry_after=None, error=False, started=None):
+        """
+        Free the slot and adapt: additive increase when healthy, multiplicative decrease otherwise.
+        `started` (time.monotonic() when the request went out) lets a burst of failures from
+        requests that were in flight together count as one decrease.
+        """
+        with self._cond:
+            self._active -= 1
+            overloaded = (
+                self.latency_backoff and latency is not None and self._baseline is not None
+                and latency > self._baseline * LATENCY_FACTOR
+            )
+            if status in BACKOFF_STATUSES:
+                self.stats["throttled"] += 1
+                pause = parse_retry_after(retry_after)
+                pause = min(pause if pause is not None else DEFAULT_BACKOFF, MAX_RETRY_AFTER)
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                self._decrease(started)
+            elif error or overloaded:
+                if error:
+                    self.stats["errors"] += 1
+                self._decrease(started)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self.rate = min(self.max_rate, self.rate + 0.1 * self.max_rate / max(self.limit, 1))
+                if latency is not None:
+                    self._baseline = latency if self._baseline is None else 0.9 * self._baseline + 0.1 * latency
+            self._cond.notify_all()
+        if status in BACKOFF_STATUSES:
+            count("rate_limit.throttled")
+
+    def _decrease(self, started=None):
+        if started is not None and started < self._decreased_at:
+            return      # sent before the last decrease: that one already accounted for it
+        self._decreased_at = time.monotonic()
+        self.stats["backoffs"] += 1
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        self.rate = max(self.max_rate / 10, self.rate / 2)
+
+    def snapshot(self):
+        with self._cond:
+            return {**self.stats, "limit": round(self.limit, 2), "rate": round(self.rate, 2)}
+
+
+class _Slot:
+    """
+    Outcome of one throttled request, reported back to the limiter on exit.
+    An exception counts as a host error unless `excuse()` was called (e.g. a local browser crash).
+    """
+
+    def __init__(self):
+        self.status = None
+        self.retry_after = None
+        self.excused = False
+
+    def record(self, status=None, retry_after=None):
+        self.status = status
+        self.retry_after = retry_after
+
+    def excuse(self):
+        self.excused = True
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(url_or_host, channel=None):
+    """Process-wide limiter for the URL's host; each `channel` ("browser") gets its own per host."""
+    host = host_of(url_or_host) if "/" in str(url_or_host) else str(url_or_host).lower()
+    key = f"{host} ({channel})" if channel else host
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = HostLimiter(**CHANNELS.get(channel, {}))
+        return _limiters[key]
+
+def limiter_stats():
+    """{host: counters, current concurrency limit and rate} for every host seen so far."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {host: limiter.snapshot() for host, limiter in limiters.items()}
+
+@contextmanager
+def throttle(url, channel=None):
+    """Hold one rate-limited slot for `url`'s host; latency is measured, outcome reported via `slot.record`."""
+    limiter = get_limiter(url, channel)
+    limiter.acquire()
+    slot = _Slot()
+    started = time.monotonic()
+    try:
+        yield slot
+    except BaseException:
+        limiter.release(time.monotonic() - started, slot.status, slot.retry_after, error=not slot.excused,
+                        started=started)
+        raise
+    limiter.release(time.monotonic() - started, slot.status, slot.retry_after, started=started)
+
+def limited_get(session, url, retries=2, **kwargs):
+    """`session.get` through the host limiter; 429/503 responses are retried after the host's pause."""
+    for attempt in range(retries + 1):
+        with throttle(url) as slot:
+            res = session.get(url, **kwargs)
+            slot.record(res.status_code, res.headers.get("Retry-After"))
+        if res.status_code not in BACKOFF_STATUSES or attempt == retries:
+            return res
@@ -0,0 +1,338 @@
+import csv
+import io
+import json
+import os
+from itertools import islice
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+# The parser read_excel types cells with; not exported from the top-level namespace, so pandas
+# is bounded in requirements.txt and tests/test_table_io.py fails if this import goes away
+from pandas.io.parsers import TextParser
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:     # calamine is optional; openpyxl read-only mode is the fallback
+    CalamineWorkbook = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:     # pyarrow is only needed for Parquet files
+    pq = None
+
+from scrapers.metrics import span
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Interchange formats between pipeline stages: extension -> MIME type
+TABLE_FORMATS = {
+    "xlsx": XLSX_MIME,
+    "parquet": "application/vnd.apache.parquet",
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+TABLE_TYPES = list(TABLE_FORMATS)
+PARQUET_BATCH_ROWS = 10_000
+
+
+# --- Helper functions ---
+def _cell(value):
+    """Excel-safe cell value: NaN/NaT -> empty, containers -> text."""
+    if value is pd.NaT or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, (list, dict, tuple, set)):
+        return str(value)
+    return value
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+def table_format(source, default="xlsx"):
+    """Format of a path or uploaded file, from its extension (.ndjson counts as jsonl)."""
+    name = source if isinstance(source, str) else getattr(source, "name", "")
+    ext = os.path.splitext(name)[1].lower().lstrip(".")
+    ext = {"ndjson": "jsonl", "pq": "parquet"}.get(ext, ext)
+    return ext if ext in TABLE_FORMATS else default
+
+def _stable_frame(df):
+    """
+    Same columns, same order, one type per column: object columns with mixed
+    values (lists, numbers next to text) become strings so Parquet/JSONL schemas
+    don't drift between runs.
+    """
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].map(_cell).astype("string")
+    return df
+
+def _text(source):
+    """Text stream over a path or binary upload; the caller detaches it so the upload stays open."""
+    if isinstance(source, str):
+        return open(source, encoding="utf-8-sig", newline="")
+    return io.TextIOWrapper(_rewind(source), encoding="utf-8-sig", newline="")
+
+def _close_text(stream, source):
+    if isinstance(source, str):
+        stream.close()
+    else:
+        stream.detach()
+
+
+# --- Reading ---
+def iter_excel_rows(source):
+    """
+    Stream the first sheet of an xlsx file (path or file object) as dicts keyed by header,
+    without building a DataFrame. Uses calamine when installed, else openpyxl read-only mode.
+    """
+    if CalamineWorkbook is not None:
+        wb = (
+            CalamineWorkbook.from_path(source) if isinstance(source, str)
+            else CalamineWorkbook.from_filelike(_rewind(source))
+        )
+        sheet = wb.get_sheet_by_index(0)
+        rows = sheet.iter_rows() if hasattr(sheet, "iter_rows") else iter(sheet.to_python())
+    else:
+        wb = load_workbook(_rewind(source), read_only=True, data_only=True)
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+
+    header = next(rows, None)
+    if header is None:
+        return
+    header = [str(h).strip() if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+    for values in rows:
+        if not any(v not in (None, "") for v in values):
+            continue    # skip blank rows, like pd.read_excel
+        values = tuple(values) + (None,) * (len(header) - len(values))     # trailing empty cells
+        yield {h: (v if v != "" else None) for h, v in zip(header, values)}
+
+def _iter_csv_rows(source):
+    stream = _text(source)
+    try:
+        for row in csv.DictReader(stream):
+            if any(row.values()):
+                yield {k.strip(): (v if v != "" else None) for k, v in row.items() if k is not None}
+    finally:
+        _close_text(stream, source)
+
+def _iter_jsonl_rows(source):
+    stream = _text(source)
+    try:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        _close_text(stream, source)
+
+def _iter_parquet_rows(source):
+    if pq is None:
+        yield from pd.read_parquet(_rewind(source)).astype(object).where(lambda d: d.notna(), None).to_dict("records")
+        return
+    for batch in pq.ParquetFile(_rewind(source)).iter_batches(batch_size=PARQUET_BATCH_ROWS):
+        yield from batch.to_pylist()
+
+def iter_table_rows(source, fmt=None):
+    """Stream rows of any supported format as dicts; the format comes from the file extension."""
+    fmt = fmt or table_format(source)
+    if fmt == "csv":
+        return _iter_csv_rows(source)
+    if fmt == "jsonl":
+        return _iter_jsonl_rows(source)
+    if fmt == "parquet":
+        return _iter_parquet_rows(source)
+    return iter_excel_rows(source)
+
+def iter_table_chunks(source, chunk_rows, fmt=None):
+    """Stream a table as DataFrames of at most `chunk_rows` rows."""
+    rows = iter_table_rows(source, fmt)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield pd.DataFrame(chunk)
+
+def _typed_frame(rows, columns, fmt, objects=()):
+    """
+    Rows as a DataFrame typed the way `read_table` types them: xlsx and CSV cells go through
+    pandas' text parser (numbers inferred, NA markers dropped); JSONL and Parquet keep their
+    types. Columns in `objects` keep their raw values instead of being inferred.
+    """
+    if fmt in ("xlsx", "csv"):
+        def cell(v):
+            # Excel readers turn whole-number floats into ints
+            return int(v) if fmt == "xlsx" and isinstance(v, float) and v.is_integer() else v
+
+        data = [columns] + [[cell(row.get(c)) for c in columns] for row in rows]
+        return TextParser(data, header=0, dtype=dict.fromkeys(objects, object)).read()
+    df = pd.DataFrame(rows, columns=columns)
+    for col in objects:
+        df[col] = pd.Series([row.get(col) for row in rows], index=df.index, dtype=object)
+    return df
+
+def _merge_dtype(a, b):
+    """Type of a column made of two parts typed `a` and `b`."""
+    if a is None or a == b:
+        return b
+    if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+        return "float64"
+    return object
+
+def _holds_nan(dtype):
+    return not (pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype))
+
+def iter_typed_chunks(source, chunk_rows, fmt=None):
+    """
+    Like `iter_table_chunks`, but every chunk's columns get the type `read_table` gives them
+    over the whole table, so a column isn't int in one chunk and float or text in the next.
+    Costs one extra streaming pass to infer the types.
+    """
+    fmt = fmt or table_format(source)
+    dtypes, present, chunks = {}, {}, 0
+    rows = iter_table_rows(source, fmt)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            break
+        chunks += 1
+        for col, values in _typed_frame(chunk, collect_columns(chunk), fmt).items():
+            dtypes.setdefault(col, None)
+            if values.isna().all():     # says nothing about the type, only that NaN occurs
+                continue
+            dtypes[col] = _merge_dtype(dtypes[col], values.dtype)
+            present[col] = present.get(col, 0) + 1
+    for col in dtypes:
+        if present.get(col, 0) < chunks and (dtypes[col] is None or not _holds_nan(dtypes[col])):
+            dtypes[col] = _merge_dtype(dtypes[col], "float64")    # missing in some rows -> NaN there
+
+    columns = list(dtypes)
+    objects = [c for c in columns if dtypes[c] == object]
+    rows = iter_table_rows(source, fmt)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        df = _typed_frame(chunk, columns, fmt, objects)
+        for col in columns:
+            if col not in objects and df[col].dtype != dtypes[col]:
+                df[col] = df[col].astype(dtypes[col])
+        yield df
+
+def iter_column(source, column):
+    """Non-empty values of one column, streamed."""
+    for row in iter_table_rows(source):
+        value = row.get(column)
+        if value is not None:
+            yield value
+
+def excel_columns(source):
+    """Header row of the first sheet (or the column names of a CSV/JSONL/Parquet file)."""
+    if table_format(source) == "parquet" and pq is not None:
+        return pq.ParquetFile(_rewind(source)).schema_arrow.names
+    for row in iter_table_rows(source):
+        return list(row)
+    return []
+
+def read_table(source, fmt=None):
+    """
+    Whole table as a DataFrame. xlsx uses the calamine engine when available;
+    Parquet is read columnar through pyarrow.
+    """
+    fmt = fmt or table_format(source)
+    source = _rewind(source)
+    with span("io.read", fmt=fmt):
+        if fmt == "csv":
+            return pd.read_csv(source)
+        if fmt == "jsonl":
+            return pd.read_json(source, lines=True, dtype=False)
+        if fmt == "parquet":
+            return pd.read_parquet(source)
+        engine = "calamine" if CalamineWorkbook is not None else None
+        return pd.read_excel(source, engine=engine)
+
+
+# --- Writing ---
+def collect_columns(rows):
+    """Ordered union of keys across row dicts (one pass)."""
+    columns = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return list(columns)
+
+def write_excel_rows(rows, target, columns):
+    """Stream row dicts into an xlsx (path or file object) with openpyxl write-only mode."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(columns)
+    for row in rows:
+        ws.append([_cell(row.get(c)) for c in columns])
+    wb.save(target)
+    return target
+
+def write_excel_frame(df, target):
+    """Write a DataFrame into an xlsx (path or file object) with openpyxl write-only mode."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append([str(c) for c in df.columns])
+    for values in df.itertuples(index=False, name=None):
+        ws.append([_cell(v) for v in values])
+    wb.save(target)
+    return target
+
+def excel_bytes(data, columns=None):
+    """xlsx bytes for a DataFrame or an iterable of row dicts, ready for st.download_button."""
+    buffer = io.BytesIO()
+    if isinstance(data, pd.DataFrame):
+        write_excel_frame(data, buffer)
+    else:
+        write_excel_rows(data, buffer, columns)
+    return buffer.getvalue()
+
+def write_table(data, target, fmt=None, columns=None):
+    """
+    Write a DataFrame or row dicts to a path or file object as xlsx, Parquet, CSV or JSONL.
+    `columns` fixes the column order (required for row dicts written as xlsx).
+    Row dicts are streamed for xlsx and JSONL; the other formats go through one DataFrame.
+    """
+    fmt = fmt or table_format(target)
+    is_frame = isinstance(data, pd.DataFrame)
+    if fmt == "xlsx":
+        return write_excel_frame(data, target) if is_frame else write_excel_rows(data, target, columns)
+
+    if fmt == "jsonl" and not is_frame:
+        stream = open(target, "wb") if isinstance(target, str) else target
+        try:
+            for row in data:
+                record = {c: _cell(row.get(c)) for c in columns} if columns else row
+                stream.write(json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+        finally:
+            if stream is not target:
+                stream.close()
+        return target
+
+    df = _stable_frame(data if is_frame else pd.DataFrame(list(data)))
+    if columns:
+        df = df.reindex(columns=columns)
+    if fmt == "parquet":
+        df.to_parquet(target, index=False)
+    elif fmt in ("csv", "jsonl"):
+        text = (
+            df.to_csv(index=False) if fmt == "csv"
+            else df.to_json(orient="records", lines=True, force_ascii=False)
+        )
+        if isinstance(target, str):
+            with open(target, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+        else:
+            target.write(text.encode("utf-8"))
+    else:
+        raise ValueError(f"❌ Unsupported table format: {fmt}")
+    return target
+
+def table_bytes(data, fmt="xlsx", columns=None):
+    """File bytes of a DataFrame or row dicts in `fmt`, ready for st.download_button."""
+    buffer = io.BytesIO()
+    with span("io.write", fmt=fmt):
+        write_table(data, buffer, fmt, columns)
+    return buffer.getvalue()
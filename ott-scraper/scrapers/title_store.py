@@ -0,0 +1,255 @@
+"""
+Incremental re-scrapes.
+
+A local title store remembers, per `Source URL` and scraper kind, the last
+scraped row, when it was last checked, a fingerprint of the title page and
+the page's ETag / Last-Modified. On a re-run, titles checked within
+`max_age` are served from the store without any request. Older titles get a
+conditional GET: a 304 keeps the stored row, and so does a page whose
+fingerprint didn't change. Only new and changed titles are handed to the
+scraper. Each returned row carries a "Change" column: added, changed or
+unchanged.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from scrapers.http_cache import get_cache
+from scrapers.justwatch import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, get_session, parse_justwatch
+from scrapers.rate_limit import limited_get
+
+TITLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".titles", "titles.sqlite3")
+DEFAULT_MAX_AGE = float(os.getenv("TITLE_MAX_AGE_DAYS", "7")) * 24 * 3600     # seconds
+
+ADDED, CHANGED, UNCHANGED = "added", "changed", "unchanged"
+NOT_MODIFIED = "not-modified"       # fingerprint of a page the server answered 304 for
+NO_VALIDATORS = (None, None)
+
+
+# --- Helper functions ---
+def content_hash(row):
+    """Stable hash of a result row (key order and value types don't matter)."""
+    data = json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+def fetch_page(url, validators=NO_VALIDATORS, use_cache=True):
+    """
+    (html, (etag, last_modified)) of a title page. With stored `validators` the request
+    is conditional and html is NOT_MODIFIED on a 304; html is None if the page can't be fetched.
+    """
+    etag, last_modified = validators
+    if not (etag or last_modified) and use_cache:
+        html = get_cache().fetch(url, session=get_session(), timeout=DEFAULT_TIMEOUT)
+        return html, get_cache().validators(url) if html is not None else NO_VALIDATORS
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        res = limited_get(get_session(), url, headers=headers, timeout=DEFAULT_TIMEOUT)
+    except requests.RequestException:
+        return None, validators
+    if res.status_code == 304:
+        return NOT_MODIFIED, validators
+    if res.status_code != 200:
+        return None, validators
+    validators = (res.headers.get("ETag"), res.headers.get("Last-Modified"))
+    if use_cache:
+        get_cache().put(url, res.text, *validators)
+    return res.text, validators
+
+def page_fingerprint(url, use_cache=True, validators=NO_VALIDATORS):
+    """
+    (fingerprint, parsed row, validators) of a title page; (NOT_MODIFIED, None, validators)
+    when a conditional request got a 304, (None, None, validators) if it can't be fetched.
+    The fingerprint hashes the parsed fields rather than raw HTML, so markup
+    that changes on every request doesn't make a title look changed.
+    """
+    html, validators = fetch_page(url, validators, use_cache)
+    if html is None or html is NOT_MODIFIED:
+        return html, None, validators
+    row = parse_justwatch(html, url)
+    return content_hash(row), row, validators
+
+def _is_error(row):
+    return "Error" in row or "Error" in row.values()
+
+
+# --- Store ---
+class TitleStore:
+    """Last scraped row, page fingerprint and timestamps per (Source URL, kind) in SQLite."""
+
+    def __init__(self, path=TITLES_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS titles (
+                source_url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                row TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                page_hash TEXT,
+                scraped_at REAL NOT NULL,
+                checked_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                PRIMARY KEY (source_url, kind)
+            )"""
+        )
+        columns = {name for _, name, *_ in self._conn.execute("PRAGMA table_info(titles)")}
+        for column in ("etag", "last_modified"):
+            if column not in columns:      # stores created before conditional checks
+                self._conn.execute(f"ALTER TABLE titles ADD COLUMN {column} TEXT")
+        self._conn.commit()
+
+    def get_many(self, urls, kind):
+        """{url: {"row", "content_hash", "page_hash", "checked_at", "validators"}} for the URLs already in the store."""
+        found = {}
+        urls = list(urls)
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"""SELECT source_url, row, content_hash, page_hash, checked_at, etag, last_modified FROM titles
+                        WHERE kind = ? AND source_url IN ({marks})""",
+                    [kind, *chunk],
+                ).fetchall()
+                for url, row, chash, phash, checked_at, etag, last_modified in rows:
+                    found[url] = {
+                        "row": json.loads(row), "content_hash": chash, "page_hash": phash, "checked_at": checked_at,
+                        "validators": (etag, last_modified),
+                    }
+        return found
+
+    def put(self, url, kind, row, page_hash, validators=NO_VALIDATORS):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, kind, json.dumps(row, ensure_ascii=False, default=str), content_hash(row), page_hash, now, now,
+                 *validators),
+            )
+            self._conn.commit()
+
+    def touch(self, validators, kind):
+        """Record that unchanged titles were checked just now; `validators` is {url: (etag, last_modified)}."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                """UPDATE titles SET checked_at = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+                   WHERE source_url = ? AND kind = ?""",
+                [(now, *v, u, kind) for u, v in validators.items()],
+            )
+            self._conn.commit()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_title_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TitleStore()
+        return _store
+
+
+# --- Incremental scrape ---
+def scrape_incremental(kind, urls, on_result=None, max_age=DEFAULT_MAX_AGE, concurrency=DEFAULT_CONCURRENCY,
+                       use_cache=True, progress_callback=None, store=None, **scrape_params):
+    """
+    Run the `kind` scraper ("justwatch", "posters" or "cast") on only the titles that need it.
+    Titles checked within `max_age` seconds are served from the store without a request;
+    older ones are checked with a conditional GET (304 or an unchanged page fingerprint
+    keeps the stored row) and new or changed titles are re-scraped.
+    Rows come back in input order with a "Change" column; `on_result(index, row)` and
+    `progress_callback(done, total)` run in the calling thread, like the other batch scrapers.
+    """
+    from scrapers.jobs import RUNNERS
+
+    store = store or get_title_store()
+    urls = [str(u).strip() for u in urls]
+    total = len(urls)
+    results = [None] * total
+    known = store.get_many(set(urls), kind)
+    done = 0
+
+    def finish(i, row, change):
+        nonlocal done
+        results[i] = {**row, "Change": change}
+        done += 1
+        if on_result:
+            on_result(i, results[i])
+        if progress_callback:
+            progress_callback(done, total)
+
+    # Recently checked titles need no request at all
+    now = time.time()
+    check = []
+    for i, url in enumerate(urls):
+        old = known.get(url)
+        if old and now - old["checked_at"] < max_age:
+            finish(i, old["row"], UNCHANGED)
+        else:
+            check.append(i)
+
+    def fingerprint(url):
+        old = known.get(url)
+        return page_fingerprint(url, use_cache, old["validators"] if old else NO_VALIDATORS)
+
+    stale = list(dict.fromkeys(urls[i] for i in check))
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        prints = dict(zip(stale, pool.map(fingerprint, stale)))
+
+    todo, unchanged = [], {}
+    for i in check:
+        url = urls[i]
+        page_hash, _, validators = prints[url]
+        old = known.get(url)
+        if old and page_hash and page_hash in (NOT_MODIFIED, old["page_hash"]):
+            unchanged[url] = validators
+            finish(i, old["row"], UNCHANGED)
+        else:
+            todo.append(i)
+    store.touch(unchanged, kind)
+
+    def record(j, row):
+        i = todo[j]
+        url = urls[i]
+        old = known.get(url)
+        change = ADDED if old is None else CHANGED if content_hash(row) != old["content_hash"] else UNCHANGED
+        if not _is_error(row):
+            page_hash, _, validators = prints[url]
+            store.put(url, kind, row, page_hash, validators)
+        finish(i, row, change)
+
+    if kind == "justwatch":
+        # The fingerprint fetch already parsed the page; only unreachable pages are tried again
+        retry = []
+        for j, i in enumerate(todo):
+            row = prints[urls[i]][1]
+            if row is None:
+                retry.append(j)
+            else:
+                record(j, row)
+        if retry:
+            RUNNERS[kind](
+                [urls[todo[j]] for j in retry],
+                lambda k, row: record(retry[k], row),
+                concurrency=concurrency,
+                use_cache=use_cache,
+            )
+    elif todo:
+        RUNNERS[kind]([urls[i] for i in todo], record, **scrape_params)
+    return results
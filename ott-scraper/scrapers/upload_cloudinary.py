@@ -1,12 +1,13 @@
 import streamlit as st
 import pandas as pd
-import io
 import os
 from dotenv import load_dotenv
 import cloudinary
-import cloudinary.uploader
 import cloudinary.api
 
+from scrapers.poster_index import upload_posters_deduped
+from scrapers.table_io import TABLE_FORMATS, TABLE_TYPES, read_table, table_bytes
+
 # ---------------- LOAD ENV & CONFIGURE CLOUDINARY ---------------- #
 load_dotenv()
 
@@ -21,56 +22,53 @@ st.title("☁️ Excel Poster → Cloudinary Uploader")
 # ---------------- STREAMLIT FILE UPLOADER ---------------- #
 uploaded_file = st.file_uploader(
     "📂 Upload Excel with 'Title' and 'SeasonPoster'",
-    type=["xlsx"]
+    type=TABLE_TYPES
 )
-
-def upload_to_cloudinary(url, folder="jio_images/"):
-    """Upload an image/video URL to Cloudinary"""
-    try:
-        res = cloudinary.uploader.upload(url, folder=folder)
-        return res.get("secure_url", url)
-    except Exception as e:
-        st.warning(f"⚠️ Failed to upload {url}: {e}")
-        return url
+fmt = st.selectbox("💾 Output format", TABLE_TYPES)
 
 if uploaded_file and st.button("🚀 Upload to Cloudinary"):
     try:
-        df = pd.read_excel(uploaded_file)
+        df = read_table(uploaded_file)
 
         # Check required columns
         if not {"Title", "SeasonPoster"}.issubset(df.columns):
             st.error("❌ Excel must have 'Title' and 'SeasonPoster' columns.")
         else:
-            expanded_rows = []
-            progress = st.progress(0)
-            total = len(df)
+            rows = [
+                (row["Title"], [p.strip() for p in str(row["SeasonPoster"]).split(",") if p.strip()])
+                for _, row in df.iterrows()
+            ]
 
-            for i, (_, row) in enumerate(df.iterrows()):
-                title = row["Title"]
-                posters = str(row["SeasonPoster"]).split(",")
-                posters = [p.strip() for p in posters if p.strip()]
-
-                for poster_url in posters:
-                    cloud_url = upload_to_cloudinary(poster_url)
-                    expanded_rows.append({"Title": title, "SeasonPoster": cloud_url})
+            # Upload every distinct image once, in parallel
+            progress = st.progress(0)
+            cloud_urls = upload_posters_deduped(
+                (poster for _, posters in rows for poster in posters),
+                fingerprint_callback=lambda done, total: progress.progress(
+                    done / total if total else 1.0, text="🧬 Fingerprinting images"
+                ),
+                progress_callback=lambda done, total: progress.progress(
+                    done / total if total else 1.0, text="☁️ Uploading"
+                ),
+                on_error=lambda u, e: st.warning(f"⚠️ Failed to upload {u}: {e}"),
+            )
 
-                progress.progress((i + 1) / total)
+            expanded_rows = [
+                {"Title": title, "SeasonPoster": cloud_urls[poster]}
+                for title, posters in rows
+                for poster in posters
+            ]
 
             # Result DataFrame
             result_df = pd.DataFrame(expanded_rows)
             st.success("✅ Upload complete!")
             st.dataframe(result_df.head(20))
 
-            # Prepare Excel download
-            buffer = io.BytesIO()
-            result_df.to_excel(buffer, index=False, engine="openpyxl")
-            buffer.seek(0)
-
+            # Prepare download
             st.download_button(
                 "⬇ Download Updated Excel",
-                buffer,
-                file_name="cloudinary_output.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                table_bytes(result_df, fmt),
+                file_name=f"cloudinary_output.{fmt}",
+                mime=TABLE_FORMATS[fmt],
             )
     except Exception as e:
         st.error(f"❌ Error: {e}")
@@ -0,0 +1,122 @@
+"""
+Background job worker.
+
+Runs queued scrape jobs in separate processes so Streamlit reruns never
+block or abandon them. Start it manually with
+
+    python -m scrapers.worker --max-jobs 2
+
+or let the app start it on demand (see `ensure_worker`). Only one worker
+runs per jobs directory: it holds an exclusive lock on worker.lock for its
+whole life, and a second one started alongside it exits straight away.
+"""
+import argparse
+import fcntl
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from scrapers.jobs import JOBS_PATH, JobStore, execute_job
+
+JOBS_DIR = os.path.dirname(JOBS_PATH)
+PID_PATH = os.path.join(JOBS_DIR, "worker.pid")
+LOCK_PATH = os.path.join(JOBS_DIR, "worker.lock")
+LOG_PATH = os.path.join(JOBS_DIR, "worker.log")
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MAX_JOBS = int(os.getenv("WORKER_MAX_JOBS", "2"))
+POLL_INTERVAL = 1.0     # seconds between queue checks
+
+
+# --- Process management ---
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def worker_running():
+    try:
+        with open(PID_PATH) as f:
+            return _pid_alive(int(f.read().strip()))
+    except (OSError, ValueError):
+        return False
+
+def _take_lock():
+    """Open and exclusively lock LOCK_PATH; returns the open file (the lock lasts while it stays open) or None."""
+    lock = open(LOCK_PATH, "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return None
+    return lock
+
+def ensure_worker(max_jobs=DEFAULT_MAX_JOBS):
+    """
+    Start the worker in the background unless one is already running.
+    Two callers racing here may both start one; the loser exits on the lock.
+    """
+    if worker_running():
+        return False
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    with open(LOG_PATH, "a") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "scrapers.worker", "--max-jobs", str(max_jobs)],
+            cwd=PROJECT_DIR,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,     # survives Streamlit reruns and restarts
+        )
+    return True
+
+
+# --- Main loop ---
+def serve(max_jobs=DEFAULT_MAX_JOBS):
+    """
+    Claim queued jobs and run up to `max_jobs` of them at once, each in its own process.
+    Returns straight away when another worker holds the lock.
+    """
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    lock = _take_lock()
+    if lock is None:
+        print(f"👷 Another worker is already running; {os.getpid()} exits", flush=True)
+        return False
+    with open(PID_PATH, "w") as f:
+        f.write(str(os.getpid()))
+
+    store = JobStore()
+    # With the lock held no other worker is alive, so every 'running' job was cut off by a previous one
+    store.requeue(status="running")
+    running = set()
+    # spawn, not fork: children open their own SQLite connections and browsers
+    ctx = multiprocessing.get_context("spawn")
+    print(f"👷 Worker {os.getpid()} started (max {max_jobs} jobs)", flush=True)
+    try:
+        with ProcessPoolExecutor(max_workers=max_jobs, mp_context=ctx) as pool:
+            while True:
+                running = {f for f in running if not f.done()}
+                while len(running) < max_jobs:
+                    job_id = store.claim_next()
+                    if job_id is None:
+                        break
+                    print(f"▶ Running job {job_id}", flush=True)
+                    running.add(pool.submit(execute_job, job_id))
+                time.sleep(POLL_INTERVAL)
+    finally:
+        try:
+            os.remove(PID_PATH)
+        except OSError:
+            pass
+        lock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run queued OTT scraper jobs.")
+    parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS, help="jobs to run at the same time")
+    serve(parser.parse_args().max_jobs)
@@ -0,0 +1,7 @@
+"""Shared test setup: the app directory importable, no politeness delays, no trace files."""
+import os
+import sys
+
+os.environ.setdefault("RATE_LIMIT_RPS", "1000")
+os.environ.setdefault("METRICS_TRACE", "")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
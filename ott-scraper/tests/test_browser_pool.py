@@ -0,0 +1,64 @@
+"""BrowserPool.run with fake drivers: only a lost session replaces the browser and retries the page."""
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("webdriver_manager")
+
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+
+from scrapers import browser_pool
+from scrapers.browser_pool import BrowserPool, session_lost
+
+URL = "http://browser-pool.test/title"
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    created = []
+
+    def new_driver(headless, blocklist):
+        created.append(FakeDriver())
+        return created[-1]
+    monkeypatch.setattr(browser_pool, "new_driver", new_driver)
+    return created
+
+
+def test_session_lost():
+    assert session_lost(InvalidSessionIdException("invalid session id"))
+    assert session_lost(WebDriverException("chrome not reachable"))
+    assert session_lost(WebDriverException("disconnected: not connected to DevTools"))
+    assert not session_lost(TimeoutException("page load timed out"))
+    assert not session_lost(WebDriverException("no such element: .title"))
+    assert not session_lost(ValueError("invalid session id"))
+
+
+def test_lost_session_replaces_the_browser_and_retries(drivers):
+    calls = []
+
+    def fn(driver, url):
+        calls.append(driver)
+        if len(calls) == 1:
+            raise InvalidSessionIdException("invalid session id")
+        return "ok"
+    with BrowserPool(size=1) as pool:
+        assert pool.run(fn, URL) == "ok"
+    assert len(drivers) == 2 and calls == drivers
+    assert drivers[0].quit_called
+
+
+def test_page_errors_keep_the_browser(drivers):
+    def fn(driver, url):
+        raise TimeoutException("page load timed out")
+    with BrowserPool(size=1) as pool:
+        with pytest.raises(TimeoutException):
+            pool.run(fn, URL)
+        assert pool.run(lambda driver, url: driver, URL) is drivers[0]
+    assert len(drivers) == 1
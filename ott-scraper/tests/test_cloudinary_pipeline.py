@@ -0,0 +1,105 @@
+"""Cloudinary uploads with a fake uploader: retries, dedup, the persistent upload map and failure fallback."""
+import threading
+
+import pytest
+
+pytest.importorskip("cloudinary")
+
+from cloudinary.exceptions import GeneralError, RateLimited
+
+from scrapers import cloudinary_pipeline, rate_limit
+from scrapers.cloudinary_pipeline import UploadMap, public_id_for, upload_many, upload_with_retry
+
+
+class FakeUploader:
+    """Stands in for cloudinary.uploader.upload: raises queued errors per URL, then succeeds."""
+
+    def __init__(self, failures=None):
+        self.failures = {url: list(errors) for url, errors in (failures or {}).items()}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, source_url, folder, public_id, **kwargs):
+        with self._lock:
+            self.calls.append((source_url, folder, public_id))
+            errors = self.failures.get(source_url)
+            error = errors.pop(0) if errors else None
+        if error:
+            raise error
+        return {"secure_url": f"https://res.cloudinary.test/{folder}{public_id}.jpg"}
+
+
+@pytest.fixture
+def uploader(monkeypatch):
+    monkeypatch.setattr(cloudinary_pipeline, "BACKOFF_BASE", 0.0)
+    monkeypatch.setattr(rate_limit, "DEFAULT_BACKOFF", 0.0)
+
+    def install(failures=None):
+        fake = FakeUploader(failures)
+        monkeypatch.setattr(cloudinary_pipeline.cloudinary.uploader, "upload", fake)
+        return fake
+    return install
+
+
+@pytest.fixture
+def upload_map(tmp_path):
+    return UploadMap(str(tmp_path / "uploads.sqlite3"))
+
+
+def test_public_id_is_deterministic():
+    url = "https://images.example/poster.jpg"
+    assert public_id_for(url) == public_id_for(url)
+    assert public_id_for(url) != public_id_for(url + "?v=2")
+    assert len(public_id_for(url)) == 24
+
+
+def test_retries_rate_limits_and_server_errors(uploader):
+    url = "https://images.example/a.jpg"
+    fake = uploader({url: [RateLimited("slow down"), GeneralError("502")]})
+    secure_url = upload_with_retry(url, folder="posters/")
+    assert secure_url == f"https://res.cloudinary.test/posters/{public_id_for(url)}.jpg"
+    assert len(fake.calls) == 3
+    assert {public_id for _, _, public_id in fake.calls} == {public_id_for(url)}
+
+
+def test_gives_up_after_max_retries(uploader):
+    url = "https://images.example/a.jpg"
+    uploader({url: [GeneralError("502")] * 5})
+    with pytest.raises(GeneralError):
+        upload_with_retry(url, max_retries=2)
+
+
+def test_duplicates_in_a_batch_upload_once(uploader, upload_map):
+    fake = uploader()
+    urls = ["https://images.example/a.jpg", " https://images.example/a.jpg ", "https://images.example/b.jpg", ""]
+    result = upload_many(urls, folder="posters/", upload_map=upload_map)
+    assert sorted(url for url, _, _ in fake.calls) == ["https://images.example/a.jpg", "https://images.example/b.jpg"]
+    assert set(result) == {"https://images.example/a.jpg", "https://images.example/b.jpg"}
+
+
+def test_second_run_skips_uploaded_urls(uploader, upload_map):
+    urls = ["https://images.example/a.jpg", "https://images.example/b.jpg"]
+    uploader()
+    first = upload_many(urls, folder="posters/", upload_map=upload_map)
+    fake = uploader()
+    progress = []
+    second = upload_many(urls, folder="posters/", upload_map=upload_map,
+                         progress_callback=lambda done, total: progress.append((done, total)))
+    assert fake.calls == []
+    assert second == first
+    assert progress == [(2, 2)]
+    # Another folder is a different asset
+    upload_many(urls[:1], folder="other/", upload_map=upload_map)
+    assert len(fake.calls) == 1
+
+
+def test_failed_upload_falls_back_to_source_url(uploader, upload_map):
+    bad, good = "https://images.example/bad.jpg", "https://images.example/good.jpg"
+    uploader({bad: [GeneralError("500")] * 10})
+    errors = []
+    result = upload_many([bad, good], upload_map=upload_map, on_error=lambda url, e: errors.append(url))
+    assert result[bad] == bad
+    assert result[good].startswith("https://res.cloudinary.test/")
+    assert errors == [bad]
+    # Failures are not remembered, so the next run tries again
+    assert upload_map.get_many([bad, good], cloudinary_pipeline.DEFAULT_FOLDER) == {good: result[good]}
@@ -0,0 +1,47 @@
+"""The column-wise converter must write exactly what the per-row converter writes."""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import catalog_frame
+from scrapers import excel_to_json
+from scrapers.excel_to_json import frame_to_json, prepare_frame, records_to_json, row_to_json
+
+CLOUD = "https://res.cloudinary.com/demo/image/upload/jio_images"
+
+
+def edge_frame():
+    """Blank cells, numbers stored as text or float, non-Cloudinary posters, every caster spelling."""
+    return pd.DataFrame({
+        " Title ": ["Ünïcode — Show", "Plain", "", "Numbers", "Sparse"],
+        "Year": [2020, "2019", np.nan, 2018.0, "n/a"],
+        "Original Title": ["", "Plain (Original)", "", np.nan, "Sparse"],
+        "Main Poster": [f" {CLOUD}/1.jpg ", "https://images.justwatch.com/poster/1/s592/x.jpg", "", "Not Found", np.nan],
+        "Seasons Count": [2, "3", np.nan, 1.0, ""],
+        "Season Details": ["Season 1 : 8 Episodes, Season 2 : 10 Episodes", "S1, S2, S3", "", "Season 1", np.nan],
+        "Season Poster": [f"{CLOUD}/1-1.jpg, Not Found", "", "", f"{CLOUD}/4-1.jpg", np.nan],
+        "JustWatch Rating": ["91%", "", np.nan, 75, "80%"],
+        "IMDB Rating": ["8.1", 7.5, "", "N/A", 9],
+        "Rotten Tomatoes": [95, np.nan, 80, "", 60],
+        "Genres": ["Drama, Crime,", "", np.nan, "Comedy", " Kids & Family , "],
+        "Runtime": ["45min", "1h 2min", "", np.nan, "30min"],
+        "Production Country": ["India", "", "United States", np.nan, "India"],
+        "Description": ["Line one\nline \"two\"", "", np.nan, "emoji 🎬", "tab\there"],
+        "YouTube Links": ["https://www.youtube.com/watch?v=a, https://www.youtube.com/watch?v=b", "", np.nan, ",", "x"],
+        "Caster": ["Actor A - Hero | Actor B: Villain", "Actor C as Lead", "", np.nan, "Solo"],
+    })
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("frame", [edge_frame, lambda: catalog_frame(300)], ids=["edge", "catalog"])
+def test_frame_to_json_matches_row_to_json(frame, use_orjson, monkeypatch):
+    if not use_orjson:
+        monkeypatch.setattr(excel_to_json, "orjson", None)
+    elif excel_to_json.orjson is None:
+        pytest.skip("orjson is not installed")
+    df = prepare_frame(frame())
+    expected = [row_to_json(row) for _, row in df.iterrows()]
+    assert frame_to_json(df) == expected
+    assert records_to_json(frame_to_json(df)) == json.dumps(expected, indent=4, ensure_ascii=False)
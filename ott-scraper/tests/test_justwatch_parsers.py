@@ -0,0 +1,60 @@
+"""
+Golden-file tests for the title page parsers.
+
+Each tests/fixtures/justwatch/<name>.html (first line `<!-- url: ... -->`) has
+the expected parser output next to it in <name>.json. The bs4 backend is the
+reference; the lxml backend must match it field for field.
+"""
+import json
+import os
+
+import pytest
+
+from scrapers.justwatch import parse_justwatch, parse_justwatch_bs4, parse_justwatch_dom
+from scrapers.justwatch_state import parse_title_state
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "justwatch")
+DOM_PAGES = ["dom", "dom_encoding_declaration"]
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, f"{name}.html"), encoding="utf-8") as f:
+        first, html = f.read().split("\n", 1)
+    url = first.removeprefix("<!-- url: ").removesuffix(" -->")
+    with open(os.path.join(FIXTURES, f"{name}.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    return url, html, expected
+
+
+@pytest.mark.parametrize("name", DOM_PAGES)
+def test_bs4_backend(name):
+    url, html, expected = load(name)
+    assert parse_justwatch_bs4(html, url) == expected
+
+@pytest.mark.parametrize("name", DOM_PAGES)
+def test_lxml_backend(name):
+    url, html, expected = load(name)
+    assert parse_justwatch_dom(html, url, backend="lxml") == expected
+
+def test_lxml_ignores_script_style_and_template_text():
+    url, html, expected = load("dom")
+    assert "<script>" in html and "<template>" in html
+    assert parse_justwatch_dom(html, url, backend="lxml")["Synopsis"] == expected["Synopsis"]
+
+def test_encoding_declaration_page_starts_with_declaration():
+    _, html, _ = load("dom_encoding_declaration")
+    assert html.startswith("<?xml")
+
+def test_state_parser():
+    url, html, expected = load("state")
+    state = parse_title_state(html, url)
+    # JSON has no tuples: compare the cast as lists
+    assert {**state, "cast": [list(c) for c in state["cast"]]} == expected
+
+def test_parse_justwatch_prefers_state():
+    url, html, expected = load("state")
+    assert parse_justwatch(html, url) == expected["fields"]
+
+def test_dom_page_has_no_state():
+    url, html, _ = load("dom")
+    assert parse_title_state(html, url) is None
@@ -0,0 +1,66 @@
+"""run_pipeline against the local page server, with a fake browser pool and no uploads."""
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("webdriver_manager")
+pytest.importorskip("cloudinary")
+
+from benchmarks.fixtures import dom_page, state_page
+from benchmarks.server import PageServer
+from scrapers import pipeline
+from scrapers.catalog import Catalog
+
+
+class FakePool:
+    """Answers `pool.run(fn, url)` without a browser; `broken` URLs raise."""
+
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+        self.calls = []
+
+    def run(self, fn, url):
+        self.calls.append((fn, url))
+        if url in self.broken:
+            raise RuntimeError("page crashed")
+        return "https://images.test/main.jpg", "https://images.test/s1.jpg", "Actor - Role"
+
+
+@pytest.fixture(autouse=True)
+def catalog(tmp_path, monkeypatch):
+    store = Catalog(str(tmp_path / "catalog.sqlite3"))
+    monkeypatch.setattr(pipeline, "get_catalog", lambda: store)
+    return store
+
+
+def run(pages, pool):
+    with PageServer(pages) as server:
+        urls = [server.url(path) for path in pages]
+        records = list(pipeline.run_pipeline(urls, upload=False, use_cache=False, pool=pool))
+    return urls, records
+
+
+def test_stateless_page_takes_one_browser_load():
+    path, html = state_page(1)
+    pages = {path: html, "/in/tv-show/dom-0": dom_page(0)}
+    pool = FakePool()
+    urls, records = run(pages, pool)
+    assert [i for i, _ in records] == [0, 1]
+    assert pool.calls == [(pipeline._browser_page, urls[1])]
+    assert records[1][1]["caster"] == [{"actor": "Actor", "role": "Role"}]
+    assert all("error" not in record for _, record in records)
+
+
+def test_failed_title_is_marked_with_an_error():
+    pages = {"/in/tv-show/dom-0": dom_page(0), "/in/tv-show/dom-2": dom_page(2)}
+    with PageServer(pages) as server:
+        urls = [server.url(path) for path in pages]
+        errors = []
+        records = list(pipeline.run_pipeline(
+            urls + [server.url("/missing")], upload=False, use_cache=False, pool=FakePool(broken=[urls[0]]),
+            on_error=lambda url, stage, e: errors.append((url, stage)),
+        ))
+    assert records[0][1]["error"] == "browser: page crashed"
+    assert records[0][1]["title"] == "Benchmark Show 0"     # what was scraped before the failure is kept
+    assert "error" not in records[1][1]
+    assert records[2][1]["error"] == "fetch: fetch failed"
+    assert sorted(stage for _, stage in errors) == ["browser", "fetch"]
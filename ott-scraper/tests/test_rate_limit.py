@@ -0,0 +1,125 @@
+"""Host limiter: Retry-After handling, AIMD window and token-bucket pacing against the local page server."""
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from benchmarks.server import PageServer
+from scrapers import rate_limit
+from scrapers.rate_limit import HostLimiter, get_limiter, limited_get, throttle
+
+PAGE = {"/title": "<html><body>ok</body></html>"}
+
+
+def get(server):
+    with requests.Session() as session:
+        started = time.monotonic()
+        res = limited_get(session, server.url("/title"), timeout=10)
+        return res, time.monotonic() - started
+
+
+def test_retry_after_seconds_waits_and_retries():
+    with PageServer(PAGE, faults={"/title": [(429, {"Retry-After": "1"})]}) as server:
+        res, elapsed = get(server)
+        stats = get_limiter(server.url("/")).snapshot()
+    assert res.status_code == 200 and res.text == PAGE["/title"]
+    assert server.requests == 2
+    assert elapsed >= 0.9
+    assert stats["throttled"] == 1 and stats["backoffs"] == 1
+
+
+def test_retry_after_http_date_waits_and_retries():
+    when = datetime.now(timezone.utc) + timedelta(seconds=2)
+    with PageServer(PAGE, faults={"/title": [(429, {"Retry-After": format_datetime(when, usegmt=True)})]}) as server:
+        res, elapsed = get(server)
+    assert res.status_code == 200
+    assert server.requests == 2
+    assert elapsed >= 0.9      # HTTP dates have whole-second resolution
+
+
+def test_503_without_retry_after_uses_default_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limit, "DEFAULT_BACKOFF", 0.5)
+    with PageServer(PAGE, faults={"/title": [(503, {})]}) as server:
+        res, elapsed = get(server)
+    assert res.status_code == 200
+    assert server.requests == 2
+    assert elapsed >= 0.45
+
+
+def test_gives_up_after_retries(monkeypatch):
+    monkeypatch.setattr(rate_limit, "DEFAULT_BACKOFF", 0.05)
+    with PageServer(PAGE, faults={"/title": [(503, {})] * 5}) as server:
+        with requests.Session() as session:
+            res = limited_get(session, server.url("/title"), retries=2, timeout=10)
+    assert res.status_code == 503
+    assert server.requests == 3
+
+
+def test_window_halves_on_throttle_and_grows_back():
+    limiter = HostLimiter(rate=0, max_concurrency=16)
+    assert limiter.limit == 4
+    limiter.acquire()
+    limiter.release(status=429, retry_after="0")
+    assert limiter.limit == 2
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(latency=0.01)
+    assert limiter.limit > 4
+
+
+def test_concurrent_throttles_decrease_once():
+    limiter = HostLimiter(rate=0, max_concurrency=16)
+    started = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    for _ in range(4):
+        limiter.release(status=429, retry_after="0", started=started)
+    assert limiter.limit == 2
+    assert limiter.snapshot()["throttled"] == 4 and limiter.snapshot()["backoffs"] == 1
+    # A request sent after that decrease can halve the window again
+    limiter.acquire()
+    limiter.release(status=429, retry_after="0", started=time.monotonic())
+    assert limiter.limit == 1
+
+
+def test_rate_is_enforced():
+    limiter = HostLimiter(rate=20, max_concurrency=16)
+    started = time.monotonic()
+    for _ in range(40):     # 20 from the initial burst, 20 more at 20/s
+        limiter.acquire()
+        limiter.release()
+    assert time.monotonic() - started >= 0.9
+
+
+def test_zero_rate_means_no_token_bucket():
+    limiter = HostLimiter(rate=0)
+    started = time.monotonic()
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release()
+    assert time.monotonic() - started < 0.5
+
+
+def test_browser_channel_ignores_latency_but_not_errors():
+    limiter = get_limiter("http://browser.test/", channel="browser")
+    assert limiter is not get_limiter("http://browser.test/")
+    limiter._baseline = 0.01
+    limiter.acquire()
+    limiter.release(latency=5.0)
+    assert limiter.snapshot()["backoffs"] == 0
+    with pytest.raises(RuntimeError):
+        with throttle("http://browser.test/", channel="browser"):
+            raise RuntimeError("page failed")
+    assert limiter.snapshot()["errors"] == 1 and limiter.snapshot()["backoffs"] == 1
+
+
+def test_excused_failure_is_not_a_host_error():
+    url = "http://excused.test/"
+    with pytest.raises(RuntimeError):
+        with throttle(url, channel="browser") as slot:
+            slot.excuse()
+            raise RuntimeError("browser crashed")
+    stats = get_limiter(url, channel="browser").snapshot()
+    assert stats["errors"] == 0 and stats["backoffs"] == 0
@@ -0,0 +1,83 @@
+"""scrape_justwatch_many against the local page server: ordering, callbacks, timeouts and the response cache."""
+import time
+
+import pytest
+
+from benchmarks.fixtures import dom_page, state_page
+from benchmarks.server import PageServer
+from scrapers import http_cache
+from scrapers.justwatch import parse_justwatch, scrape_justwatch_many
+from scrapers.parse_pool import MIN_POOL_PAGES
+
+
+def title_pages(count):
+    pages = {}
+    for i in range(count):
+        if i % 2:
+            path, html = state_page(i)
+        else:
+            path, html = f"/in/tv-show/benchmark-dom-{i}", dom_page(i)
+        pages[path] = html
+    return pages
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    fresh = http_cache.ResponseCache(str(tmp_path / "responses.sqlite3"))
+    monkeypatch.setattr(http_cache, "_cache", fresh)
+    return fresh
+
+
+@pytest.mark.parametrize("parse_workers", [0, 1])
+def test_results_follow_input_order(parse_workers):
+    pages = title_pages(MIN_POOL_PAGES + 4)     # large enough for the parse pool when it has workers
+    paths = list(reversed(list(pages)))
+    with PageServer(pages) as server:
+        urls = [server.url(path) for path in paths]
+        rows = scrape_justwatch_many(urls, use_cache=False, parse_workers=parse_workers)
+    assert [row["Source URL"] for row in rows] == urls
+    assert rows == [parse_justwatch(pages[path], url) for path, url in zip(paths, urls)]
+
+
+def test_callbacks_run_once_per_page():
+    pages = title_pages(6)
+    seen, progress = {}, []
+    with PageServer(pages) as server:
+        urls = [server.url(path) for path in pages] + [server.url("/missing")]
+        rows = scrape_justwatch_many(
+            urls, use_cache=False, parse_workers=0,
+            on_result=lambda i, row: seen.setdefault(i, row),
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+    assert seen == dict(enumerate(rows))
+    assert progress == [(done, len(urls)) for done in range(1, len(urls) + 1)]
+    assert rows[-1] == {"Error": f"Failed to fetch {urls[-1]}"}
+
+
+def test_slow_page_times_out_without_holding_up_the_rest():
+    pages = title_pages(4)
+    slow = next(iter(pages))
+    with PageServer(pages, delays={slow: 3.0}) as server:
+        urls = [server.url(path) for path in pages]
+        started = time.monotonic()
+        rows = scrape_justwatch_many(urls, timeout=0.5, use_cache=False, parse_workers=0)
+        elapsed = time.monotonic() - started
+    assert elapsed < 3.0
+    assert rows[0] == {"Error": f"Failed to fetch {urls[0]}"}
+    assert all(row["Source URL"] == url for url, row in zip(urls[1:], rows[1:]))
+
+
+def test_cache_hits_then_revalidates(cache):
+    pages = title_pages(5)
+    with PageServer(pages) as server:
+        urls = [server.url(path) for path in pages]
+        cold = scrape_justwatch_many(urls, parse_workers=0)
+        assert cache.stats["misses"] == 5 and server.requests == 5
+
+        assert scrape_justwatch_many(urls, parse_workers=0) == cold
+        assert cache.stats["hits"] == 5 and server.requests == 5     # served without a request
+
+        cache.ttl = 0       # every entry is stale: conditional GET, answered with 304
+        assert scrape_justwatch_many(urls, parse_workers=0) == cold
+        assert cache.stats["revalidated"] == 5 and server.requests == 10
+        assert cache.stats["misses"] == 5
@@ -0,0 +1,36 @@
+"""Worker start-up: one worker per jobs directory, and running jobs are only requeued by the lock holder."""
+import pytest
+
+from scrapers import worker
+from scrapers.jobs import JobStore
+
+
+@pytest.fixture
+def jobs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker, "JOBS_DIR", str(tmp_path))
+    monkeypatch.setattr(worker, "LOCK_PATH", str(tmp_path / "worker.lock"))
+    monkeypatch.setattr(worker, "PID_PATH", str(tmp_path / "worker.pid"))
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(worker, "JobStore", lambda: store)
+    return store
+
+
+def test_second_worker_exits_without_touching_jobs(jobs_dir):
+    job_id = jobs_dir.create_job("justwatch", [("https://www.justwatch.com/in/tv-show/x", {})], status="running")
+    held = worker._take_lock()
+    try:
+        assert held is not None
+        assert worker.serve(max_jobs=1) is False
+    finally:
+        held.close()
+    assert jobs_dir.get_job(job_id)["status"] == "running"
+    assert not worker.worker_running()
+
+
+def test_lock_is_free_again_once_released(jobs_dir):
+    first = worker._take_lock()
+    assert worker._take_lock() is None
+    first.close()
+    second = worker._take_lock()
+    assert second is not None
+    second.close()